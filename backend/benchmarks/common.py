@@ -0,0 +1,72 @@
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from datetime import UTC, datetime, timedelta
+
+from quart import Quart
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app import create_app
+from app.data_model import Invigilator, Point, Question, Rectangle, Test, TestAttempt, TestSetter, TestTaker, User
+from app.database import create_engine_manager, create_db_schema_objects, drop_db_schema_objects
+
+
+@asynccontextmanager
+async def benchmark_app() -> AsyncIterator[Quart]:
+    """Create an app in the testing profile, with the database schema recreated from scratch."""
+    app = create_app(use_testing_profile=True)
+    engine_manager = create_engine_manager(app)
+    async with engine_manager():
+        engine: AsyncEngine = getattr(app, 'engine')
+        engine.echo = False
+        await drop_db_schema_objects(engine)
+        await create_db_schema_objects(engine)
+        yield app
+
+def create_user(username: str) -> User:
+    return User(username, full_name=username, email=f'{username}@benchmark.py', password_hash='')
+
+async def create_test_attempts(engine: AsyncEngine, count: int, questions: Sequence[Question] = ()) -> list[TestAttempt.Id]:
+    """Create a running test (with the given questions, if any) with `count` attempts on it, and return the IDs of the attempts."""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        setter = create_user('setter')
+        setter.test_setter_role = TestSetter()
+        invigilator = create_user('invigilator')
+        invigilator.invigilator_role = Invigilator()
+        now = datetime.now(UTC)
+        test = Test(
+            title='benchmark', description='', guidelines='',
+            start_time=now - timedelta(days=1), end_time=now + timedelta(days=1),
+            questions=list(questions),
+            creator=setter.test_setter_role,
+        )
+        test_takers = [create_user(f'test_taker_{i}') for i in range(count)]
+        for test_taker in test_takers:
+            test_taker.test_taker_role = TestTaker()
+        session.add_all([setter, invigilator, test, *test_takers])
+        await session.flush()
+        attempts = [
+            TestAttempt(
+                invigilator=invigilator.invigilator_role, # type: ignore
+                environment_image_url='',
+                screen_position=Rectangle(
+                    top_left=Point(0, 0), top_right=Point(1, 0),
+                    bottom_left=Point(0, 1), bottom_right=Point(1, 1),
+                ),
+            )
+            for _ in test_takers
+        ]
+        for attempt, test_taker in zip(attempts, test_takers):
+            attempt.test_id = test.id
+            attempt.test_taker_id = test_taker.id
+        session.add_all(attempts)
+        await session.commit()
+        return [attempt.id for attempt in attempts]
+
+@contextmanager
+def timed(label: str, count: int, unit: str) -> Iterator[None]:
+    """Print the throughput of the enclosed block, given that it processes `count` units."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    print(f'{label}: {count} {unit} in {elapsed:.3f} s ({count / elapsed:,.0f} {unit}/s)')
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Compare the throughput of exporting gaze samples by loading them all into the ORM and writing them as CSV
+against the streamed columnar export (as gzip-compressed CSV and, if pyarrow is installed, Parquet).
+
+Run with `python -m benchmarks.data_export` against a testing database (the schema will be recreated).
+"""
+import asyncio
+from argparse import ArgumentParser
+import csv
+from datetime import UTC, datetime, timedelta
+import gzip
+from pathlib import Path
+import random
+from tempfile import TemporaryDirectory
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.data_model import GazeData, TestAttempt
+from app.export import ExportFilter, ExportFormat, ExportTable, export_to_file, is_parquet_supported
+from app.gaze.ingestion import insert_gaze_data
+from app.gaze.wire_format import SAMPLE_DTYPE, to_timestamp
+from .common import benchmark_app, create_test_attempts, timed
+
+
+async def create_samples(engine: AsyncEngine, attempt_ids: list[TestAttempt.Id], samples_per_attempt: int):
+    start = to_timestamp(datetime.now(UTC) - timedelta(hours=1))
+    for attempt_id in attempt_ids:
+        samples = np.empty(samples_per_attempt, dtype=SAMPLE_DTYPE)
+        samples['timestamp'] = start + np.arange(samples_per_attempt) * 33_333
+        samples['x'] = [random.random() for _ in range(samples_per_attempt)]
+        samples['y'] = [random.random() for _ in range(samples_per_attempt)]
+        async with AsyncSession(engine) as session:
+            await insert_gaze_data(session, attempt_id, samples)
+            await session.commit()
+
+async def export_per_object(engine: AsyncEngine, path: Path, test_id: int):
+    async with AsyncSession(engine) as session:
+        gaze_data = (await session.scalars(
+            select(GazeData).where(GazeData.test_id == test_id).order_by(GazeData.test_taker_id, GazeData.timestamp)
+        )).all()
+    with gzip.open(path, 'wt', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['test_id', 'test_taker_id', 'timestamp', 'x', 'y'])
+        for sample in gaze_data:
+            writer.writerow([
+                sample.test_id, sample.test_taker_id, sample.timestamp.isoformat(),
+                sample.gaze_extrapolation.x, sample.gaze_extrapolation.y,
+            ])
+
+async def main(attempt_count: int, samples_per_attempt: int):
+    async with benchmark_app() as app:
+        engine: AsyncEngine = getattr(app, 'engine')
+        attempt_ids = await create_test_attempts(engine, attempt_count)
+        await create_samples(engine, attempt_ids, samples_per_attempt)
+        test_id = attempt_ids[0].test_id
+        sample_count = attempt_count * samples_per_attempt
+        export_formats = [ExportFormat.CSV] + ([ExportFormat.PARQUET] if is_parquet_supported() else [])
+        with TemporaryDirectory() as directory:
+            with timed('per-object ORM to CSV', sample_count, 'rows'):
+                await export_per_object(engine, Path(directory, 'per_object.csv.gz'), test_id)
+            for export_format in export_formats:
+                with timed(f'streamed export to {export_format}', sample_count, 'rows'):
+                    await export_to_file(
+                        engine, Path(directory, f'export{export_format.file_extension}'),
+                        ExportTable.GAZE_DATA, export_format, ExportFilter(test_id),
+                    )
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--attempts', type=int, default=20)
+    parser.add_argument('--samples-per-attempt', type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.attempts, args.samples_per_attempt))
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Compare the throughput of inserting gaze samples one ORM object at a time against the multi-row INSERT path.
+
+Run with `python -m benchmarks.gaze_data_ingestion` against a testing database (the schema will be recreated).
+"""
+import asyncio
+from argparse import ArgumentParser
+from datetime import UTC, datetime, timedelta
+import random
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.data_model import GazeData, Point, TestAttempt
+from app.gaze.ingestion import insert_gaze_data
+from app.gaze.wire_format import samples_from_tuples
+from .common import benchmark_app, create_test_attempts, timed
+
+
+def generate_samples(count: int) -> list[tuple[datetime, float, float]]:
+    start = datetime.now(UTC)
+    return [
+        (start + timedelta(seconds=i / 30), random.random(), random.random())
+        for i in range(count)
+    ]
+
+async def insert_per_object(engine: AsyncEngine, attempt_id: TestAttempt.Id, samples: list[tuple[datetime, float, float]]):
+    async with AsyncSession(engine) as session:
+        attempt = await session.get_one(TestAttempt, (attempt_id.test_id, attempt_id.test_taker_id))
+        for timestamp, x, y in samples:
+            attempt.gaze_data.add(GazeData(timestamp=timestamp, gaze_extrapolation=Point(x, y)))
+        await session.commit()
+
+async def insert_bulk(engine: AsyncEngine, attempt_id: TestAttempt.Id, samples: list[tuple[datetime, float, float]]):
+    async with AsyncSession(engine) as session:
+        await insert_gaze_data(session, attempt_id, samples_from_tuples(samples))
+        await session.commit()
+
+async def main(sample_count: int, batch_size: int):
+    async with benchmark_app() as app:
+        engine: AsyncEngine = getattr(app, 'engine')
+        attempt_id, = await create_test_attempts(engine, 1)
+        samples = generate_samples(sample_count)
+        batches = [samples[i:i + batch_size] for i in range(0, sample_count, batch_size)]
+        for label, insert in [('per-object ORM add()', insert_per_object), ('multi-row INSERT', insert_bulk)]:
+            with timed(label, sample_count, 'samples'):
+                for batch in batches:
+                    await insert(engine, attempt_id, batch)
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=30_000)
+    parser.add_argument('--batch-size', type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.samples, args.batch_size))
\ No newline at end of file
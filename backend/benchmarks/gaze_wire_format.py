@@ -0,0 +1,41 @@
+"""
+Compare the cost of decoding gaze data batches sent as camelCased JSON against binary frames.
+
+Run with `python -m benchmarks.gaze_wire_format` (no database is required).
+"""
+from argparse import ArgumentParser
+from datetime import UTC, datetime, timedelta
+import json
+import random
+
+from app.blueprints.test_taker.gaze_data import gaze_data_batch_adapter
+from app.data_model import TestAttempt
+from app.gaze.wire_format import GazeFrame, decode_frame, encode_frame, samples_from_tuples
+from .common import timed
+
+
+def main(samples_per_batch: int, batch_count: int):
+    start = datetime.now(UTC)
+    samples = [
+        (start + timedelta(seconds=i / 30), random.random(), random.random())
+        for i in range(samples_per_batch)
+    ]
+    json_batch = json.dumps({
+        'samples': [{'timestamp': timestamp.isoformat(), 'x': x, 'y': y} for timestamp, x, y in samples]
+    })
+    binary_batch = encode_frame(GazeFrame(TestAttempt.Id(1, 1), 0, samples_from_tuples(samples)))
+    print(f'Batch size: {len(json_batch.encode())} bytes as JSON, {len(binary_batch)} bytes as a binary frame')
+    sample_count = samples_per_batch * batch_count
+    with timed('JSON', sample_count, 'samples'):
+        for _ in range(batch_count):
+            gaze_data_batch_adapter.validate_json(json_batch).to_array()
+    with timed('binary frame', sample_count, 'samples'):
+        for _ in range(batch_count):
+            decode_frame(binary_batch)
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--samples-per-batch', type=int, default=30)
+    parser.add_argument('--batches', type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.samples_per_batch, args.batches)
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Compare the throughput of grading multiple choice answers by loading every answer into the ORM
+against the set-based `UPDATE ... FROM` grading job.
+
+Run with `python -m benchmarks.mcq_grading` against a testing database (the schema will be recreated).
+"""
+import asyncio
+from argparse import ArgumentParser
+import random
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.blueprints.test_setter.grading import grade_multiple_choice_answers
+from app.data_model import Answer, MCQAnswer, MultipleChoiceQuestion, Question, TestAttempt
+from app.database import chunked
+from .common import benchmark_app, create_test_attempts, timed
+
+
+def create_questions(count: int, option_count: int) -> list[Question]:
+    questions = []
+    for i in range(count):
+        options = [MultipleChoiceQuestion.Option(option_text=f'option_{j}') for j in range(option_count)]
+        questions.append(Question(
+            question_text=f'question_{i}', max_marks=random.randint(1, 4),
+            multiple_choice_question=MultipleChoiceQuestion(options=options, correct_option=random.choice(options)),
+        ))
+    return questions
+
+async def create_answers(engine: AsyncEngine, attempt_ids: list[TestAttempt.Id]):
+    """Answer every multiple choice question of the test in every attempt, choosing options at random."""
+    async with AsyncSession(engine) as session:
+        test_id = attempt_ids[0].test_id
+        options = (await session.execute(
+            select(MultipleChoiceQuestion.Option.__table__.c.question_discriminator, MultipleChoiceQuestion.Option.__table__.c.discriminator)
+            .where(MultipleChoiceQuestion.Option.__table__.c.test_id == test_id)
+        )).tuples().all()
+        options_per_question: dict[int, list[int]] = {}
+        for question_discriminator, discriminator in options:
+            options_per_question.setdefault(question_discriminator, []).append(discriminator)
+        rows = [
+            {
+                'test_id': test_id,
+                'test_taker_id': attempt_id.test_taker_id,
+                'question_discriminator': question_discriminator,
+                'chosen_option_discriminator': random.choice(option_discriminators),
+            }
+            for attempt_id in attempt_ids
+            for question_discriminator, option_discriminators in options_per_question.items()
+        ]
+        for chunk in chunked(rows, parameters_per_row=3):
+            await session.execute(insert(Answer.__table__).values([
+                {key: value for key, value in row.items() if key != 'chosen_option_discriminator'} for row in chunk
+            ]))
+        for chunk in chunked(rows, parameters_per_row=4):
+            await session.execute(insert(MCQAnswer.__table__).values(list(chunk)))
+        await session.commit()
+        return len(rows)
+
+async def grade_per_object(engine: AsyncEngine, test_id: int):
+    async with AsyncSession(engine) as session:
+        answers = await session.scalars(
+            select(Answer)
+            .where(Answer.test_id == test_id)
+            .options(joinedload(Answer.mcq_answer), joinedload(Answer.question).joinedload(Question.multiple_choice_question))
+        )
+        for answer in answers:
+            mcq = answer.question.multiple_choice_question
+            if mcq is None:
+                continue
+            chosen_option_discriminator = answer.mcq_answer.chosen_option_discriminator if answer.mcq_answer else None
+            answer.marks_obtained = answer.question.max_marks if chosen_option_discriminator == mcq.correct_option_discriminator else 0
+        await session.commit()
+
+async def grade_set_based(engine: AsyncEngine, test_id: int):
+    async with AsyncSession(engine) as session:
+        await grade_multiple_choice_answers(session, test_id)
+        await session.commit()
+
+async def reset_marks(engine: AsyncEngine):
+    async with AsyncSession(engine) as session:
+        await session.execute(update(Answer.__table__).values(marks_obtained=None))
+        await session.commit()
+
+async def main(attempt_count: int, question_count: int, option_count: int):
+    async with benchmark_app() as app:
+        engine: AsyncEngine = getattr(app, 'engine')
+        attempt_ids = await create_test_attempts(engine, attempt_count, create_questions(question_count, option_count))
+        answer_count = await create_answers(engine, attempt_ids)
+        for label, grade in [('per-object ORM grading', grade_per_object), ('set-based UPDATE ... FROM', grade_set_based)]:
+            await reset_marks(engine)
+            with timed(label, answer_count, 'answers'):
+                await grade(engine, attempt_ids[0].test_id)
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--attempts', type=int, default=5_000)
+    parser.add_argument('--questions', type=int, default=50)
+    parser.add_argument('--options', type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.attempts, args.questions, args.options))
\ No newline at end of file
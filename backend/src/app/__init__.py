@@ -4,7 +4,7 @@ from quart import Blueprint, Quart
 from quart_auth import QuartAuth
 from quart_schema import QuartSchema
 
-from . import blueprints, database, error_handling, password_hashing
+from . import blueprints, caching, database, error_handling, file_storage, gaze, images, instrumentation, password_hashing, test_totals
 from .config.profile import profile_config_type
 
 
@@ -17,6 +17,7 @@ def create_app(use_testing_profile: bool = False):
     app.config.from_object(config)
 
     database.init_app(app)
+    instrumentation.init_app(app)
 
     password_hashing.init_app(app)
     auth_manager = QuartAuth(app) # type: ignore
@@ -24,6 +25,12 @@ def create_app(use_testing_profile: bool = False):
 
     QuartSchema(app, convert_casing=True)
 
+    caching.init_app(app)
+    test_totals.init_app(app)
+    gaze.init_app(app)
+    file_storage.init_app(app)
+    images.init_app(app)
+
     error_handling.init_app(app)
     
     api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -6,9 +6,13 @@ from quart import Blueprint
 class BlueprintModule(Protocol):
     bp: Blueprint
 
-from . import user, test_setter  # noqa: E402
+from . import user, test_setter, test_taker, invigilator, files, metrics  # noqa: E402
 
 bp_modules: list[BlueprintModule] = [
     user,
     test_setter,
+    test_taker,
+    invigilator,
+    files,
+    metrics,
 ]
\ No newline at end of file
@@ -0,0 +1,84 @@
+from typing import Optional
+
+from quart import Blueprint, Response, send_file
+from sqlalchemy import exists, or_, select
+
+from ...data_model import AttachmentAnswer, Test, TestAttempt
+from ...database import orm_session
+from ...error_handling import APIError
+from ...file_storage import DIGEST_PATTERN, get_file_storage
+from ...images import THUMBNAIL_SIZES, InvalidImageError, get_thumbnail_path
+from ..user.authentication import current_user, ensure_authenticated
+
+
+bp = Blueprint('files', __name__, url_prefix='/files')
+bp.before_request(ensure_authenticated)
+
+attachment_answer_table = AttachmentAnswer.__table__
+test_attempt_table = TestAttempt.__table__
+
+def file_url(digest: str) -> str:
+    return f'/api/files/{digest}'
+
+def thumbnail_url(digest: str, size: int) -> str:
+    return f'/api/files/{digest}/thumbnails/{size}'
+
+def thumbnail_url_of_file(url: Optional[str], size: int) -> Optional[str]:
+    """The URL of a thumbnail of the stored image at the given URL, if it is one."""
+    digest = url.removeprefix(file_url('')) if url is not None else ''
+    return thumbnail_url(digest, size) if DIGEST_PATTERN.fullmatch(digest) else None
+
+async def can_access_file(url: str) -> bool:
+    """
+    Whether the current user took, invigilated or created a test attempt to which the file is attached,
+    or of which it is the environment image.
+    """
+    accessible = or_(
+        test_attempt_table.c.test_taker_id == current_user.id,
+        test_attempt_table.c.invigilator_id == current_user.id,
+        Test.creator_id == current_user.id,
+    )
+    attached = (
+        select(attachment_answer_table)
+        .join(test_attempt_table, (test_attempt_table.c.test_id == attachment_answer_table.c.test_id) & (test_attempt_table.c.test_taker_id == attachment_answer_table.c.test_taker_id))
+        .join(Test, Test.id == attachment_answer_table.c.test_id)
+        .where(attachment_answer_table.c.attached_file_url == url, accessible)
+    )
+    environment_image = (
+        select(test_attempt_table)
+        .join(Test, Test.id == test_attempt_table.c.test_id)
+        .where(test_attempt_table.c.environment_image_url == url, accessible)
+    )
+    return bool(await orm_session.scalar(select(or_(exists(attached), exists(environment_image)))))
+
+@bp.get('/<digest>')
+async def download_file(digest: str) -> Response:
+    """
+    Download a stored file (supporting range requests), if it is attached to (or the environment image of)
+    a test attempt of the current user.
+    """
+    if not DIGEST_PATTERN.fullmatch(digest) or not await can_access_file(file_url(digest)):
+        raise APIError(404, 'File not found.')
+    response = await get_file_storage().send(digest, mimetype='application/octet-stream')
+    if response is None:
+        raise APIError(404, 'File not found.')
+    # The content of a digest never changes, but access to it is per user.
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+@bp.get('/<digest>/thumbnails/<int:size>')
+async def download_thumbnail(digest: str, size: int) -> Response:
+    """Download a JPEG thumbnail of a stored image (see `download_file`), generating it if it is not cached."""
+    if size not in THUMBNAIL_SIZES or not DIGEST_PATTERN.fullmatch(digest) or not await can_access_file(file_url(digest)):
+        raise APIError(404, 'File not found.')
+    try:
+        path = await get_thumbnail_path(digest, size)
+    except InvalidImageError:
+        path = None
+    if path is None:
+        raise APIError(404, 'File not found.')
+    response = await send_file(path, mimetype='image/jpeg', conditional=True)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
\ No newline at end of file
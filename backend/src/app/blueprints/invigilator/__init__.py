@@ -0,0 +1,56 @@
+from collections.abc import Awaitable, Callable
+from functools import wraps
+
+from quart import Blueprint, Response, current_app
+
+from ...data_model import Invigilator, TestAttempt, User
+from ...database import orm_session
+from ...error_handling import APIError
+from ..user.authentication import authentication_required, ensure_authenticated, invalidate_current_user, current_user
+
+
+bp = Blueprint('invigilator', __name__, url_prefix='/invigilator')
+bp.before_request(ensure_authenticated)
+
+@bp.post('/assume_role')
+async def assume_role():
+    user = await orm_session.get_one(User, current_user.id)
+    if await user.awaitable_attrs.invigilator_role is not None:
+        raise APIError(400, 'User is already an invigilator.')
+    user.invigilator_role = Invigilator()
+    await orm_session.commit()
+    invalidate_current_user()
+    return Response(status=204)
+
+@authentication_required
+async def require_invigilator_role():
+    if not current_user.invigilator_role:
+        raise APIError(403, 'Forbidden')
+
+def invigilator_role_required[T, **P](func: Callable[P, Awaitable[T]] | Callable[P, T]) -> Callable[P, Awaitable[T]]:
+    @wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        await require_invigilator_role()
+        return await current_app.ensure_async(func)(*args, **kwargs) # type: ignore
+    return wrapper
+
+async def get_invigilation(test_id: int, test_taker_id: int) -> TestAttempt:
+    attempt = await orm_session.get(TestAttempt, (test_id, test_taker_id))
+    if attempt is None or attempt.invigilator_id != current_user.id:
+        raise APIError(404, 'Invigilation not found.')
+    return attempt
+
+core_bp = Blueprint('invigilator_core', __name__)
+core_bp.before_request(require_invigilator_role)
+bp.register_blueprint(core_bp)
+
+from .. import BlueprintModule  # noqa: E402
+from . import gaze_data, invigilations  # noqa: E402
+
+bp_modules: list[BlueprintModule] = [
+    gaze_data,
+    invigilations,
+]
+
+for bp_module in bp_modules:
+    core_bp.register_blueprint(bp_module.bp)
\ No newline at end of file
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from pydantic import AwareDatetime
+from quart import Blueprint
+from quart_schema import validate_querystring, validate_response
+
+from ...database import orm_session
+from ...error_handling import APIError
+from ...gaze.rollup import GazeSummaryPoint, choose_resolution, summarise
+from . import get_invigilation
+
+
+bp = Blueprint('gaze_data', __name__, url_prefix='/invigilations/<int:test_id>/<int:test_taker_id>')
+
+MAX_SUMMARY_POINTS = 600
+
+@dataclass
+class TimeRange:
+    start: AwareDatetime
+    end: AwareDatetime
+
+@dataclass
+class GazeSummary:
+    resolution: int
+    points: list[GazeSummaryPoint]
+
+@bp.get('/gaze_summary') # type: ignore
+@validate_querystring(TimeRange)
+@validate_response(GazeSummary)
+async def get_gaze_summary(test_id: int, test_taker_id: int, query_args: TimeRange) -> GazeSummary:
+    """
+    Summarise the gaze data of a test attempt within a time range, at the finest resolution (in seconds)
+    that fits the range in a bounded number of points.
+    """
+    if query_args.start >= query_args.end:
+        raise APIError(422, 'The start of the time range must precede its end.')
+    attempt = await get_invigilation(test_id, test_taker_id)
+    resolution = choose_resolution(query_args.start, query_args.end, MAX_SUMMARY_POINTS)
+    points = await summarise(orm_session, attempt.id, query_args.start, query_args.end, resolution)
+    return GazeSummary(resolution=resolution, points=points)
\ No newline at end of file
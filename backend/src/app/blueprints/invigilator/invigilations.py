@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from quart import Blueprint
+from quart_schema import validate_querystring, validate_response
+from sqlalchemy import select
+
+from ...data_model import TestAttempt, User
+from ...database import orm_session
+from ...images import THUMBNAIL_SIZES
+from ..files import thumbnail_url_of_file
+from ..user.authentication import current_user
+
+
+bp = Blueprint('invigilations', __name__, url_prefix='/invigilations')
+
+@dataclass
+class InvigilationsRequest:
+    test_id: int
+
+@dataclass
+class InvigilationSummary:
+    test_id: int
+    test_taker_id: int
+    username: str
+    full_name: str
+    caught_cheating: bool
+    environment_image_url: Optional[str]
+    environment_image_thumbnail_url: Optional[str]
+    """The URL of the smallest thumbnail of the environment image, if it is a stored image."""
+    environment_image_hash: Optional[str]
+    """The perceptual hash of the environment image, by which reused images can be spotted."""
+
+@bp.get('') # type: ignore
+@validate_querystring(InvigilationsRequest)
+@validate_response(list[InvigilationSummary])
+async def list_invigilations(query_args: InvigilationsRequest) -> list[InvigilationSummary]:
+    """List the attempts of a test invigilated by the current user, with thumbnails (rather than originals) of their environment images."""
+    rows = await orm_session.execute(
+        select(
+            TestAttempt.test_id, TestAttempt.test_taker_id, User.username, User.full_name, TestAttempt.caught_cheating,
+            TestAttempt.environment_image_url, TestAttempt.environment_image_hash,
+        )
+        .join(User, User.id == TestAttempt.test_taker_id)
+        .where(TestAttempt.test_id == query_args.test_id, TestAttempt.invigilator_id == current_user.id)
+        .order_by(TestAttempt.test_taker_id)
+    )
+    return [
+        InvigilationSummary(
+            test_id=row.test_id,
+            test_taker_id=row.test_taker_id,
+            username=row.username,
+            full_name=row.full_name,
+            caught_cheating=row.caught_cheating,
+            environment_image_url=row.environment_image_url,
+            environment_image_thumbnail_url=thumbnail_url_of_file(row.environment_image_url, THUMBNAIL_SIZES[0]),
+            environment_image_hash=row.environment_image_hash,
+        )
+        for row in rows
+    ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+import hmac
+from typing import Optional
+
+from quart import Blueprint, current_app, request
+from quart_schema import validate_response
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ...caching import CacheStatistics, get_principal_cache, get_test_definition_cache
+from ...config.database.pool import PoolStatistics, get_pool_statistics
+from ...database import SingleFlightStatistics, single_flight_statistics
+from ...error_handling import APIError
+from ...gaze.buffering import GazeDataStreamStatistics, GazeDataStreams
+from ...instrumentation import RouteStatistics, get_request_instrumentation
+from ...password_hashing import PasswordHashingStatistics, get_password_hashing_service
+
+
+bp = Blueprint('metrics', __name__, url_prefix='/metrics')
+
+@bp.before_request
+async def require_metrics_enabled():
+    if not current_app.config['METRICS_ENABLED']:
+        raise APIError(404, 'Not Found')
+
+@bp.before_request
+async def require_metrics_token():
+    """
+    Require the configured metrics token as a bearer token. Roles can be assumed by any user, so they cannot gate
+    the operational details reported by the metrics.
+    """
+    token: Optional[str] = current_app.config['METRICS_TOKEN']
+    authorization = request.authorization
+    if (
+        token is None or authorization is None or authorization.type != 'bearer' or authorization.token is None
+        or not hmac.compare_digest(authorization.token.encode(), token.encode())
+    ):
+        raise APIError(401, 'Unauthorised')
+
+@dataclass
+class Metrics:
+    test_definition_cache: CacheStatistics
+    principal_cache: CacheStatistics
+    single_flight: list[SingleFlightStatistics]
+    password_hashing: PasswordHashingStatistics
+    database_pool: Optional[PoolStatistics]
+    gaze_data_streams: GazeDataStreamStatistics
+    routes: list[RouteStatistics]
+
+@bp.get('')
+@validate_response(Metrics)
+async def get_metrics() -> Metrics:
+    engine: Optional[AsyncEngine] = getattr(current_app, 'engine', None)
+    gaze_data_streams: GazeDataStreams = getattr(current_app, 'gaze_data_streams')
+    return Metrics(
+        test_definition_cache=get_test_definition_cache().statistics,
+        principal_cache=get_principal_cache().statistics,
+        single_flight=list(single_flight_statistics.values()),
+        password_hashing=get_password_hashing_service().statistics,
+        database_pool=get_pool_statistics(engine) if engine is not None else None,
+        gaze_data_streams=gaze_data_streams.statistics,
+        routes=get_request_instrumentation().statistics,
+    )
\ No newline at end of file
@@ -1,15 +1,20 @@
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime
+from enum import StrEnum
 from functools import wraps
 from typing import Optional, Self
+from pydantic import AwareDatetime
 from quart import Blueprint, Response, current_app
-from quart_schema import validate_request, validate_response
+from quart_schema import validate_querystring, validate_request, validate_response
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
-from ...data_model import AttachmentQuestion, MultipleChoiceQuestion, Question, Test, TestSetter, TextFieldQuestion
-from ...database import get_orm_session, orm_session
+from ...data_model import AttachmentQuestion, MultipleChoiceQuestion, Question, Test, TestAttempt, TestSetter, TextFieldQuestion, User
+from ...database import get_orm_session, orm_session, single_flight
 from ...error_handling import APIError
-from ..user.authentication import authentication_required, ensure_authenticated, get_current_user, current_user
+from ..user.authentication import authentication_required, ensure_authenticated, invalidate_current_user, current_user
 
 
 bp = Blueprint('test_setter', __name__, url_prefix='/test_setter')
@@ -17,16 +22,17 @@ bp.before_request(ensure_authenticated)
 
 @bp.post('/assume_role')
 async def assume_role():
-    current_user = get_current_user()
-    if await current_user.awaitable_attrs.test_setter_role is not None:
+    user = await orm_session.get_one(User, current_user.id)
+    if await user.awaitable_attrs.test_setter_role is not None:
         raise APIError(400, 'User is already a test setter.')
-    current_user.test_setter_role = TestSetter()
+    user.test_setter_role = TestSetter()
     await orm_session.commit()
+    invalidate_current_user()
     return Response(status=204)
 
 @authentication_required
 async def require_test_setter_role():
-    if await current_user.awaitable_attrs.test_setter_role is None:
+    if not current_user.test_setter_role:
         raise APIError(403, 'Forbidden')
     
 def test_setter_role_required[T, **P](func: Callable[P, Awaitable[T]] | Callable[P, T]) -> Callable[P, Awaitable[T]]:
@@ -36,6 +42,12 @@ def test_setter_role_required[T, **P](func: Callable[P, Awaitable[T]] | Callable
         return await current_app.ensure_async(func)(*args, **kwargs) # type: ignore
     return wrapper
 
+async def get_created_test(test_id: int) -> Test:
+    test = await orm_session.get(Test, test_id)
+    if test is None or test.creator_id != current_user.id:
+        raise APIError(404, 'Test not found.')
+    return test
+
 core_bp = Blueprint('test_setter_core', __name__)
 core_bp.before_request(require_test_setter_role)
 bp.register_blueprint(core_bp)
@@ -50,6 +62,11 @@ class TestDetails:
     guidelines: str
     questions: 'list[QuestionDetails]'
 
+    @staticmethod
+    def loader_options() -> list[LoaderOption]:
+        """Loader options that eagerly load everything `from_structural_superset` reads, in a constant number of queries."""
+        return [selectinload(Test.questions).options(*QuestionDetails.loader_options())]
+
     @classmethod
     async def from_structural_superset(cls, test: Test) -> Self:
         return cls(
@@ -74,6 +91,14 @@ class QuestionDetails:
     text_field_question: 'Optional[TextFieldQuestionDetails]' = None
     attachment_question: 'Optional[AttachmentQuestionDetails]' = None
 
+    @staticmethod
+    def loader_options() -> list[LoaderOption]:
+        return [
+            joinedload(Question.multiple_choice_question).options(*MultipleChoiceQuestionDetails.loader_options()),
+            joinedload(Question.text_field_question),
+            joinedload(Question.attachment_question),
+        ]
+
     @classmethod
     async def from_structural_superset(cls, question: Question) -> Self:
         return cls(
@@ -102,6 +127,10 @@ class MultipleChoiceQuestionDetails:
     options: 'list[OptionDetails]'
     correct_option_discriminator: int
 
+    @staticmethod
+    def loader_options() -> list[LoaderOption]:
+        return [selectinload(MultipleChoiceQuestion.options)]
+
     @classmethod
     async def from_structural_superset(cls, mcq: MultipleChoiceQuestion) -> Self:
         return cls(
@@ -139,12 +168,113 @@ class AttachmentQuestionDetails:
 @core_bp.get('/tests')
 @validate_response(list[TestDetails])
 async def get_tests():
-    tests = await current_user.test_setter_role.awaitable_attrs.created_tests # type: ignore
+    return await load_tests(current_user.id)
+
+@core_bp.get('/tests/<int:test_id>') # type: ignore
+@validate_response(TestDetails)
+async def get_test(test_id: int) -> TestDetails:
+    await get_created_test(test_id)
+    test = await orm_session.scalar(select(Test).where(Test.id == test_id).options(*TestDetails.loader_options()))
+    assert test is not None
+    return await TestDetails.from_structural_superset(test)
+
+class TestStatus(StrEnum):
+    UPCOMING = 'upcoming'
+    RUNNING = 'running'
+    PAST = 'past'
+
+@dataclass
+class TestSummariesRequest:
+    limit: int = 20
+    status: Optional[TestStatus] = None
+    after_start_time: Optional[AwareDatetime] = None
+    """The start time of the last test of the previous page, if any."""
+    after_id: Optional[int] = None
+    """The ID of the last test of the previous page, if any."""
+
+@dataclass
+class TestSummary:
+    id: int
+    title: str
+    start_time: datetime
+    end_time: datetime
+    max_marks: int
+    question_count: int
+    attempt_count: int
+
+@dataclass
+class TestSummariesPage:
+    tests: list[TestSummary]
+    """The tests of the page, latest first (by start time, then by ID)."""
+    has_more: bool
+
+MAX_TEST_SUMMARIES_PER_PAGE = 100
+
+@core_bp.get('/tests/summaries') # type: ignore
+@validate_querystring(TestSummariesRequest)
+@validate_response(TestSummariesPage)
+async def get_test_summaries(query_args: TestSummariesRequest) -> TestSummariesPage:
+    """
+    Get a page of summaries of the created tests, optionally only the upcoming, running or past ones.
+
+    Only the columns of the summaries are selected (the full definition of a test is fetched separately),
+    and pages are fetched by keyset (i.e. after the start time and ID of the last test of the previous page),
+    so that a page takes the same time to fetch however many tests were created.
+    """
+    if (query_args.after_start_time is None) != (query_args.after_id is None):
+        raise APIError(422, 'The start time and ID of the last test of the previous page must be given together.')
+    limit = min(max(query_args.limit, 1), MAX_TEST_SUMMARIES_PER_PAGE)
+    attempt_count = (
+        select(func.count())
+        .select_from(TestAttempt)
+        .where(TestAttempt.test_id == Test.id)
+        .scalar_subquery()
+    )
+    query = (
+        select(Test.id, Test.title, Test.start_time, Test.end_time, Test.max_marks, Test.question_count, attempt_count)
+        .where(Test.creator_id == current_user.id)
+        .order_by(Test.start_time.desc(), Test.id.desc())
+        .limit(limit + 1)
+    )
+    now = datetime.now(UTC)
+    match query_args.status:
+        case TestStatus.UPCOMING:
+            query = query.where(Test.start_time > now)
+        case TestStatus.RUNNING:
+            query = query.where(Test.start_time <= now, Test.end_time > now)
+        case TestStatus.PAST:
+            query = query.where(Test.end_time <= now)
+    if query_args.after_start_time is not None:
+        query = query.where(or_(
+            Test.start_time < query_args.after_start_time,
+            and_(Test.start_time == query_args.after_start_time, Test.id < query_args.after_id),
+        ))
+    rows = (await orm_session.execute(query)).tuples().all()
+    return TestSummariesPage(
+        tests=[
+            TestSummary(
+                id=id, title=title, start_time=start_time, end_time=end_time,
+                max_marks=max_marks, question_count=question_count, attempt_count=attempt_count,
+            )
+            for id, title, start_time, end_time, max_marks, question_count, attempt_count in rows[:limit]
+        ],
+        has_more=len(rows) > limit,
+    )
+
+@single_flight
+async def load_tests(creator_id: int) -> list[TestDetails]:
+    tests = await orm_session.scalars(
+        select(Test)
+        .where(Test.creator_id == creator_id)
+        .order_by(Test.id)
+        .options(*TestDetails.loader_options())
+    )
     return [await TestDetails.from_structural_superset(test) for test in tests]
 
 @core_bp.post('/create_test')
 @validate_request(TestDetails)
 async def create_test(data: TestDetails):
+    orm_session = get_orm_session()
     test = Test(
         title=data.title,
         description=data.description,
@@ -171,9 +301,22 @@ async def create_test(data: TestDetails):
             )
             for question in data.questions
         ],
-        creator=current_user.test_setter_role # type: ignore
+        creator=await orm_session.get_one(TestSetter, current_user.id)
     )
-    orm_session = get_orm_session()
     orm_session.add(test)
     await orm_session.commit()
-    return Response(status=204)
\ No newline at end of file
+    return Response(status=204)
+
+from .. import BlueprintModule  # noqa: E402
+from . import enrollment, export, grading, provisioning, results  # noqa: E402
+
+bp_modules: list[BlueprintModule] = [
+    enrollment,
+    export,
+    grading,
+    provisioning,
+    results,
+]
+
+for bp_module in bp_modules:
+    core_bp.register_blueprint(bp_module.bp)
\ No newline at end of file
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+from enum import StrEnum
+import heapq
+from typing import Optional
+
+from quart import Blueprint, current_app
+from quart_schema import validate_request, validate_response
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...data_model import Invigilator, Test, TestAttempt, TestTaker
+from ...database import chunked, orm_session
+from ...error_handling import APIError
+from . import get_created_test
+
+
+bp = Blueprint('enrollment', __name__, url_prefix='/tests/<int:test_id>')
+
+MAX_ENROLLMENTS_PER_REQUEST = 10_000
+
+class BalancingPolicy(StrEnum):
+    BALANCED = 'balanced'
+    """Even out the number of attempts of the test assigned to each invigilator."""
+    LEAST_LOADED = 'least_loaded'
+    """Even out the number of attempts assigned to each invigilator across all tests overlapping in time with the test."""
+
+@dataclass
+class EnrollmentRequest:
+    test_taker_ids: list[int]
+    invigilator_ids: Optional[list[int]] = None
+    """The invigilators to distribute the test takers across. By default, all invigilators are considered."""
+    balancing_policy: Optional[BalancingPolicy] = None
+
+@dataclass
+class EnrollmentResult:
+    test_taker_id: int
+    enrolled: bool
+    invigilator_id: Optional[int] = None
+    error: Optional[str] = None
+
+@dataclass
+class EnrollmentReport:
+    enrolled_count: int
+    failed_count: int
+    results: list[EnrollmentResult]
+
+async def get_invigilator_loads(
+    session: AsyncSession,
+    test: Test,
+    invigilator_ids: Optional[list[int]],
+    policy: BalancingPolicy,
+) -> dict[int, int]:
+    """Count the attempts that count towards the load of each invigilator under the balancing policy."""
+    attempts = select(TestAttempt.invigilator_id, TestAttempt.test_taker_id)
+    match policy:
+        case BalancingPolicy.BALANCED:
+            attempts = attempts.where(TestAttempt.test_id == test.id)
+        case BalancingPolicy.LEAST_LOADED:
+            attempts = (
+                attempts
+                .join(Test, Test.id == TestAttempt.test_id)
+                .where(Test.start_time < test.end_time, Test.end_time > test.start_time)
+            )
+    attempts_subquery = attempts.subquery()
+    query = (
+        select(Invigilator.id, func.count(attempts_subquery.c.test_taker_id))
+        .outerjoin(attempts_subquery, attempts_subquery.c.invigilator_id == Invigilator.id)
+        .group_by(Invigilator.id)
+    )
+    if invigilator_ids is not None:
+        query = query.where(Invigilator.id.in_(invigilator_ids))
+    return dict((await session.execute(query)).tuples().all())
+
+def assign_invigilators(loads: dict[int, int], count: int) -> list[int]:
+    """Assign `count` attempts one at a time to the least loaded invigilator (ties are broken by ID)."""
+    heap = [(load, invigilator_id) for invigilator_id, load in loads.items()]
+    heapq.heapify(heap)
+    assignment = []
+    for _ in range(count):
+        load, invigilator_id = heapq.heappop(heap)
+        assignment.append(invigilator_id)
+        heapq.heappush(heap, (load + 1, invigilator_id))
+    return assignment
+
+async def enroll_test_takers(
+    session: AsyncSession,
+    test: Test,
+    test_taker_ids: list[int],
+    invigilator_ids: Optional[list[int]],
+    policy: BalancingPolicy,
+) -> EnrollmentReport:
+    """
+    Create the attempts of test takers on a test, distributing them across invigilators under the balancing policy.
+
+    Invalid test takers are found with set-based queries, and the attempts are inserted in batches.
+    The environment image and screen position of the attempts are left to be provided later.
+    """
+    results = [EnrollmentResult(test_taker_id=test_taker_id, enrolled=False) for test_taker_id in test_taker_ids]
+
+    existing_test_taker_ids: set[int] = set()
+    enrolled_test_taker_ids: set[int] = set()
+    unique_test_taker_ids = list(dict.fromkeys(test_taker_ids))
+    for chunk in chunked(unique_test_taker_ids, parameters_per_row=2):
+        existing_test_taker_ids.update(await session.scalars(select(TestTaker.id).where(TestTaker.id.in_(chunk))))
+        enrolled_test_taker_ids.update(await session.scalars(
+            select(TestAttempt.test_taker_id)
+            .where(TestAttempt.test_id == test.id, TestAttempt.test_taker_id.in_(chunk))
+        ))
+
+    candidates: list[EnrollmentResult] = []
+    seen_test_taker_ids: set[int] = set()
+    for result in results:
+        if result.test_taker_id in seen_test_taker_ids:
+            result.error = 'Test taker is repeated.'
+        elif result.test_taker_id not in existing_test_taker_ids:
+            result.error = 'Test taker not found.'
+        elif result.test_taker_id in enrolled_test_taker_ids:
+            result.error = 'Test taker is already enrolled.'
+        else:
+            candidates.append(result)
+        seen_test_taker_ids.add(result.test_taker_id)
+
+    loads = await get_invigilator_loads(session, test, invigilator_ids, policy)
+    if invigilator_ids is not None and len(loads) < len(set(invigilator_ids)):
+        raise APIError(422, 'Invigilator not found.')
+    if candidates and not loads:
+        raise APIError(422, 'There are no invigilators to assign.')
+    for result, invigilator_id in zip(candidates, assign_invigilators(loads, len(candidates))):
+        result.invigilator_id = invigilator_id
+
+    for chunk in chunked(candidates, parameters_per_row=3):
+        # Test takers may have been enrolled concurrently since the queries above, so conflicts are skipped here too.
+        inserted_test_taker_ids = set(await session.scalars(
+            insert(TestAttempt)
+            .values([
+                {'test_id': test.id, 'test_taker_id': result.test_taker_id, 'invigilator_id': result.invigilator_id}
+                for result in chunk
+            ])
+            .on_conflict_do_nothing()
+            .returning(TestAttempt.test_taker_id)
+        ))
+        for result in chunk:
+            if result.test_taker_id in inserted_test_taker_ids:
+                result.enrolled = True
+            else:
+                result.invigilator_id = None
+                result.error = 'Test taker is already enrolled.'
+
+    enrolled_count = sum(result.enrolled for result in results)
+    return EnrollmentReport(enrolled_count=enrolled_count, failed_count=len(results) - enrolled_count, results=results)
+
+@bp.post('/enrollments')
+@validate_request(EnrollmentRequest)
+@validate_response(EnrollmentReport)
+async def enroll(test_id: int, data: EnrollmentRequest) -> EnrollmentReport:
+    if len(data.test_taker_ids) > MAX_ENROLLMENTS_PER_REQUEST:
+        raise APIError(413, f'At most {MAX_ENROLLMENTS_PER_REQUEST} test takers can be enrolled per request.')
+    test = await get_created_test(test_id)
+    policy = data.balancing_policy or BalancingPolicy(current_app.config['ENROLLMENT_BALANCING_POLICY'])
+    report = await enroll_test_takers(orm_session, test, data.test_taker_ids, data.invigilator_ids, policy)
+    await orm_session.commit()
+    return report
\ No newline at end of file
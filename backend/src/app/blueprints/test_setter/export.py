@@ -0,0 +1,103 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import click
+from pydantic import AwareDatetime
+from quart import Blueprint, Response, stream_with_context
+from quart.cli import ScriptInfo, pass_script_info
+from quart_schema import validate_querystring
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ...data_model import Test
+from ...database import create_engine_manager, orm_session
+from ...error_handling import APIError
+from ...export import ExportFilter, ExportFormat, ExportTable, export, export_to_file, is_parquet_supported
+from . import get_created_test
+
+
+bp = Blueprint('export', __name__, url_prefix='/tests/<int:test_id>', cli_group=None)
+
+@dataclass
+class ExportRequest:
+    table: ExportTable = ExportTable.GAZE_DATA
+    format: ExportFormat = ExportFormat.CSV
+    test_taker_id: Optional[int] = None
+    """Export only the attempt of this test taker."""
+    start: Optional[AwareDatetime] = None
+    """Export only the gaze samples at or after this time."""
+    end: Optional[AwareDatetime] = None
+    """Export only the gaze samples before this time."""
+
+@bp.get('/export')
+@validate_querystring(ExportRequest)
+async def export_test_data(test_id: int, query_args: ExportRequest) -> Response:
+    """
+    Export the gaze data or answers of a test (e.g. for offline analysis) as a gzip-compressed CSV file or a Parquet file,
+    streamed as it is read.
+    """
+    await get_created_test(test_id)
+    if query_args.format is ExportFormat.PARQUET and not is_parquet_supported():
+        raise APIError(501, 'Exporting to Parquet is not supported.')
+    export_filter = ExportFilter(test_id, query_args.test_taker_id, query_args.start, query_args.end)
+
+    @stream_with_context
+    async def body():
+        async for chunk in export(orm_session, query_args.table, query_args.format, export_filter):
+            yield chunk
+
+    file_name = f'test_{test_id}_{query_args.table}{query_args.format.file_extension}'
+    return Response(body(), content_type=query_args.format.media_type, headers={
+        'Content-Disposition': f'attachment; filename="{file_name}"',
+    })
+
+def parse_time(context: click.Context, parameter: click.Parameter, value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        time = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    if time.tzinfo is None:
+        raise click.BadParameter('The time must have a UTC offset.')
+    return time
+
+@bp.cli.command('export_test_data')
+@click.argument('test_id', type=int)
+@click.argument('path', type=click.Path(dir_okay=False, writable=True, path_type=Path))
+@click.option('--table', type=click.Choice([table.value for table in ExportTable]), default=ExportTable.GAZE_DATA.value, show_default=True)
+@click.option('--format', 'export_format', type=click.Choice([export_format.value for export_format in ExportFormat]), default=ExportFormat.CSV.value, show_default=True)
+@click.option('--test-taker-id', type=int, help='Export only the attempt of this test taker.')
+@click.option('--start', callback=parse_time, help='Export only the gaze samples at or after this ISO 8601 time.')
+@click.option('--end', callback=parse_time, help='Export only the gaze samples before this ISO 8601 time.')
+@pass_script_info
+def _export_test_data_command(
+    script_info: ScriptInfo,
+    test_id: int,
+    path: Path,
+    table: str,
+    export_format: str,
+    test_taker_id: Optional[int],
+    start: Optional[datetime],
+    end: Optional[datetime],
+):
+    """Export the gaze data or answers of a test to a gzip-compressed CSV file or a Parquet file."""
+    if ExportFormat(export_format) is ExportFormat.PARQUET and not is_parquet_supported():
+        raise click.UsageError('Exporting to Parquet requires pyarrow to be installed.')
+    app = script_info.load_app()
+    engine_manager = create_engine_manager(app)
+    async def export_test_data_command() -> int:
+        async with engine_manager():
+            engine: AsyncEngine = getattr(app, 'engine')
+            async with AsyncSession(engine) as session:
+                if await session.get(Test, test_id) is None:
+                    raise click.BadParameter('Test not found.', param_hint='TEST_ID')
+            return await export_to_file(
+                engine, path, ExportTable(table), ExportFormat(export_format),
+                ExportFilter(test_id, test_taker_id, start, end),
+            )
+
+    byte_count = asyncio.get_event_loop().run_until_complete(export_test_data_command())
+    click.echo(f'Exported {byte_count} bytes to {path}.')
\ No newline at end of file
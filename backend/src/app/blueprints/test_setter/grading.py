@@ -0,0 +1,96 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import click
+from quart import Blueprint
+from quart.cli import ScriptInfo, pass_script_info
+from quart_schema import validate_response
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ...data_model import Answer, MCQAnswer, MultipleChoiceQuestion, Question, Test
+from ...database import create_engine_manager, orm_session
+from ...error_handling import APIError
+from . import get_created_test
+
+
+bp = Blueprint('grading', __name__, url_prefix='/tests/<int:test_id>', cli_group=None)
+
+answer_table = Answer.__table__
+mcq_answer_table = MCQAnswer.__table__
+multiple_choice_question_table = MultipleChoiceQuestion.__table__
+question_table = Question.__table__
+
+@dataclass
+class GradingReport:
+    graded_count: int
+    """The number of multiple choice answers graded."""
+
+async def grade_multiple_choice_answers(session: AsyncSession, test_id: int) -> int:
+    """
+    Grade every answer to a multiple choice question of a test with one `UPDATE ... FROM` statement,
+    awarding the marks of the question to answers whose chosen option is the correct option, and none to others
+    (including answers without a chosen option). Return the number of answers graded.
+
+    Grading can be rerun, e.g. after the correct option of a question changes, as the marks are recomputed from scratch.
+    """
+    chosen_option_discriminator = (
+        select(mcq_answer_table.c.chosen_option_discriminator)
+        .where(
+            mcq_answer_table.c.test_id == answer_table.c.test_id,
+            mcq_answer_table.c.test_taker_id == answer_table.c.test_taker_id,
+            mcq_answer_table.c.question_discriminator == answer_table.c.question_discriminator,
+        )
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(answer_table)
+        .values(marks_obtained=case(
+            (chosen_option_discriminator == multiple_choice_question_table.c.correct_option_discriminator, question_table.c.max_marks),
+            else_=0,
+        ))
+        .where(
+            answer_table.c.test_id == test_id,
+            question_table.c.test_id == answer_table.c.test_id,
+            question_table.c.discriminator == answer_table.c.question_discriminator,
+            multiple_choice_question_table.c.test_id == question_table.c.test_id,
+            multiple_choice_question_table.c.discriminator == question_table.c.discriminator,
+        )
+    )
+    return result.rowcount
+
+def has_ended(test: Test) -> bool:
+    return test.end_time <= datetime.now(UTC)
+
+@bp.post('/grade')
+@validate_response(GradingReport)
+async def grade(test_id: int) -> GradingReport:
+    """Grade the answers to the multiple choice questions of a test, once it has ended."""
+    test = await get_created_test(test_id)
+    if not has_ended(test):
+        raise APIError(409, 'Test has not ended yet.')
+    report = GradingReport(graded_count=await grade_multiple_choice_answers(orm_session, test_id))
+    await orm_session.commit()
+    return report
+
+@bp.cli.command('grade_test')
+@click.argument('test_id', type=int)
+@pass_script_info
+def _grade_test_command(script_info: ScriptInfo, test_id: int):
+    """Grade the answers to the multiple choice questions of a test, once it has ended."""
+    app = script_info.load_app()
+    engine_manager = create_engine_manager(app)
+    async def grade_test_command() -> GradingReport:
+        async with engine_manager():
+            engine: AsyncEngine = getattr(app, 'engine')
+            async with AsyncSession(engine) as session, session.begin():
+                test = await session.get(Test, test_id)
+                if test is None:
+                    raise click.BadParameter('Test not found.', param_hint='TEST_ID')
+                if not has_ended(test):
+                    raise click.ClickException('Test has not ended yet.')
+                return GradingReport(graded_count=await grade_multiple_choice_answers(session, test_id))
+
+    report = asyncio.get_event_loop().run_until_complete(grade_test_command())
+    click.echo(f'Graded {report.graded_count} answers.')
\ No newline at end of file
@@ -0,0 +1,184 @@
+import asyncio
+from collections.abc import Iterable, Iterator
+import csv
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import re
+from typing import Optional
+
+import click
+from pydantic import TypeAdapter, ValidationError
+from quart import Blueprint
+from quart.cli import ScriptInfo, pass_script_info
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ...data_model import User
+from ...database import chunked, create_engine_manager
+from ...password_hashing import generate_password_hashes
+from ..user import UserDetails
+
+
+# Accounts are only provisioned through the CLI: roles can be assumed by any user, so no role can gate an endpoint for it.
+bp = Blueprint('provisioning', __name__, cli_group=None)
+
+user_details_adapter = TypeAdapter(UserDetails)
+
+type AccountRecord = UserDetails | str
+"""Account details parsed from a row, or a description of why the row is invalid."""
+
+def to_snake_case(name: str) -> str:
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+
+def parse_account_record(fields: object) -> AccountRecord:
+    if isinstance(fields, dict):
+        fields = {to_snake_case(name) if isinstance(name, str) else name: value for name, value in fields.items()}
+    try:
+        return user_details_adapter.validate_python(fields)
+    except ValidationError as e:
+        return '; '.join(f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}" for error in e.errors())
+
+def parse_json_lines(lines: Iterable[str]) -> Iterator[AccountRecord]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield parse_account_record(json.loads(line))
+        except json.JSONDecodeError:
+            yield 'Invalid JSON.'
+
+def parse_csv(lines: Iterable[str]) -> Iterator[AccountRecord]:
+    """Parse CSV rows with a header, whose column names may be in snake case or camel case."""
+    for row in csv.DictReader(lines):
+        yield parse_account_record(row)
+
+@dataclass
+class ProvisioningResult:
+    row: int
+    """The (1-based) position of the record among the provisioned records."""
+    username: Optional[str]
+    created: bool
+    error: Optional[str] = None
+
+@dataclass
+class ProvisioningReport:
+    created_count: int
+    failed_count: int
+    results: list[ProvisioningResult]
+
+async def provision_accounts(session: AsyncSession, records: list[AccountRecord]) -> ProvisioningReport:
+    """
+    Create user accounts in bulk, skipping (and reporting) invalid and conflicting records.
+
+    Passwords are hashed in parallel across the password hashing workers before the database is queried
+    (so that no transaction is held open while hashing), then conflicts with existing accounts are found
+    with one set-based query and users are inserted in batches.
+    """
+    results = [
+        ProvisioningResult(row=row, username=None, created=False, error=record)
+        if isinstance(record, str) else
+        ProvisioningResult(row=row, username=record.username, created=False)
+        for row, record in enumerate(records, start=1)
+    ]
+
+    candidates: list[tuple[ProvisioningResult, UserDetails]] = []
+    usernames: set[str] = set()
+    emails: set[str] = set()
+    for result, record in zip(results, records):
+        if isinstance(record, str):
+            continue
+        if record.username in usernames:
+            result.error = 'Username is repeated.'
+        elif record.email in emails:
+            result.error = 'E-mail address is repeated.'
+        else:
+            candidates.append((result, record))
+            usernames.add(record.username)
+            emails.add(record.email)
+
+    # Empty passwords cannot be hashed, and are reported along with conflicts.
+    hashed_passwords = [record.password for _, record in candidates if record.password]
+    password_hashes = iter(await generate_password_hashes(hashed_passwords))
+    candidate_password_hashes = [next(password_hashes) if record.password else None for _, record in candidates]
+
+    taken_usernames: set[str] = set()
+    taken_emails: set[str] = set()
+    for chunk in chunked([record for _, record in candidates], parameters_per_row=2):
+        existing = await session.execute(
+            select(User.username, User.email)
+            .where(or_(
+                User.username.in_([record.username for record in chunk]),
+                User.email.in_([record.email for record in chunk]),
+            ))
+        )
+        for username, email in existing.tuples():
+            taken_usernames.add(username)
+            taken_emails.add(email)
+    remaining_candidates: list[tuple[tuple[ProvisioningResult, UserDetails], str]] = []
+    for (result, record), password_hash in zip(candidates, candidate_password_hashes):
+        if record.username in taken_usernames:
+            result.error = 'Username is already taken up.'
+        elif record.email in taken_emails:
+            result.error = 'E-mail address is already registered.'
+        elif password_hash is None:
+            result.error = 'Password cannot be empty.'
+        else:
+            remaining_candidates.append(((result, record), password_hash))
+
+    for chunk in chunked(remaining_candidates, parameters_per_row=4):
+        # Accounts may have been created concurrently since the conflict query, so conflicts are skipped here too.
+        created_usernames = set(await session.scalars(
+            insert(User)
+            .values([
+                {
+                    'username': record.username,
+                    'full_name': record.full_name,
+                    'email': record.email,
+                    'password_hash': password_hash,
+                }
+                for (_, record), password_hash in chunk
+            ])
+            .on_conflict_do_nothing()
+            .returning(User.username)
+        ))
+        for (result, record), _ in chunk:
+            if record.username in created_usernames:
+                result.created = True
+            else:
+                result.error = 'Username or e-mail address is already taken up.'
+
+    created_count = sum(result.created for result in results)
+    return ProvisioningReport(created_count=created_count, failed_count=len(results) - created_count, results=results)
+
+@bp.cli.command('provision_accounts')
+@click.argument('file', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    '--format', 'file_format', type=click.Choice(['csv', 'jsonl']),
+    help='The format of the file. By default, it is inferred from the file extension.',
+)
+@pass_script_info
+def _provision_accounts_command(script_info: ScriptInfo, file: Path, file_format: Optional[str]):
+    """Create user accounts in bulk from a CSV (with a header) or JSON lines file of account details."""
+    file_format = file_format or file.suffix.removeprefix('.')
+    if file_format not in ('csv', 'jsonl'):
+        raise click.BadParameter('The format cannot be inferred from the file extension.', param_hint='--format')
+    with file.open(newline='') as lines:
+        records = list(parse_csv(lines) if file_format == 'csv' else parse_json_lines(lines))
+
+    app = script_info.load_app()
+    engine_manager = create_engine_manager(app)
+    async def provision_accounts_command() -> ProvisioningReport:
+        async with engine_manager(), app.app_context():
+            engine: AsyncEngine = getattr(app, 'engine')
+            async with AsyncSession(engine) as session, session.begin():
+                report = await provision_accounts(session, records)
+        getattr(app, 'password_hashing_service').shutdown()
+        return report
+
+    report = asyncio.get_event_loop().run_until_complete(provision_accounts_command())
+    for result in report.results:
+        if result.error is not None:
+            click.echo(f'Row {result.row} ({result.username or "invalid"}): {result.error}', err=True)
+    click.echo(f'Created {report.created_count} accounts, {report.failed_count} failed.')
\ No newline at end of file
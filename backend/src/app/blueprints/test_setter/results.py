@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from quart import Blueprint, Response
+from quart_schema import validate_querystring, validate_response
+from sqlalchemy import Row, func, select, tuple_
+
+from ...data_model import Answer, Question, Test, TestAttempt, User
+from ...database import orm_session, single_flight
+from ...error_handling import APIError
+from ...streaming import streamed_json_response
+from . import get_created_test
+
+
+bp = Blueprint('results', __name__, url_prefix='/tests/<int:test_id>')
+
+MAX_RESULTS_PER_PAGE = 500
+
+answer_table = Answer.__table__
+question_table = Question.__table__
+test_attempt_table = TestAttempt.__table__
+user_table = User.__table__
+
+@dataclass
+class ResultsPageRequest:
+    limit: int = 100
+    after_rank: Optional[int] = None
+    """The rank of the last result of the previous page, if any."""
+    after_test_taker_id: Optional[int] = None
+    """The test taker of the last result of the previous page, if any."""
+
+@dataclass
+class AttemptResult:
+    test_taker_id: int
+    username: str
+    full_name: str
+    marks_obtained: int
+    """The sum of the marks of the graded answers."""
+    graded: bool
+    """Whether every answer of the attempt has been graded."""
+    rank: int
+    """The rank of the attempt among the attempts of the test (attempts with equal marks have equal ranks)."""
+    percentile: float
+    """The percentage of the other attempts of the test that obtained fewer marks."""
+    caught_cheating: bool
+
+@dataclass
+class ResultsPage:
+    max_marks: int
+    attempt_count: int
+    results: list[AttemptResult]
+    """The results of the page, in order of rank (ties are broken by test taker)."""
+    has_more: bool
+
+@dataclass
+class ScoreCount:
+    marks_obtained: int
+    answer_count: int
+
+@dataclass
+class QuestionScoreDistribution:
+    question_discriminator: int
+    max_marks: int
+    answer_count: int
+    ungraded_count: int
+    mean_marks: Optional[float]
+    """The mean marks of the graded answers, if any."""
+    score_counts: list[ScoreCount]
+    """The number of graded answers that obtained each score, in increasing order of marks."""
+
+def ranked_attempts_query(test_id: int):
+    """A query of the totals of the attempts of a test, ranked with window functions over the whole test."""
+    totals = (
+        select(
+            test_attempt_table.c.test_taker_id,
+            test_attempt_table.c.caught_cheating,
+            func.coalesce(func.sum(answer_table.c.marks_obtained), 0).label('marks_obtained'),
+            (func.count(answer_table.c.question_discriminator) == func.count(answer_table.c.marks_obtained)).label('graded'),
+        )
+        .select_from(test_attempt_table)
+        .outerjoin(answer_table, (answer_table.c.test_id == test_attempt_table.c.test_id) & (answer_table.c.test_taker_id == test_attempt_table.c.test_taker_id))
+        .where(test_attempt_table.c.test_id == test_id)
+        .group_by(test_attempt_table.c.test_taker_id, test_attempt_table.c.caught_cheating)
+        .subquery()
+    )
+    return (
+        select(
+            totals,
+            func.rank().over(order_by=totals.c.marks_obtained.desc()).label('rank'),
+            (func.percent_rank().over(order_by=totals.c.marks_obtained) * 100).label('percentile'),
+            func.count().over().label('attempt_count'),
+        )
+        .subquery()
+    )
+
+def attempt_results_query(test_id: int):
+    """A query of the results of the attempts of a test, in order of rank (ties are broken by test taker)."""
+    ranked_attempts = ranked_attempts_query(test_id)
+    return (
+        select(ranked_attempts, user_table.c.username, user_table.c.full_name)
+        .join(user_table, user_table.c.id == ranked_attempts.c.test_taker_id)
+        .order_by(ranked_attempts.c.rank, ranked_attempts.c.test_taker_id)
+    )
+
+def to_attempt_result(row: Row) -> AttemptResult:
+    return AttemptResult(
+        test_taker_id=row.test_taker_id,
+        username=row.username,
+        full_name=row.full_name,
+        marks_obtained=row.marks_obtained,
+        graded=bool(row.graded),
+        rank=row.rank,
+        percentile=float(row.percentile),
+        caught_cheating=row.caught_cheating,
+    )
+
+@single_flight
+async def load_results_page(test_id: int, limit: int, after: Optional[tuple[int, int]]) -> ResultsPage:
+    """Load a page of the results of a test after the given (rank, test taker) position, as plain rows."""
+    query = attempt_results_query(test_id).limit(limit + 1)
+    if after is not None:
+        ranked_attempts = query.selected_columns
+        query = query.where(tuple_(ranked_attempts.rank, ranked_attempts.test_taker_id) > tuple_(*after))
+    rows = (await orm_session.execute(query)).all()
+    max_marks = await orm_session.scalar(select(Test.max_marks).where(Test.id == test_id))
+    if rows:
+        attempt_count = rows[0].attempt_count
+    else:
+        attempt_count = await orm_session.scalar(select(func.count()).where(test_attempt_table.c.test_id == test_id))
+    return ResultsPage(
+        max_marks=max_marks or 0,
+        attempt_count=attempt_count or 0,
+        results=[to_attempt_result(row) for row in rows[:limit]],
+        has_more=len(rows) > limit,
+    )
+
+@single_flight
+async def load_score_distributions(test_id: int) -> list[QuestionScoreDistribution]:
+    """Count the answers to each question of a test by marks obtained, as plain rows."""
+    rows = (await orm_session.execute(
+        select(
+            question_table.c.discriminator,
+            question_table.c.max_marks,
+            answer_table.c.marks_obtained,
+            func.count(answer_table.c.test_taker_id),
+        )
+        .select_from(question_table)
+        .outerjoin(answer_table, (answer_table.c.test_id == question_table.c.test_id) & (answer_table.c.question_discriminator == question_table.c.discriminator))
+        .where(question_table.c.test_id == test_id)
+        .group_by(question_table.c.number, question_table.c.discriminator, question_table.c.max_marks, answer_table.c.marks_obtained)
+        .order_by(question_table.c.number, answer_table.c.marks_obtained)
+    )).tuples().all()
+    distributions: dict[int, QuestionScoreDistribution] = {}
+    for discriminator, max_marks, marks_obtained, answer_count in rows:
+        distribution = distributions.setdefault(discriminator, QuestionScoreDistribution(
+            question_discriminator=discriminator, max_marks=max_marks,
+            answer_count=0, ungraded_count=0, mean_marks=None, score_counts=[],
+        ))
+        distribution.answer_count += answer_count
+        if marks_obtained is None:
+            distribution.ungraded_count += answer_count
+        else:
+            distribution.score_counts.append(ScoreCount(marks_obtained=marks_obtained, answer_count=answer_count))
+    for distribution in distributions.values():
+        graded_count = distribution.answer_count - distribution.ungraded_count
+        if graded_count:
+            distribution.mean_marks = sum(score.marks_obtained * score.answer_count for score in distribution.score_counts) / graded_count
+    return list(distributions.values())
+
+@bp.get('/results') # type: ignore
+@validate_querystring(ResultsPageRequest)
+@validate_response(ResultsPage)
+async def get_results(test_id: int, query_args: ResultsPageRequest) -> ResultsPage:
+    """
+    Get a page of the results of the attempts of a test, ranked by marks obtained.
+
+    Totals, ranks and percentiles are computed by the database with aggregate and window functions, and pages
+    are fetched by keyset (i.e. after the rank and test taker of the last result of the previous page).
+    """
+    if (query_args.after_rank is None) != (query_args.after_test_taker_id is None):
+        raise APIError(422, 'The rank and test taker of the last result of the previous page must be given together.')
+    await get_created_test(test_id)
+    limit = min(max(query_args.limit, 1), MAX_RESULTS_PER_PAGE)
+    after = None
+    if query_args.after_rank is not None and query_args.after_test_taker_id is not None:
+        after = (query_args.after_rank, query_args.after_test_taker_id)
+    return await load_results_page(test_id, limit, after)
+
+@bp.get('/results/all')
+async def stream_results(test_id: int) -> Response:
+    """
+    Get the results of all the attempts of a test (like `get_results`) in one response, streamed as they are read
+    rather than built in memory, e.g. for large tests. The response is a JSON array of `AttemptResult`s.
+    """
+    await get_created_test(test_id)
+    return streamed_json_response(attempt_results_query(test_id), to_attempt_result)
+
+@bp.get('/results/questions') # type: ignore
+@validate_response(list[QuestionScoreDistribution])
+async def get_score_distributions(test_id: int) -> list[QuestionScoreDistribution]:
+    """Get the distribution of the marks obtained in the answers to each question of a test."""
+    await get_created_test(test_id)
+    return await load_score_distributions(test_id)
\ No newline at end of file
@@ -0,0 +1,67 @@
+from collections.abc import Awaitable, Callable
+from functools import wraps
+
+from quart import Blueprint, Response, current_app
+
+from ...data_model import TestAttempt, TestTaker, User
+from ...database import orm_session
+from ...error_handling import APIError
+from ..user.authentication import authentication_required, ensure_authenticated, invalidate_current_user, current_user
+
+
+bp = Blueprint('test_taker', __name__, url_prefix='/test_taker')
+bp.before_request(ensure_authenticated)
+bp.before_websocket(ensure_authenticated)
+
+@bp.post('/assume_role')
+async def assume_role():
+    user = await orm_session.get_one(User, current_user.id)
+    if await user.awaitable_attrs.test_taker_role is not None:
+        raise APIError(400, 'User is already a test taker.')
+    user.test_taker_role = TestTaker()
+    await orm_session.commit()
+    invalidate_current_user()
+    return Response(status=204)
+
+@authentication_required
+async def require_test_taker_role():
+    if not current_user.test_taker_role:
+        raise APIError(403, 'Forbidden')
+
+def test_taker_role_required[T, **P](func: Callable[P, Awaitable[T]] | Callable[P, T]) -> Callable[P, Awaitable[T]]:
+    @wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        await require_test_taker_role()
+        return await current_app.ensure_async(func)(*args, **kwargs) # type: ignore
+    return wrapper
+
+async def get_current_attempt(test_id: int) -> TestAttempt:
+    attempt = await orm_session.get(TestAttempt, (test_id, current_user.id))
+    if attempt is None:
+        raise APIError(404, 'Test attempt not found.')
+    return attempt
+
+async def get_ongoing_attempt(test_id: int) -> TestAttempt:
+    attempt = await get_current_attempt(test_id)
+    if attempt.end_time is not None:
+        raise APIError(409, 'Test attempt has already ended.')
+    return attempt
+
+core_bp = Blueprint('test_taker_core', __name__)
+core_bp.before_request(require_test_taker_role)
+core_bp.before_websocket(require_test_taker_role)
+bp.register_blueprint(core_bp)
+
+from .. import BlueprintModule  # noqa: E402
+from . import answers, attachments, environment_image, gaze_data, test_definition  # noqa: E402
+
+bp_modules: list[BlueprintModule] = [
+    answers,
+    attachments,
+    environment_image,
+    gaze_data,
+    test_definition,
+]
+
+for bp_module in bp_modules:
+    core_bp.register_blueprint(bp_module.bp)
\ No newline at end of file
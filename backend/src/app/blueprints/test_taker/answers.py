@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Optional
+
+from quart import Blueprint
+from quart_schema import validate_request, validate_response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from ...data_model import Answer, MCQAnswer, Test, TestAttempt, TextFieldAnswer
+from ...database import orm_session
+from ...error_handling import APIError
+from ..user.authentication import current_user
+from .test_definition import CandidateQuestionDetails, CandidateTestDetails, get_candidate_test_details
+
+
+bp = Blueprint('answers', __name__, url_prefix='/attempts/<int:test_id>')
+
+answer_table = Answer.__table__
+mcq_answer_table = MCQAnswer.__table__
+text_field_answer_table = TextFieldAnswer.__table__
+
+@dataclass
+class AnswerChange:
+    """
+    The state of the answer to a question after a change on the client.
+
+    The sequence number must increase with every change of the answer on the client.
+    """
+    question_discriminator: int
+    sequence_number: int
+    is_bookmarked: bool = False
+    chosen_option_discriminator: Optional[int] = None
+    """The chosen option, if the question is a multiple choice question."""
+    answer_text: Optional[str] = None
+    """The answer text, if the question is a text field question."""
+
+@dataclass
+class AnswerChangeBatch:
+    changes: list[AnswerChange]
+
+@dataclass
+class AnswerSaveReport:
+    saved: list[int]
+    """The discriminators of the questions whose answers were saved."""
+    stale: list[int]
+    """The discriminators of the questions whose changes were older than their saved answers, and were dropped."""
+
+def latest_changes(changes: list[AnswerChange]) -> list[AnswerChange]:
+    """Keep only the change with the largest sequence number of each question."""
+    latest: dict[int, AnswerChange] = {}
+    for change in changes:
+        previous = latest.get(change.question_discriminator)
+        if previous is None or change.sequence_number > previous.sequence_number:
+            latest[change.question_discriminator] = change
+    return list(latest.values())
+
+def validate_change(change: AnswerChange, question: Optional[CandidateQuestionDetails]):
+    if question is None:
+        raise APIError(400, f'Question {change.question_discriminator} not found.')
+    if question.multiple_choice_question is not None:
+        if change.answer_text is not None:
+            raise APIError(400, f'Question {change.question_discriminator} is a multiple choice question.')
+        if change.chosen_option_discriminator is not None and change.chosen_option_discriminator not in (
+            option.discriminator for option in question.multiple_choice_question.options
+        ):
+            raise APIError(400, f'Option {change.chosen_option_discriminator} of question {change.question_discriminator} not found.')
+    elif change.chosen_option_discriminator is not None:
+        raise APIError(400, f'Question {change.question_discriminator} is not a multiple choice question.')
+    elif question.text_field_question is None and change.answer_text is not None:
+        raise APIError(400, f'Question {change.question_discriminator} is not a text field question.')
+
+async def get_answerable_test_details(test_id: int) -> CandidateTestDetails:
+    """Get the (cached) definition of a test, checking that the attempt of the current user on it is ongoing."""
+    row = (await orm_session.execute(
+        select(Test.version, Test.start_time, Test.end_time, TestAttempt.end_time)
+        .join(TestAttempt, TestAttempt.test_id == Test.id)
+        .where(Test.id == test_id, TestAttempt.test_taker_id == current_user.id)
+    )).one_or_none()
+    if row is None:
+        raise APIError(404, 'Test attempt not found.')
+    version, start_time, end_time, attempt_end_time = row._tuple()
+    now = datetime.now(UTC)
+    if start_time > now:
+        raise APIError(403, 'Test has not started yet.')
+    if attempt_end_time is not None or end_time < now:
+        raise APIError(409, 'Test attempt has already ended.')
+    return await get_candidate_test_details(test_id, version)
+
+async def save_answers(attempt_id: TestAttempt.Id, changes: list[AnswerChange], questions: dict[int, CandidateQuestionDetails]) -> list[int]:
+    """
+    Upsert the latest changes of answers with one statement per answer table, skipping the changes that are not newer
+    than the saved answers. Return the discriminators of the questions whose answers were saved.
+    """
+    statement = insert(answer_table).values([
+        {
+            'test_id': attempt_id.test_id,
+            'test_taker_id': attempt_id.test_taker_id,
+            'question_discriminator': change.question_discriminator,
+            'is_bookmarked': change.is_bookmarked,
+            'sequence_number': change.sequence_number,
+        }
+        for change in changes
+    ])
+    saved_question_discriminators = set(await orm_session.scalars(
+        statement.on_conflict_do_update(
+            index_elements=[answer_table.c.test_id, answer_table.c.test_taker_id, answer_table.c.question_discriminator],
+            set_={'is_bookmarked': statement.excluded.is_bookmarked, 'sequence_number': statement.excluded.sequence_number},
+            where=answer_table.c.sequence_number < statement.excluded.sequence_number,
+        )
+        .returning(answer_table.c.question_discriminator)
+    ))
+    saved_changes = [change for change in changes if change.question_discriminator in saved_question_discriminators]
+
+    mcq_changes = [change for change in saved_changes if questions[change.question_discriminator].multiple_choice_question is not None]
+    if mcq_changes:
+        statement = insert(mcq_answer_table).values([
+            {
+                'test_id': attempt_id.test_id,
+                'test_taker_id': attempt_id.test_taker_id,
+                'question_discriminator': change.question_discriminator,
+                'chosen_option_discriminator': change.chosen_option_discriminator,
+            }
+            for change in mcq_changes
+        ])
+        await orm_session.execute(statement.on_conflict_do_update(
+            index_elements=[mcq_answer_table.c.test_id, mcq_answer_table.c.test_taker_id, mcq_answer_table.c.question_discriminator],
+            set_={'chosen_option_discriminator': statement.excluded.chosen_option_discriminator},
+        ))
+
+    text_field_changes = [change for change in saved_changes if questions[change.question_discriminator].text_field_question is not None]
+    if text_field_changes:
+        statement = insert(text_field_answer_table).values([
+            {
+                'test_id': attempt_id.test_id,
+                'test_taker_id': attempt_id.test_taker_id,
+                'question_discriminator': change.question_discriminator,
+                'answer_text': change.answer_text or '',
+            }
+            for change in text_field_changes
+        ])
+        await orm_session.execute(statement.on_conflict_do_update(
+            index_elements=[text_field_answer_table.c.test_id, text_field_answer_table.c.test_taker_id, text_field_answer_table.c.question_discriminator],
+            set_={'answer_text': statement.excluded.answer_text},
+        ))
+    return [change.question_discriminator for change in saved_changes]
+
+@bp.post('/answers')
+@validate_request(AnswerChangeBatch)
+@validate_response(AnswerSaveReport)
+async def autosave_answers(test_id: int, data: AnswerChangeBatch) -> AnswerSaveReport:
+    """
+    Save a batch of changes of the answers of a test attempt, e.g. as autosaved by the client every few seconds.
+
+    Changes are idempotent: a change whose sequence number is not larger than that of the saved answer
+    (e.g. a retried or reordered one) is dropped. The questions are validated against the cached test definition,
+    so saving a batch takes a constant number of statements, however many answers changed.
+    """
+    test_details = await get_answerable_test_details(test_id)
+    questions = {question.discriminator: question for question in test_details.questions}
+    changes = latest_changes(data.changes)
+    for change in changes:
+        validate_change(change, questions.get(change.question_discriminator))
+    if not changes:
+        return AnswerSaveReport(saved=[], stale=[])
+
+    saved = await save_answers(TestAttempt.Id(test_id, current_user.id), changes, questions)
+    await orm_session.commit()
+    saved_set = set(saved)
+    return AnswerSaveReport(
+        saved=saved,
+        stale=[change.question_discriminator for change in changes if change.question_discriminator not in saved_set],
+    )
\ No newline at end of file
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+
+from quart import Blueprint, current_app, request
+from quart_schema import validate_response
+from sqlalchemy.dialects.postgresql import insert
+
+from ...data_model import Answer, AttachmentAnswer
+from ...database import orm_session
+from ...error_handling import APIError
+from ...file_storage import FileTooLargeError, get_file_storage
+from ..files import file_url
+from ..user.authentication import current_user
+from .answers import get_answerable_test_details
+
+
+bp = Blueprint('attachments', __name__, url_prefix='/attempts/<int:test_id>/answers/<int:question_discriminator>')
+
+answer_table = Answer.__table__
+attachment_answer_table = AttachmentAnswer.__table__
+
+@dataclass
+class AttachmentUploadReport:
+    attached_file_url: str
+    size: int
+
+@bp.put('/attachment')
+@validate_response(AttachmentUploadReport)
+async def upload_attachment(test_id: int, question_discriminator: int) -> AttachmentUploadReport:
+    """
+    Upload the attachment of the answer to an attachment question, as the raw request body (replacing any previous one).
+
+    The body is streamed to the file storage as it is received, and the upload is rejected as soon as it exceeds
+    the size limit. Identical files (e.g. retried uploads) are stored once.
+    """
+    test_details = await get_answerable_test_details(test_id)
+    question = next((question for question in test_details.questions if question.discriminator == question_discriminator), None)
+    if question is None:
+        raise APIError(404, f'Question {question_discriminator} not found.')
+    if question.attachment_question is None:
+        raise APIError(400, f'Question {question_discriminator} is not an attachment question.')
+    max_size: int = current_app.config['ATTACHMENT_MAX_SIZE']
+    if request.content_length is not None and request.content_length > max_size:
+        raise APIError(413, f'Attachments must be at most {max_size} bytes.')
+    test_taker_id = current_user.id
+    # End the transaction begun when checking the attempt, rather than holding it open while the body is received.
+    await orm_session.commit()
+
+    try:
+        stored_file = await get_file_storage().store(request.body, max_size)
+    except FileTooLargeError:
+        raise APIError(413, f'Attachments must be at most {max_size} bytes.')
+
+    url = file_url(stored_file.digest)
+    key = {'test_id': test_id, 'test_taker_id': test_taker_id, 'question_discriminator': question_discriminator}
+    await orm_session.execute(insert(answer_table).values(key).on_conflict_do_nothing())
+    statement = insert(attachment_answer_table).values(**key, attached_file_url=url)
+    await orm_session.execute(statement.on_conflict_do_update(
+        index_elements=[attachment_answer_table.c.test_id, attachment_answer_table.c.test_taker_id, attachment_answer_table.c.question_discriminator],
+        set_={'attached_file_url': statement.excluded.attached_file_url},
+    ))
+    await orm_session.commit()
+    return AttachmentUploadReport(attached_file_url=url, size=stored_file.size)
\ No newline at end of file
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+from quart import Blueprint, current_app, request
+from quart_schema import validate_response
+from sqlalchemy import update
+
+from ...data_model import TestAttempt
+from ...database import orm_session
+from ...error_handling import APIError
+from ...file_storage import FileTooLargeError, get_file_storage
+from ...images import THUMBNAIL_SIZES, InvalidImageError, is_image_processing_supported, process_image
+from ..files import file_url, thumbnail_url
+from ..user.authentication import current_user
+from . import get_ongoing_attempt
+
+
+bp = Blueprint('environment_image', __name__, url_prefix='/attempts/<int:test_id>')
+
+@dataclass
+class EnvironmentImageUploadReport:
+    environment_image_url: str
+    thumbnail_urls: dict[int, str]
+    """The URLs of the thumbnails of the image, by size."""
+    perceptual_hash: str
+
+@bp.put('/environment_image')
+@validate_response(EnvironmentImageUploadReport)
+async def upload_environment_image(test_id: int) -> EnvironmentImageUploadReport:
+    """
+    Upload the photo of the test taking environment of a test attempt, as the raw request body (replacing any previous one).
+
+    The original is streamed to the file storage as it is received, and its thumbnails and perceptual hash are generated
+    on the image processing pool.
+    """
+    if not is_image_processing_supported():
+        raise APIError(501, 'Image processing is not supported.')
+    await get_ongoing_attempt(test_id)
+    max_size: int = current_app.config['ENVIRONMENT_IMAGE_MAX_SIZE']
+    if request.content_length is not None and request.content_length > max_size:
+        raise APIError(413, f'Environment images must be at most {max_size} bytes.')
+    test_taker_id = current_user.id
+    # End the transaction begun when checking the attempt, rather than holding it open while the image is received and processed.
+    await orm_session.commit()
+
+    try:
+        stored_file = await get_file_storage().store(request.body, max_size)
+    except FileTooLargeError:
+        raise APIError(413, f'Environment images must be at most {max_size} bytes.')
+    try:
+        processed_image = await process_image(stored_file.digest)
+    except InvalidImageError:
+        raise APIError(415, 'The environment image is not of a supported image format.')
+
+    url = file_url(stored_file.digest)
+    await orm_session.execute(
+        update(TestAttempt)
+        .where(TestAttempt.test_id == test_id, TestAttempt.test_taker_id == test_taker_id)
+        .values(environment_image_url=url, environment_image_hash=processed_image.perceptual_hash)
+    )
+    await orm_session.commit()
+    return EnvironmentImageUploadReport(
+        environment_image_url=url,
+        thumbnail_urls={size: thumbnail_url(stored_file.digest, size) for size in THUMBNAIL_SIZES},
+        perceptual_hash=processed_image.perceptual_hash,
+    )
\ No newline at end of file
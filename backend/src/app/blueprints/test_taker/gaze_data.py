@@ -0,0 +1,146 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from pydantic import AwareDatetime, TypeAdapter, ValidationError
+from quart import Blueprint, Response, current_app, request, websocket
+from quart_schema import validate_request, validate_response
+
+from ...data_model import Rectangle, Test, TestAttempt
+from ...database import orm_session
+from ...error_handling import APIError
+from ...gaze.buffering import GazeDataBuffer, GazeDataStreams
+from ...gaze.cheating_detection import CheatingDetector
+from ...gaze import ingestion
+from ...gaze.ingestion import IngestionReport
+from ...gaze.wire_format import GazeFrame, InvalidFrameError, decode_frame, samples_from_tuples
+from . import get_ongoing_attempt
+
+
+bp = Blueprint('gaze_data', __name__, url_prefix='/attempts/<int:test_id>')
+
+@dataclass
+class GazeSample:
+    timestamp: AwareDatetime
+    x: float
+    y: float
+
+@dataclass
+class GazeDataBatch:
+    samples: list[GazeSample]
+
+    def to_array(self) -> np.ndarray:
+        return samples_from_tuples((sample.timestamp, sample.x, sample.y) for sample in self.samples)
+
+gaze_data_batch_adapter = TypeAdapter(GazeDataBatch)
+
+async def get_attempt_window(test_id: int) -> tuple[TestAttempt.Id, tuple[datetime, datetime]]:
+    attempt = await get_ongoing_attempt(test_id)
+    if attempt.screen_position is None:
+        raise APIError(409, 'Screen position has not been calibrated.')
+    test = await orm_session.get_one(Test, test_id)
+    return attempt.id, (test.start_time, test.end_time)
+
+def decode_attempt_frame(data: bytes, attempt_id: TestAttempt.Id) -> GazeFrame:
+    frame = decode_frame(data)
+    if frame.attempt_id != attempt_id:
+        raise InvalidFrameError('The frame belongs to another test attempt.')
+    return frame
+
+@bp.put('/screen_position')
+@validate_request(Rectangle)
+async def calibrate_screen_position(test_id: int, data: Rectangle):
+    attempt = await get_ongoing_attempt(test_id)
+    attempt.screen_position = data
+    attempt_id = attempt.id # The attempt is expired by the commit.
+    await orm_session.commit()
+    cheating_detector: CheatingDetector = getattr(current_app, 'cheating_detector')
+    cheating_detector.forget(attempt_id)
+    return Response(status=204)
+
+@bp.post('/gaze_data')
+@validate_request(GazeDataBatch)
+@validate_response(IngestionReport)
+async def ingest_gaze_data(test_id: int, data: GazeDataBatch) -> IngestionReport:
+    attempt_id, window = await get_attempt_window(test_id)
+    return await ingestion.ingest_gaze_data(orm_session, attempt_id, data.to_array(), window)
+
+@bp.post('/gaze_data/packed')
+@validate_response(IngestionReport)
+async def ingest_packed_gaze_data(test_id: int) -> IngestionReport:
+    """Ingest a batch of gaze samples sent as a binary frame (see `gaze.wire_format`)."""
+    attempt_id, window = await get_attempt_window(test_id)
+    try:
+        frame = decode_attempt_frame(await request.get_data(), attempt_id)
+    except InvalidFrameError as e:
+        raise APIError(400, str(e))
+    return await ingestion.ingest_gaze_data(orm_session, attempt_id, frame.samples, window)
+
+@bp.websocket('/gaze_data/stream')
+async def stream_gaze_data(test_id: int):
+    """
+    Receive a stream of gaze data batches, as binary frames or as JSON text messages,
+    and store them in size- or time-bounded batches.
+
+    A report is sent back after each flush of the buffered samples.
+    Frames with a sequence number not greater than that of a previous frame are rejected as duplicates.
+    If a periodic flush fails, the stream is closed, since its samples can no longer be stored in time.
+    """
+    attempt_id, window = await get_attempt_window(test_id)
+    await orm_session.commit() # Avoid holding a transaction open for the lifetime of the stream.
+
+    async def flush(samples: np.ndarray) -> IngestionReport:
+        try:
+            return await ingestion.ingest_gaze_data(orm_session, attempt_id, samples, window)
+        except Exception:
+            await orm_session.rollback()
+            raise
+
+    async def send_report(report: IngestionReport):
+        await websocket.send_as(report, IngestionReport) # type: ignore
+
+    buffer = GazeDataBuffer(
+        flush,
+        flush_size=current_app.config['GAZE_DATA_FLUSH_SIZE'],
+        flush_interval=current_app.config['GAZE_DATA_FLUSH_INTERVAL'],
+    )
+    gaze_data_streams: GazeDataStreams = getattr(current_app, 'gaze_data_streams')
+    stream_task = asyncio.current_task()
+    assert stream_task is not None
+
+    async def flush_periodically():
+        try:
+            await buffer.flush_periodically(send_report)
+        except Exception:
+            current_app.logger.exception('Failed to flush the gaze data stream of %s.', attempt_id)
+            gaze_data_streams.record_failed_flush()
+            await websocket.close(1011, 'Failed to store gaze data')
+            stream_task.cancel()
+
+    last_sequence_number = -1
+    await websocket.accept()
+    current_app.logger.debug('Opened the gaze data stream of %s, buffering %d bytes.', attempt_id, buffer.nbytes)
+    periodic_flush = asyncio.create_task(flush_periodically())
+    with gaze_data_streams.open(buffer):
+        try:
+            while True:
+                data = await websocket.receive()
+                try:
+                    if isinstance(data, bytes):
+                        frame = decode_attempt_frame(data, attempt_id)
+                        if frame.sequence_number <= last_sequence_number:
+                            await send_report(IngestionReport(accepted=0, rejected=len(frame.samples)))
+                            continue
+                        last_sequence_number = frame.sequence_number
+                        samples = frame.samples
+                    else:
+                        samples = gaze_data_batch_adapter.validate_json(data).to_array()
+                except (InvalidFrameError, ValidationError):
+                    await websocket.close(1007, 'Invalid gaze data batch')
+                    return
+                for report in await buffer.add(samples):
+                    await send_report(report)
+        finally:
+            periodic_flush.cancel()
+            await asyncio.shield(buffer.flush())
\ No newline at end of file
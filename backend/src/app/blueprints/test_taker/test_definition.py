@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Optional, Self
+
+from quart import Blueprint
+from quart_schema import validate_response
+from sqlalchemy import select
+
+from ...caching import get_test_definition_cache
+from ...data_model import Test, TestAttempt
+from ...database import orm_session, single_flight
+from ...error_handling import APIError
+from ..test_setter import (
+    AttachmentQuestionDetails, OptionDetails, QuestionDetails, TestDetails, TextFieldQuestionDetails,
+)
+from ..user.authentication import current_user
+
+
+bp = Blueprint('test_definition', __name__, url_prefix='/attempts/<int:test_id>')
+
+@dataclass
+class CandidateTestDetails:
+    """The definition of a test as presented to its test takers, i.e. without the correct answers."""
+    id: int
+    title: str
+    description: str
+    start_time: datetime
+    end_time: datetime
+    guidelines: str
+    questions: 'list[CandidateQuestionDetails]'
+
+    @classmethod
+    def from_structural_superset(cls, test: TestDetails) -> Self:
+        return cls(
+            id=test.id,
+            title=test.title,
+            description=test.description,
+            start_time=test.start_time,
+            end_time=test.end_time,
+            guidelines=test.guidelines,
+            questions=[CandidateQuestionDetails.from_structural_superset(question) for question in test.questions],
+        )
+
+@dataclass
+class CandidateQuestionDetails:
+    discriminator: int
+    question_text: str
+    max_marks: int
+    multiple_choice_question: 'Optional[CandidateMultipleChoiceQuestionDetails]' = None
+    text_field_question: Optional[TextFieldQuestionDetails] = None
+    attachment_question: Optional[AttachmentQuestionDetails] = None
+
+    @classmethod
+    def from_structural_superset(cls, question: QuestionDetails) -> Self:
+        return cls(
+            discriminator=question.discriminator,
+            question_text=question.question_text,
+            max_marks=question.max_marks,
+            multiple_choice_question=(
+                CandidateMultipleChoiceQuestionDetails(options=mcq.options)
+                if (mcq:= question.multiple_choice_question) is not None
+                else None
+            ),
+            text_field_question=question.text_field_question,
+            attachment_question=question.attachment_question,
+        )
+
+@dataclass
+class CandidateMultipleChoiceQuestionDetails:
+    options: list[OptionDetails]
+
+@single_flight
+async def load_candidate_test_details(test_id: int, version: int) -> CandidateTestDetails:
+    """
+    Build the definition of a test from the database, and cache it.
+    The expected version only distinguishes loads of different versions from each other.
+    """
+    test = await orm_session.scalar(select(Test).where(Test.id == test_id).options(*TestDetails.loader_options()))
+    assert test is not None
+    test_details = CandidateTestDetails.from_structural_superset(await TestDetails.from_structural_superset(test))
+    get_test_definition_cache().put(test_id, test_details, test.version)
+    return test_details
+
+async def get_candidate_test_details(test_id: int, version: int) -> CandidateTestDetails:
+    """Get the definition of a test from the cache, loading it on a miss."""
+    test_details = get_test_definition_cache().get(test_id, version)
+    if test_details is None:
+        test_details = await load_candidate_test_details(test_id, version)
+    return test_details
+
+@bp.get('/test') # type: ignore
+@validate_response(CandidateTestDetails)
+async def get_test(test_id: int) -> CandidateTestDetails:
+    """
+    Get the definition of the test of a test attempt, once the test has started.
+
+    Definitions are served from an in-memory cache, since every test taker of a test fetches it at the same moment.
+    Concurrent fetches on a cache miss share a single load.
+    """
+    row = (await orm_session.execute(
+        select(Test.version, Test.start_time)
+        .join(TestAttempt, TestAttempt.test_id == Test.id)
+        .where(Test.id == test_id, TestAttempt.test_taker_id == current_user.id)
+    )).one_or_none()
+    if row is None:
+        raise APIError(404, 'Test attempt not found.')
+    version, start_time = row._tuple()
+    if start_time > datetime.now(UTC):
+        raise APIError(403, 'Test has not started yet.')
+    return await get_candidate_test_details(test_id, version)
\ No newline at end of file
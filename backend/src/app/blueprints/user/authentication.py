@@ -8,8 +8,10 @@ import quart_auth
 from quart_auth import AuthUser, Unauthorized, login_required, login_user, logout_user
 from quart_schema import validate_querystring, validate_request
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from werkzeug.local import LocalProxy
 
+from ...caching import get_principal_cache
 from ...data_model import User
 from ...database import orm_session
 from ...error_handling import APIError, handle_api_error
@@ -57,14 +59,56 @@ async def login(data: LoginCredential, query_args: RememberMeOption):
         else:
             raise InvalidCredentialError
 
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user of a request, along with flags for the roles that the user has assumed."""
+    id: int
+    username: str
+    full_name: str
+    email: str
+    test_setter_role: bool
+    test_taker_role: bool
+    invigilator_role: bool
+
+    @classmethod
+    def from_structural_superset(cls, user: User) -> Self:
+        return cls(
+            id=user.id,
+            username=user.username,
+            full_name=user.full_name,
+            email=user.email,
+            test_setter_role=user.test_setter_role is not None,
+            test_taker_role=user.test_taker_role is not None,
+            invigilator_role=user.invigilator_role is not None,
+        )
+
+async def load_principal(user_id: int) -> Principal | None:
+    """Load a principal with its role flags in a single query."""
+    user = await orm_session.scalar(
+        select(User)
+        .where(User.id == user_id)
+        .options(
+            joinedload(User.test_setter_role),
+            joinedload(User.test_taker_role),
+            joinedload(User.invigilator_role),
+        )
+    )
+    return Principal.from_structural_superset(user) if user is not None else None
+
 @login_required
 async def ensure_authenticated():
+    if 'current_user' in g:
+        return
     current_user_id = int(quart_auth.current_user.auth_id) # type: ignore
-    current_user = await orm_session.get(User, current_user_id)
+    principal_cache = get_principal_cache()
+    current_user = principal_cache.get(current_user_id)
     if current_user is None:
-        # Handle case where the user account has been deleted but the session cookie is still valid:
-        logout_user()
-        raise APIError(401, 'Unauthorised')
+        current_user = await load_principal(current_user_id)
+        if current_user is None:
+            # Handle case where the user account has been deleted but the session cookie is still valid:
+            logout_user()
+            raise APIError(401, 'Unauthorised')
+        principal_cache.put(current_user_id, current_user)
     g.current_user = current_user
 
 def authentication_required[T, **P](func: Callable[P, Awaitable[T]] | Callable[P, T]) -> Callable[P, Awaitable[T]]:
@@ -78,12 +122,17 @@ def authentication_required[T, **P](func: Callable[P, Awaitable[T]] | Callable[P
 async def handle_unauthorized_error(e: Unauthorized):
     return await handle_api_error(APIError(401, 'Unauthorised'))
 
-def get_current_user() -> User:
+def get_current_user() -> Principal:
     if 'current_user' not in g:
         raise RuntimeError('Cannot get the current user outside of an authenticated context.')
     return g.current_user
 
-current_user: User = LocalProxy(get_current_user) # type: ignore
+current_user: Principal = LocalProxy(get_current_user) # type: ignore
+
+def invalidate_current_user():
+    """Invalidate the cached principal of the current user. This must be done whenever a role is assumed."""
+    get_principal_cache().invalidate(current_user.id)
+    g.pop('current_user')
 
 @bp.post('/logout')
 async def logout():
@@ -4,8 +4,7 @@ from typing import Self
 from quart import Blueprint
 from quart_schema import validate_response
 
-from ...data_model import User
-from .authentication import ensure_authenticated, current_user
+from .authentication import Principal, ensure_authenticated, current_user
 
 
 bp = Blueprint('current', __name__)
@@ -21,17 +20,17 @@ class UserDetailsWithoutPasswordHash:
     invigilator_role: bool
 
     @classmethod
-    async def from_structural_superset(cls, user: User) -> Self:
+    def from_structural_superset(cls, principal: Principal) -> Self:
         return cls(
-            username=user.username,
-            full_name=user.full_name,
-            email=user.email,
-            test_setter_role=await user.awaitable_attrs.test_setter_role is not None,
-            test_taker_role=await user.awaitable_attrs.test_taker_role is not None,
-            invigilator_role=await user.awaitable_attrs.invigilator_role is not None
+            username=principal.username,
+            full_name=principal.full_name,
+            email=principal.email,
+            test_setter_role=principal.test_setter_role,
+            test_taker_role=principal.test_taker_role,
+            invigilator_role=principal.invigilator_role
         )
 
 @bp.get('/details') # type: ignore
 @validate_response(UserDetailsWithoutPasswordHash)
 async def get_details() -> UserDetailsWithoutPasswordHash:
-    return await UserDetailsWithoutPasswordHash.from_structural_superset(current_user)
\ No newline at end of file
+    return UserDetailsWithoutPasswordHash.from_structural_superset(current_user)
\ No newline at end of file
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from typing import Optional
+
+from quart import Quart, current_app, has_app_context
+from sqlalchemy import event
+
+from .data_model import User
+
+
+@dataclass
+class CacheStatistics:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+@dataclass
+class _Entry[V]:
+    version: int
+    value: V
+    expiry_time: float
+
+class VersionedCache[K, V]:
+    """
+    A bounded in-memory cache whose entries expire `ttl` seconds after being stored,
+    and are evicted in least recently used order once there are more than `max_size` of them.
+
+    Each entry may be stored along with the version of its source. Looking up an entry with another version misses,
+    so entries of outdated versions are never served.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: K, version: int = 0) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version or entry.expiry_time <= time.monotonic():
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    def put(self, key: K, value: V, version: int = 0):
+        entry = self._entries.get(key)
+        if entry is not None and entry.version > version:
+            return # A newer version has been cached in the meantime.
+        self._entries[key] = _Entry(version, value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: K):
+        if self._entries.pop(key, None) is not None:
+            self._invalidations += 1
+
+    def clear(self):
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            size=len(self._entries),
+            max_size=self.max_size,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+        )
+
+def get_test_definition_cache() -> VersionedCache:
+    return getattr(current_app, 'test_definition_cache')
+
+def get_principal_cache() -> VersionedCache:
+    return getattr(current_app, 'principal_cache')
+
+@event.listens_for(User, 'after_delete')
+def _invalidate_deleted_principal(mapper, connection, user: User):
+    if has_app_context():
+        get_principal_cache().invalidate(user.id)
+
+def init_app(app: Quart):
+    test_definition_cache = VersionedCache(
+        max_size=app.config['TEST_DEFINITION_CACHE_MAX_SIZE'],
+        ttl=app.config['TEST_DEFINITION_CACHE_TTL'],
+    )
+    setattr(app, 'test_definition_cache', test_definition_cache)
+    principal_cache = VersionedCache(
+        max_size=app.config['PRINCIPAL_CACHE_MAX_SIZE'],
+        ttl=app.config['PRINCIPAL_CACHE_TTL'],
+    )
+    setattr(app, 'principal_cache', principal_cache)
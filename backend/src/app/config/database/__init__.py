@@ -1,14 +1,20 @@
-from typing import Protocol
+from collections.abc import Mapping
+from typing import Any, Protocol
 
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-from . import postgresql
+from . import postgresql, sqlite
 
 
 class EngineEventRegistrar(Protocol):
+    def get_engine_options(self, config: Mapping[str, Any]) -> dict[str, Any]:
+        """Get the engine options (e.g. those of the connection pool) from the app config."""
+        ...
+
     def register_engine_events(self, engine: AsyncEngine) -> None:
         ...
 
 engine_event_registrar: dict[str, EngineEventRegistrar] = {
-    'postgresql': postgresql
+    'postgresql': postgresql,
+    'sqlite': sqlite,
 }
\ No newline at end of file
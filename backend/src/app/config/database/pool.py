@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, StaticPool
+
+
+@dataclass
+class PoolStatistics:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    """The number of connections open beyond the pool size (negative while the pool is not yet full)."""
+    connections_opened: int
+    connections_invalidated: int
+    checkouts: int
+    timeouts: int
+    """The number of checkouts that gave up waiting for a connection."""
+    mean_wait_time: float
+    """The mean time (in seconds) that checkouts took to obtain a connection, including opening one if needed."""
+    max_wait_time: float
+
+class MonitoredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """A queue pool that records how long checkouts wait for a connection, and how many of them time out."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.connections_opened = 0
+        self.connections_invalidated = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start_time = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        wait_time = time.perf_counter() - start_time
+        self.checkouts += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        return connection
+
+    @property
+    def statistics(self) -> PoolStatistics:
+        return PoolStatistics(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow(),
+            connections_opened=self.connections_opened,
+            connections_invalidated=self.connections_invalidated,
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            mean_wait_time=self.total_wait_time / self.checkouts if self.checkouts else 0.0,
+            max_wait_time=self.max_wait_time,
+        )
+
+class MonitoredStaticPool(StaticPool):
+    """
+    A pool of a single connection shared by all checkouts (e.g. to an in-memory SQLite database),
+    that records the same statistics as `MonitoredAsyncAdaptedQueuePool`. Checkouts never wait.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.connections_opened = 0
+        self.connections_invalidated = 0
+        self.checkouts = 0
+        self.checked_out = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        connection = super()._do_get()
+        self.checkouts += 1
+        self.checked_out += 1
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self.checked_out -= 1
+
+    @property
+    def statistics(self) -> PoolStatistics:
+        return PoolStatistics(
+            size=1,
+            checked_in=int(self.checked_out == 0),
+            checked_out=self.checked_out,
+            overflow=0,
+            connections_opened=self.connections_opened,
+            connections_invalidated=self.connections_invalidated,
+            checkouts=self.checkouts,
+            timeouts=0,
+            mean_wait_time=0.0,
+            max_wait_time=0.0,
+        )
+
+MonitoredPool = MonitoredAsyncAdaptedQueuePool | MonitoredStaticPool
+
+def register_pool_events(engine: AsyncEngine):
+    """Count the connections opened and invalidated by the (monitored) pool of an engine."""
+    def count_connection_opened(dbapi_connection, connection_record):
+        pool = engine.sync_engine.pool
+        if isinstance(pool, MonitoredPool):
+            pool.connections_opened += 1
+
+    def count_connection_invalidated(dbapi_connection, connection_record, exception):
+        pool = engine.sync_engine.pool
+        if isinstance(pool, MonitoredPool):
+            pool.connections_invalidated += 1
+
+    event.listen(engine.sync_engine, 'connect', count_connection_opened)
+    event.listen(engine.sync_engine, 'invalidate', count_connection_invalidated)
+
+def get_pool_statistics(engine: AsyncEngine) -> PoolStatistics | None:
+    pool = engine.sync_engine.pool
+    return pool.statistics if isinstance(pool, MonitoredPool) else None
\ No newline at end of file
@@ -1,12 +1,29 @@
+from collections.abc import Mapping
+from typing import Any
+
 from sqlalchemy import event
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from .pool import MonitoredAsyncAdaptedQueuePool, register_pool_events
+
 
 def set_timezone_to_utc(dbapi_connection: DBAPIConnection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute('SET TIMEZONE TO "UTC"')
     cursor.close()
 
+def get_engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        'poolclass': MonitoredAsyncAdaptedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+        'connect_args': {'prepared_statement_cache_size': config['DB_PREPARED_STATEMENT_CACHE_SIZE']},
+    }
+
 def register_engine_events(engine: AsyncEngine):
-    event.listen(engine.sync_engine, 'connect', set_timezone_to_utc)
\ No newline at end of file
+    event.listen(engine.sync_engine, 'connect', set_timezone_to_utc)
+    register_pool_events(engine)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+An SQLite (aiosqlite) backend, so that the test suite and benchmarks can run without a PostgreSQL server.
+
+The PostgreSQL features that the data model relies on are emulated closely enough:
+- Autoincrementing columns of composite primary keys (which SQLite lacks) are filled in with the row ID by a trigger.
+- Deferrable unique constraints (which SQLite lacks) are checked immediately.
+- Deferrable foreign keys (including those created with `use_alter`) are created inline, as SQLite supports them.
+- `greatest` is rendered as the multi-argument `max`.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import DDL, Column, Table, UniqueConstraint, event, make_url
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql.functions import ReturnTypeFromArgs
+
+from ...data_model import Base
+from .pool import MonitoredAsyncAdaptedQueuePool, MonitoredStaticPool, register_pool_events
+
+
+def is_in_memory(url) -> bool:
+    url = make_url(url)
+    return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+
+def enable_foreign_keys(dbapi_connection: DBAPIConnection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys = ON')
+    cursor.close()
+
+def get_engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    if is_in_memory(config['DB_URI']):
+        # Every connection to an in-memory database would get a database of its own.
+        return {'poolclass': MonitoredStaticPool}
+    return {
+        'poolclass': MonitoredAsyncAdaptedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+def register_engine_events(engine: AsyncEngine):
+    # RETURNING would report the row before the autoincrement trigger fills in the composite primary key,
+    # so inserted rows are identified by `cursor.lastrowid` (i.e. one at a time) instead.
+    engine.sync_engine.dialect.use_insertmanyvalues = False
+    event.listen(engine.sync_engine, 'connect', enable_foreign_keys)
+    register_pool_events(engine)
+
+def is_composite_autoincrement(column: Column) -> bool:
+    return column.autoincrement is True and column.primary_key and len(column.table.primary_key.columns) > 1
+
+@compiles(CreateColumn, 'sqlite')
+def _compile_create_column(element: CreateColumn, compiler, **kw) -> str:
+    column = element.element
+    if is_composite_autoincrement(column):
+        # The column is NULL until the trigger fills it in.
+        column_type = compiler.dialect.type_compiler_instance.process(column.type, type_expression=column)
+        return f'{compiler.preparer.format_column(column)} {column_type}'
+    return compiler.visit_create_column(element, **kw)
+
+@compiles(UniqueConstraint, 'sqlite')
+def _compile_unique_constraint(constraint: UniqueConstraint, compiler, **kw) -> str:
+    return compiler.visit_unique_constraint(constraint, **kw).removesuffix(
+        compiler.define_constraint_deferrability(constraint)
+    )
+
+class greatest(ReturnTypeFromArgs):
+    inherit_cache = True
+
+@compiles(greatest, 'sqlite')
+def _compile_greatest(element: greatest, compiler, **kw) -> str:
+    return f'max({compiler.process(element.clauses, **kw)})'
+
+def _create_autoincrement_trigger(table: Table, column: Column):
+    event.listen(table, 'after_create', DDL(
+        f'CREATE TRIGGER "{table.name}_{column.name}_autoincrement" AFTER INSERT ON "{table.name}" '
+        f'FOR EACH ROW WHEN NEW."{column.name}" IS NULL BEGIN '
+        f'UPDATE "{table.name}" SET "{column.name}" = NEW.rowid WHERE rowid = NEW.rowid; '
+        f'END'
+    ).execute_if(dialect='sqlite'))
+
+for table in Base.metadata.tables.values():
+    for column in table.primary_key.columns:
+        if is_composite_autoincrement(column):
+            _create_autoincrement_trigger(table, column)
\ No newline at end of file
@@ -1,15 +1,56 @@
-from os import environ
+from os import cpu_count, environ
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Optional
 
 from quart import Quart
 from sqlalchemy import URL
 
 
 class ProfileConfig:
+    default_db_backend = 'postgresql'
+
     def __init__(self, app: Quart) -> None:
-        self.DB_URI: str | URL = ProfileConfig.get_postgresql_connect_URL()
+        self.DB_URI: str | URL = ProfileConfig.get_connect_URL(environ.get('DB_BACKEND', self.default_db_backend))
+        self.DB_ECHO: bool
+        self.DB_POOL_SIZE: int = int(environ.get('DB_POOL_SIZE', 5))
+        self.DB_MAX_OVERFLOW: int = int(environ.get('DB_MAX_OVERFLOW', 10))
+        self.DB_POOL_TIMEOUT: float = float(environ.get('DB_POOL_TIMEOUT', 30))
+        self.DB_POOL_RECYCLE: int = int(environ.get('DB_POOL_RECYCLE', -1))
+        self.DB_POOL_PRE_PING: bool = environ.get('DB_POOL_PRE_PING', 'True') == 'True'
+        self.DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(environ.get('DB_PREPARED_STATEMENT_CACHE_SIZE', 100))
         self.SECRET_KEY: str
         self.BCRYPT_LOG_ROUNDS: int
         self.BCRYPT_HANDLE_LONG_PASSWORDS: bool = True
+        self.PASSWORD_HASHING_WORKERS: int = int(environ.get('PASSWORD_HASHING_WORKERS', cpu_count() or 1))
+        self.PASSWORD_HASHING_QUEUE_SIZE: int = int(environ.get('PASSWORD_HASHING_QUEUE_SIZE', 32))
+        self.GAZE_DATA_FLUSH_SIZE: int = int(environ.get('GAZE_DATA_FLUSH_SIZE', 300))
+        self.GAZE_DATA_FLUSH_INTERVAL: float = float(environ.get('GAZE_DATA_FLUSH_INTERVAL', 1))
+        self.CHEATING_DETECTION_WINDOW: int = int(environ.get('CHEATING_DETECTION_WINDOW', 30))
+        self.CHEATING_DETECTION_MAX_OFF_SCREEN_FRACTION: float = float(environ.get('CHEATING_DETECTION_MAX_OFF_SCREEN_FRACTION', 0.5))
+        self.CHEATING_DETECTION_MIN_SAMPLES: int = int(environ.get('CHEATING_DETECTION_MIN_SAMPLES', 300))
+        self.CHEATING_DETECTION_MAX_OFF_SCREEN_DWELL: float = float(environ.get('CHEATING_DETECTION_MAX_OFF_SCREEN_DWELL', 10))
+        self.CHEATING_DETECTION_MAX_TRACKED_ATTEMPTS: int = int(environ.get('CHEATING_DETECTION_MAX_TRACKED_ATTEMPTS', 10_000))
+        self.TEST_DEFINITION_CACHE_MAX_SIZE: int = int(environ.get('TEST_DEFINITION_CACHE_MAX_SIZE', 256))
+        self.TEST_DEFINITION_CACHE_TTL: float = float(environ.get('TEST_DEFINITION_CACHE_TTL', 300))
+        self.PRINCIPAL_CACHE_MAX_SIZE: int = int(environ.get('PRINCIPAL_CACHE_MAX_SIZE', 10_000))
+        self.PRINCIPAL_CACHE_TTL: float = float(environ.get('PRINCIPAL_CACHE_TTL', 5))
+        self.ENROLLMENT_BALANCING_POLICY: str = environ.get('ENROLLMENT_BALANCING_POLICY', 'balanced')
+        self.INSTRUMENTATION_SAMPLE_RATE: float = float(environ.get('INSTRUMENTATION_SAMPLE_RATE', 1))
+        self.INSTRUMENTATION_QUERY_COUNT_WARNING_THRESHOLD: int = int(environ.get('INSTRUMENTATION_QUERY_COUNT_WARNING_THRESHOLD', 50))
+        self.METRICS_ENABLED: bool
+        self.METRICS_TOKEN: Optional[str] = environ.get('METRICS_TOKEN')
+        self.FILE_STORAGE_DIRECTORY: str = environ.get('FILE_STORAGE_DIRECTORY', str(Path(app.instance_path) / 'files'))
+        self.ATTACHMENT_MAX_SIZE: int = int(environ.get('ATTACHMENT_MAX_SIZE', 10 * 1024 * 1024))
+        self.ENVIRONMENT_IMAGE_MAX_SIZE: int = int(environ.get('ENVIRONMENT_IMAGE_MAX_SIZE', 20 * 1024 * 1024))
+        self.THUMBNAIL_CACHE_DIRECTORY: str = environ.get('THUMBNAIL_CACHE_DIRECTORY', str(Path(app.instance_path) / 'thumbnails'))
+        self.IMAGE_PROCESSING_WORKERS: int = int(environ.get('IMAGE_PROCESSING_WORKERS', 2))
+
+    @staticmethod
+    def get_connect_URL(db_backend: str):
+        if db_backend == 'sqlite':
+            return ProfileConfig.get_sqlite_connect_URL()
+        return ProfileConfig.get_postgresql_connect_URL()
 
     @staticmethod
     def get_postgresql_connect_URL():
@@ -22,24 +63,38 @@ class ProfileConfig:
             database=environ['DB_NAME']
         )
 
+    @staticmethod
+    def get_sqlite_connect_URL():
+        return URL.create(
+            drivername='sqlite+aiosqlite',
+            database=environ.get('SQLITE_DB_PATH', ':memory:'),
+        )
+
 class DevelopmentConfig(ProfileConfig):
     def __init__(self, app: Quart) -> None:
         super().__init__(app)
         self.SECRET_KEY = 'dev'
+        self.DB_ECHO = environ.get('DB_ECHO', 'True') == 'True'
         environ['QUART_DEBUG'] = 'True'
         self.QUART_AUTH_COOKIE_SECURE = False
         self.BCRYPT_LOG_ROUNDS = 4
+        self.METRICS_ENABLED = True
+        self.METRICS_TOKEN = environ.get('METRICS_TOKEN', 'dev')
 
 class TestingConfig(DevelopmentConfig):
     def __init__(self, app: Quart) -> None:
         super().__init__(app)
         self.TESTING: bool = True
+        self.FILE_STORAGE_DIRECTORY = mkdtemp(prefix='files_')
+        self.THUMBNAIL_CACHE_DIRECTORY = mkdtemp(prefix='thumbnails_')
 
 class ProductionConfig(ProfileConfig):
     def __init__(self, app: Quart) -> None:
         super().__init__(app)
         self.SECRET_KEY = environ['QUART_SECRET_KEY']
+        self.DB_ECHO = environ.get('DB_ECHO', 'False') == 'True'
         self.BCRYPT_LOG_ROUNDS = int(environ['BCRYPT_LOG_ROUNDS'])
+        self.METRICS_ENABLED = environ.get('METRICS_ENABLED', 'False') == 'True'
 
 profile_config_type: dict[str, type[ProfileConfig]] = {
     'development': DevelopmentConfig,
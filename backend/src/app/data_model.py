@@ -1,9 +1,9 @@
 import dataclasses
 from dataclasses import KW_ONLY, dataclass
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Annotated, Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, ForeignKeyConstraint, Integer, Text, UniqueConstraint
+from sqlalchemy import DateTime, Float, ForeignKey, ForeignKeyConstraint, Index, Integer, Text, TypeDecorator, UniqueConstraint
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.ext.orderinglist import ordering_list
 from sqlalchemy.orm import MappedAsDataclass, DeclarativeBase, Mapped, mapped_column, relationship, composite, attribute_keyed_dict, WriteOnlyMapped
@@ -14,9 +14,27 @@ int_pk = Annotated[int, mapped_column(primary_key=True)]
 def get_id_columns(mapped_class):
     return mapped_class.id.property.props
 
+class UTCDateTime(TypeDecorator):
+    """
+    A timezone-aware datetime, stored in UTC.
+    Backends without timezone support (e.g. SQLite) store it naive, so it is made aware again when loaded.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(UTC)
+        return value
+
+    def process_result_value(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
 class Base(AsyncAttrs, MappedAsDataclass, DeclarativeBase):
     type_annotation_map = {
-        datetime: DateTime(timezone=True),
+        datetime: UTCDateTime,
     }
 
 class User(Base):
@@ -63,6 +81,12 @@ class Test(Base, kw_only=True):
     start_time: Mapped[datetime]
     end_time: Mapped[datetime]
     guidelines: Mapped[str] = mapped_column(Text)
+    version: Mapped[int] = mapped_column(default=1, init=False)
+    """Incremented whenever the test is edited, to invalidate cached copies of its definition."""
+    max_marks: Mapped[int] = mapped_column(default=0, init=False)
+    """The sum of the marks of the questions, denormalised (see `test_totals`)."""
+    question_count: Mapped[int] = mapped_column(default=0, init=False)
+    """The number of questions, denormalised (see `test_totals`)."""
     questions: Mapped[list['Question']] = relationship(
         cascade='all, delete-orphan',
         order_by='Question.number', collection_class=ordering_list('number', reorder_on_append=True),
@@ -70,16 +94,15 @@ class Test(Base, kw_only=True):
     
     creator_id: Mapped[int] = mapped_column(ForeignKey('test_setter.id'), init=False)
     creator: Mapped[TestSetter] = relationship(back_populates='created_tests')
+    __table_args__ = (
+        Index('test_creator_start_time_idx', 'creator_id', 'start_time', 'id'),
+    )
     
     attempts: Mapped[dict[int, 'TestAttempt']] = relationship(
         cascade='all, delete-orphan',
         default_factory=dict, collection_class=attribute_keyed_dict('test_taker_id'),
     )
 
-    @property
-    def max_marks(self) -> int:
-        return sum(q.max_marks for q in self.questions)
-
 class Question(Base, kw_only=True):
     __tablename__ = 'question'
 
@@ -237,8 +260,10 @@ class Rectangle:
         top_right_x: float, top_right_y: float,
         bottom_left_x: float, bottom_left_y: float,
         bottom_right_x: float, bottom_right_y: float
-    ) -> 'Rectangle':
-        """generate an object from a database row"""
+    ) -> 'Optional[Rectangle]':
+        """generate an object from a database row (or `None` from a row of nulls)"""
+        if top_left_x is None:
+            return None
         return Rectangle(
             top_left=Point(top_left_x, top_left_y), 
             top_right=Point(top_right_x, top_right_y), 
@@ -268,14 +293,18 @@ class TestAttempt(Base, kw_only=True):
 
     invigilator_id: Mapped[int] = mapped_column(ForeignKey('invigilator.id'), init=False)
     invigilator: Mapped[Invigilator] = relationship(back_populates='invigilations', foreign_keys='[TestAttempt.invigilator_id]')
-    environment_image_url: Mapped[str]
-    screen_position: Mapped[Rectangle] = composite(
+    environment_image_url: Mapped[Optional[str]] = mapped_column(default=None)
+    environment_image_hash: Mapped[Optional[str]] = mapped_column(default=None)
+    """The perceptual hash of the environment image, so that images reused across attempts can be spotted."""
+    screen_position: Mapped[Optional[Rectangle]] = composite(
         Rectangle._generate,
         mapped_column('top_left_x', Float), mapped_column('top_left_y', Float),
         mapped_column('top_right_x', Float), mapped_column('top_right_y', Float),
         mapped_column('bottom_left_x', Float), mapped_column('bottom_left_y', Float),
-        mapped_column('bottom_right_x', Float), mapped_column('bottom_right_y', Float)
+        mapped_column('bottom_right_x', Float), mapped_column('bottom_right_y', Float),
+        default=None,
     )
+    """The position of the screen in gaze coordinates, once it has been calibrated."""
     start_time: Mapped[None | datetime] = mapped_column(default=None)
     answers: Mapped[dict[Question.Id, 'Answer']] = relationship(
         cascade='all, delete-orphan',
@@ -328,6 +357,8 @@ class Answer(Base, kw_only=True):
     attachment_answer: Mapped[Optional['AttachmentAnswer']] = relationship(cascade='all, delete-orphan', default=None)
     marks_obtained: Mapped[None | int] = mapped_column(default=None)
     is_bookmarked: Mapped[bool] = mapped_column(default=False)
+    sequence_number: Mapped[int] = mapped_column(default=0)
+    """The client sequence number of the latest saved change of the answer, so that stale changes are dropped."""
 
 class MCQAnswer(Base):
     __tablename__ = 'mcq_answer'
@@ -415,6 +446,26 @@ class GazeData(Base):
             refcolumns=get_id_columns(TestAttempt),
             ondelete='CASCADE',
         ),
+        Index('gaze_data_timestamp_idx', 'test_id', 'test_taker_id', 'timestamp'),
     )
     timestamp: Mapped[datetime]
-    gaze_extrapolation: Mapped[Point] = composite(mapped_column('x'), mapped_column('y'))
\ No newline at end of file
+    gaze_extrapolation: Mapped[Point] = composite(mapped_column('x'), mapped_column('y'))
+
+class GazeDataRollup(Base):
+    __tablename__ = 'gaze_data_rollup'
+
+    test_id: Mapped[int_pk]
+    test_taker_id: Mapped[int_pk]
+    second: Mapped[datetime] = mapped_column(primary_key=True)
+    __table_args__ = (
+        ForeignKeyConstraint(
+            columns=['test_id', 'test_taker_id'],
+            refcolumns=get_id_columns(TestAttempt),
+            ondelete='CASCADE',
+        ),
+    )
+    sample_count: Mapped[int]
+    sum_x: Mapped[float]
+    sum_y: Mapped[float]
+    off_screen_count: Mapped[int]
+    max_deviation: Mapped[float]
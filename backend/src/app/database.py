@@ -1,25 +1,40 @@
 import asyncio
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterator, Sequence
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from functools import wraps
+from typing import Any
 
 from quart import Quart, current_app, g
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from werkzeug.local import LocalProxy
 
+from . import instrumentation
 from .config.database import engine_event_registrar
 from .data_model import Base
 
 
+MAX_BIND_PARAMETERS = 32767
+"""The maximum number of bind parameters in a statement, which is limited by asyncpg."""
+
+def chunked[T](rows: Sequence[T], parameters_per_row: int) -> Iterator[Sequence[T]]:
+    """Split rows into chunks that can each be sent in one statement, binding `parameters_per_row` per row."""
+    chunk_size = MAX_BIND_PARAMETERS // parameters_per_row
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
 def create_engine_manager(app: Quart):
     @asynccontextmanager
     async def engine_manager():
+        registrar = engine_event_registrar[make_url(app.config['DB_URI']).get_backend_name()]
         engine = create_async_engine(
             app.config['DB_URI'],
-            echo=True,
-            pool_pre_ping=True
+            echo=app.config['DB_ECHO'],
+            **registrar.get_engine_options(app.config)
         )
-        engine_event_registrar[engine.name].register_engine_events(engine)
+        registrar.register_engine_events(engine)
+        instrumentation.register_engine_events(engine)
         setattr(app, 'engine', engine)
         yield
         await engine.dispose()
@@ -54,6 +69,60 @@ def transactional[T, **P](func: Callable[P, Awaitable[T]] | Callable[P, T]) -> C
             return await current_app.ensure_async(func)(*args, **kwargs) # type: ignore
     return wrapper
 
+@dataclass
+class SingleFlightStatistics:
+    function: str
+    """The qualified name of the decorated function."""
+    calls: int = 0
+    deduplicated_calls: int = 0
+    """The number of calls that waited for the result of an identical call in flight, instead of loading it again."""
+
+single_flight_statistics: dict[str, SingleFlightStatistics] = {}
+"""The statistics of each function decorated with `single_flight`, by qualified name."""
+
+def single_flight[T, **P](func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """
+    Collapse concurrent calls with equal (hashable) arguments into one call, whose result (or exception) is shared
+    by every caller. If that call is cancelled, one of the waiting calls is made instead.
+
+    The result is shared between requests, so it must not be bound to the ORM session (e.g. ORM objects).
+    The decorator can be stacked on top of `transactional`, so that only the call in flight begins a transaction.
+    """
+    in_flight: dict[Any, asyncio.Future[T]] = {}
+    function = f'{func.__module__}.{func.__qualname__}'
+    statistics = single_flight_statistics.setdefault(function, SingleFlightStatistics(function))
+
+    @wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        statistics.calls += 1
+        key = (args, frozenset(kwargs.items()))
+        while (future := in_flight.get(key)) is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+            statistics.deduplicated_calls += 1
+            return result
+        future = asyncio.get_running_loop().create_future()
+        in_flight[key] = future
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception() # Mark the exception as retrieved, in case there are no waiting calls.
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del in_flight[key]
+    return wrapper
+
 def init_app(app: Quart):
     engine_manager = create_engine_manager(app)
     
@@ -0,0 +1,214 @@
+"""
+Columnar export of the gaze data and answers of tests (e.g. for offline analysis), as gzip-compressed CSV files or,
+if `pyarrow` is installed, Parquet files.
+
+Rows are read from a server-side cursor in partitions, and each partition is encoded and written as soon as it is read
+(as a Parquet row group, in the case of Parquet), so that the memory used by an export is bounded by the partition size
+however many rows are exported.
+"""
+
+from collections.abc import AsyncIterator
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+import io
+from pathlib import Path
+from typing import Any, Optional
+import zlib
+
+from sqlalchemy import Select, TypeDecorator, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.types import TypeEngine
+
+from .data_model import Answer, AttachmentAnswer, GazeData, MCQAnswer, Question, TextFieldAnswer
+from .streaming import stream_rows
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+DEFAULT_PARTITION_SIZE = 10_000
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+"""Makes zlib write a gzip header and trailer, so that the output is a gzip file."""
+
+class ExportTable(StrEnum):
+    GAZE_DATA = 'gaze_data'
+    ANSWERS = 'answers'
+
+class ExportFormat(StrEnum):
+    CSV = 'csv'
+    PARQUET = 'parquet'
+
+    @property
+    def file_extension(self) -> str:
+        return '.csv.gz' if self is ExportFormat.CSV else '.parquet'
+
+    @property
+    def media_type(self) -> str:
+        return 'application/gzip' if self is ExportFormat.CSV else 'application/vnd.apache.parquet'
+
+def is_parquet_supported() -> bool:
+    return pyarrow is not None
+
+@dataclass
+class ExportFilter:
+    test_id: int
+    test_taker_id: Optional[int] = None
+    """Export only the attempt of this test taker."""
+    start: Optional[datetime] = None
+    """Export only the gaze samples at or after this time (answers are not timestamped)."""
+    end: Optional[datetime] = None
+    """Export only the gaze samples before this time (answers are not timestamped)."""
+
+def gaze_data_query(export_filter: ExportFilter) -> Select:
+    query = (
+        select(GazeData.test_id, GazeData.test_taker_id, GazeData.timestamp, GazeData.__table__.c.x, GazeData.__table__.c.y)
+        .where(GazeData.test_id == export_filter.test_id)
+        .order_by(GazeData.test_taker_id, GazeData.timestamp)
+    )
+    if export_filter.test_taker_id is not None:
+        query = query.where(GazeData.test_taker_id == export_filter.test_taker_id)
+    if export_filter.start is not None:
+        query = query.where(GazeData.timestamp >= export_filter.start)
+    if export_filter.end is not None:
+        query = query.where(GazeData.timestamp < export_filter.end)
+    return query
+
+def answers_query(export_filter: ExportFilter) -> Select:
+    answer_table = Answer.__table__
+    question_table = Question.__table__
+    mcq_answer_table = MCQAnswer.__table__
+    text_field_answer_table = TextFieldAnswer.__table__
+    attachment_answer_table = AttachmentAnswer.__table__
+    def answer_of(table):
+        return (
+            (table.c.test_id == answer_table.c.test_id)
+            & (table.c.test_taker_id == answer_table.c.test_taker_id)
+            & (table.c.question_discriminator == answer_table.c.question_discriminator)
+        )
+    query = (
+        select(
+            answer_table.c.test_id, answer_table.c.test_taker_id, answer_table.c.question_discriminator,
+            question_table.c.max_marks, answer_table.c.marks_obtained, answer_table.c.is_bookmarked,
+            mcq_answer_table.c.chosen_option_discriminator,
+            text_field_answer_table.c.answer_text,
+            attachment_answer_table.c.attached_file_url,
+        )
+        .join(question_table, (question_table.c.test_id == answer_table.c.test_id) & (question_table.c.discriminator == answer_table.c.question_discriminator))
+        .outerjoin(mcq_answer_table, answer_of(mcq_answer_table))
+        .outerjoin(text_field_answer_table, answer_of(text_field_answer_table))
+        .outerjoin(attachment_answer_table, answer_of(attachment_answer_table))
+        .where(answer_table.c.test_id == export_filter.test_id)
+        .order_by(answer_table.c.test_taker_id, answer_table.c.question_discriminator)
+    )
+    if export_filter.test_taker_id is not None:
+        query = query.where(answer_table.c.test_taker_id == export_filter.test_taker_id)
+    return query
+
+export_queries = {
+    ExportTable.GAZE_DATA: gaze_data_query,
+    ExportTable.ANSWERS: answers_query,
+}
+
+def to_csv_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+async def encode_csv(query: Select, partitions: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    """Encode partitions of rows as a gzip-compressed CSV file, with a header of the column names."""
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(query.selected_columns.keys())
+    async for partition in partitions:
+        writer.writerows([to_csv_value(value) for value in row] for row in partition)
+        if compressed := compressor.compress(buffer.getvalue().encode('utf-8')):
+            yield compressed
+        buffer.seek(0)
+        buffer.truncate()
+    yield compressor.compress(buffer.getvalue().encode('utf-8')) + compressor.flush()
+
+class _ChunkSink(io.RawIOBase):
+    """A write-only file that holds what is written to it until it is drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def parquet_schema(query: Select):
+    assert pyarrow is not None
+    arrow_types = {
+        bool: pyarrow.bool_(),
+        int: pyarrow.int64(),
+        float: pyarrow.float64(),
+        str: pyarrow.string(),
+        datetime: pyarrow.timestamp('us', tz='UTC'),
+    }
+    def arrow_type(sql_type: TypeEngine):
+        if isinstance(sql_type, TypeDecorator):
+            sql_type = sql_type.impl_instance
+        return arrow_types[sql_type.python_type]
+    return pyarrow.schema([(column.key, arrow_type(column.type)) for column in query.selected_columns])
+
+async def encode_parquet(query: Select, partitions: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    """Encode partitions of rows as a Parquet file, with a row group per partition."""
+    assert pyarrow is not None
+    schema = parquet_schema(query)
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    try:
+        async for partition in partitions:
+            if partition:
+                columns = [list(column) for column in zip(*partition)]
+                writer.write_batch(pyarrow.record_batch(columns, schema=schema))
+                yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+encoders = {
+    ExportFormat.CSV: encode_csv,
+    ExportFormat.PARQUET: encode_parquet,
+}
+
+def export(
+    session: AsyncSession,
+    table: ExportTable,
+    export_format: ExportFormat,
+    export_filter: ExportFilter,
+    partition_size: int = DEFAULT_PARTITION_SIZE,
+) -> AsyncIterator[bytes]:
+    """Export the rows of a table that match a filter, as the chunks of a file of the given format."""
+    if export_format is ExportFormat.PARQUET and not is_parquet_supported():
+        raise RuntimeError('Exporting to Parquet requires pyarrow to be installed.')
+    query = export_queries[table](export_filter)
+    return encoders[export_format](query, stream_rows(session, query, tuple, partition_size))
+
+async def export_to_file(
+    engine: AsyncEngine,
+    path: Path,
+    table: ExportTable,
+    export_format: ExportFormat,
+    export_filter: ExportFilter,
+) -> int:
+    """Export the rows of a table that match a filter to a file, and return the number of bytes written."""
+    byte_count = 0
+    async with AsyncSession(engine) as session:
+        with path.open('wb') as file:
+            async for chunk in export(session, table, export_format, export_filter):
+                byte_count += file.write(chunk)
+    return byte_count
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Content-addressed storage of uploaded files (e.g. the attachments of answers).
+
+Files are addressed by the SHA-256 digest of their content, so identical uploads are stored once. Uploads are streamed
+to the storage in chunks and hashed as they are written, so that a request body is never held in memory as a whole,
+and an upload that exceeds the size limit is aborted as soon as it does.
+"""
+
+import asyncio
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+import hashlib
+from pathlib import Path
+import re
+from typing import BinaryIO, Optional, Protocol
+from uuid import uuid4
+
+from quart import Quart, Response, current_app, send_file
+
+
+DIGEST_PATTERN = re.compile('[0-9a-f]{64}')
+
+class FileTooLargeError(Exception):
+    pass
+
+@dataclass(frozen=True)
+class StoredFile:
+    digest: str
+    """The hexadecimal SHA-256 digest of the content of the file."""
+    size: int
+
+class FileStorage(Protocol):
+    """A storage backend of files addressed by the SHA-256 digest of their content (e.g. a local directory or an object store)."""
+
+    async def store(self, chunks: AsyncIterable[bytes], max_size: int) -> StoredFile:
+        """
+        Store a file streamed in chunks, unless a file with the same content is stored already.
+        Raise `FileTooLargeError` (storing nothing) as soon as the file exceeds `max_size` bytes.
+        """
+        ...
+
+    def path(self, digest: str) -> Path:
+        """The local path of the file with the given digest (which may not exist), e.g. for worker processes to open it."""
+        ...
+
+    async def send(self, digest: str, mimetype: str) -> Optional[Response]:
+        """
+        Make a response that serves the file with the given digest (supporting range requests),
+        or return None if there is no such file.
+        """
+        ...
+
+def _write_chunk(file: BinaryIO, hash, chunk: bytes):
+    hash.update(chunk)
+    file.write(chunk)
+
+class LocalFileStorage:
+    """
+    Store files in a local directory, each in a subdirectory named after the first two characters of its digest.
+
+    Uploads are written to a temporary file (off the event loop) and moved into place once their digest is known.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._temporary_directory = directory / 'tmp'
+
+    def path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / digest
+
+    async def store(self, chunks: AsyncIterable[bytes], max_size: int) -> StoredFile:
+        await asyncio.to_thread(self._temporary_directory.mkdir, parents=True, exist_ok=True)
+        temporary_path = self._temporary_directory / uuid4().hex
+        try:
+            file = await asyncio.to_thread(temporary_path.open, 'wb')
+            try:
+                hash = hashlib.sha256()
+                size = 0
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_size:
+                        raise FileTooLargeError(f'The file exceeds {max_size} bytes.')
+                    await asyncio.to_thread(_write_chunk, file, hash, chunk)
+            finally:
+                await asyncio.to_thread(file.close)
+            stored_file = StoredFile(hash.hexdigest(), size)
+            await asyncio.to_thread(self._move_into_place, temporary_path, self.path(stored_file.digest))
+        except BaseException: # Including the cancellation of the request, e.g. when the client disconnects
+            temporary_path.unlink(missing_ok=True)
+            raise
+        return stored_file
+
+    @staticmethod
+    def _move_into_place(temporary_path: Path, path: Path):
+        if path.exists():
+            temporary_path.unlink()
+            return
+        path.parent.mkdir(exist_ok=True)
+        # Concurrent uploads of the same content may both get here, but the replacement is atomic and the content is the same.
+        temporary_path.replace(path)
+
+    async def send(self, digest: str, mimetype: str) -> Optional[Response]:
+        path = self.path(digest)
+        if not await asyncio.to_thread(path.is_file):
+            return None
+        return await send_file(path, mimetype=mimetype, conditional=True)
+
+def get_file_storage() -> FileStorage:
+    return getattr(current_app, 'file_storage')
+
+def init_app(app: Quart):
+    setattr(app, 'file_storage', LocalFileStorage(Path(app.config['FILE_STORAGE_DIRECTORY'])))
\ No newline at end of file
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Optional
+
+import click
+from quart import Quart
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ..data_model import TestAttempt
+from ..database import create_engine_manager
+from .buffering import GazeDataStreams
+from .cheating_detection import CheatingDetector, CheatingThresholds
+from .rollup import backfill_rollups
+
+
+async def backfill_gaze_data_rollup(engine: AsyncEngine, test_id: Optional[int] = None):
+    async with AsyncSession(engine) as session:
+        query = select(TestAttempt.id, TestAttempt.screen_position).where(TestAttempt.__table__.c.top_left_x.is_not(None))
+        if test_id is not None:
+            query = query.where(TestAttempt.test_id == test_id)
+        attempts = (await session.execute(query)).tuples().all()
+    for attempt_id, screen in attempts:
+        # Backfill each test attempt in its own transaction, to keep transactions short.
+        async with AsyncSession(engine) as session, session.begin():
+            await backfill_rollups(session, attempt_id, screen)
+
+def init_app(app: Quart):
+    cheating_detector = CheatingDetector(
+        CheatingThresholds(
+            window=app.config['CHEATING_DETECTION_WINDOW'],
+            max_off_screen_fraction=app.config['CHEATING_DETECTION_MAX_OFF_SCREEN_FRACTION'],
+            min_samples=app.config['CHEATING_DETECTION_MIN_SAMPLES'],
+            max_off_screen_dwell=app.config['CHEATING_DETECTION_MAX_OFF_SCREEN_DWELL'],
+        ),
+        max_tracked_attempts=app.config['CHEATING_DETECTION_MAX_TRACKED_ATTEMPTS'],
+    )
+    setattr(app, 'cheating_detector', cheating_detector)
+    setattr(app, 'gaze_data_streams', GazeDataStreams())
+
+    engine_manager = create_engine_manager(app)
+
+    @app.cli.command('backfill_gaze_data_rollup')
+    @click.option('--test-id', type=int, help='Backfill only the attempts of this test.')
+    def _backfill_gaze_data_rollup_command(test_id: Optional[int]):
+        """Recompute the per-second gaze data rollups from the stored gaze samples."""
+        async def backfill_gaze_data_rollup_command():
+            async with engine_manager():
+                engine: AsyncEngine = getattr(app, 'engine')
+                await backfill_gaze_data_rollup(engine, test_id)
+
+        asyncio.get_event_loop().run_until_complete(backfill_gaze_data_rollup_command())
\ No newline at end of file
@@ -0,0 +1,108 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+
+from .ingestion import IngestionReport
+from .wire_format import SAMPLE_DTYPE
+
+
+class GazeDataBuffer:
+    """
+    Buffer gaze samples of a stream in memory, and flush them in batches once `flush_size` samples have accumulated,
+    or every `flush_interval` seconds (whichever comes first).
+
+    Samples are buffered in one of two preallocated arrays while the other one is being flushed.
+    Adding samples to a full buffer waits for the ongoing flush to complete, applying backpressure to the producer.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[np.ndarray], Awaitable[IngestionReport]],
+        *,
+        flush_size: int,
+        flush_interval: float,
+    ) -> None:
+        if flush_size <= 0:
+            raise ValueError('The flush size must be positive.')
+        self._flush = flush
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._samples = np.empty(flush_size, dtype=SAMPLE_DTYPE)
+        self._flushing_samples = np.empty(flush_size, dtype=SAMPLE_DTYPE)
+        self._length = 0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def nbytes(self) -> int:
+        """The memory occupied by the buffers, which is bounded by the flush size."""
+        return self._samples.nbytes + self._flushing_samples.nbytes
+
+    async def add(self, samples: np.ndarray) -> list[IngestionReport]:
+        """Buffer the samples, and return the reports of the flushes triggered by doing so."""
+        reports = []
+        offset = 0
+        while offset < len(samples):
+            count = min(self.flush_size - self._length, len(samples) - offset)
+            self._samples[self._length:self._length + count] = samples[offset:offset + count]
+            self._length += count
+            offset += count
+            if self._length == self.flush_size:
+                reports.append(await self.flush())
+        return reports
+
+    async def flush(self) -> IngestionReport:
+        async with self._lock:
+            if self._length == 0:
+                return IngestionReport(accepted=0, rejected=0)
+            samples = self._samples[:self._length]
+            self._samples, self._flushing_samples = self._flushing_samples, self._samples
+            self._length = 0
+            return await self._flush(samples)
+
+    async def flush_periodically(self, on_flush: Callable[[IngestionReport], Awaitable[None]]) -> None:
+        """Flush the buffer every `flush_interval` seconds, until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            report = await self.flush()
+            if report.accepted or report.rejected:
+                await on_flush(report)
+
+@dataclass
+class GazeDataStreamStatistics:
+    open_streams: int
+    buffer_bytes: int
+    """The memory occupied by the buffers of the open streams."""
+    failed_flushes: int
+    """The number of periodic flushes that failed, each of which closed its stream."""
+
+class GazeDataStreams:
+    """Keep track of the buffers of the open gaze data streams, to measure the memory they occupy."""
+
+    def __init__(self) -> None:
+        self._buffers: set[GazeDataBuffer] = set()
+        self._failed_flushes = 0
+
+    @contextmanager
+    def open(self, buffer: GazeDataBuffer) -> Iterator[None]:
+        self._buffers.add(buffer)
+        try:
+            yield
+        finally:
+            self._buffers.discard(buffer)
+
+    def record_failed_flush(self):
+        self._failed_flushes += 1
+
+    @property
+    def statistics(self) -> GazeDataStreamStatistics:
+        return GazeDataStreamStatistics(
+            open_streams=len(self._buffers),
+            buffer_bytes=sum(buffer.nbytes for buffer in self._buffers),
+            failed_flushes=self._failed_flushes,
+        )
\ No newline at end of file
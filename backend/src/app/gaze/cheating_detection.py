@@ -0,0 +1,170 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..data_model import Rectangle, TestAttempt
+from .off_screen import load_gaze_data, off_screen_mask
+from .wire_format import EPOCH
+
+
+MICROSECONDS_PER_SECOND = 1_000_000
+
+@dataclass(frozen=True)
+class CheatingThresholds:
+    window: int
+    """The length (in seconds) of the sliding window over which the off-screen fraction is computed."""
+    max_off_screen_fraction: float
+    """The fraction of off-screen samples in the window above which cheating is caught."""
+    min_samples: int
+    """The number of samples required in the window before the off-screen fraction is considered."""
+    max_off_screen_dwell: float
+    """The duration (in seconds) of continuously looking off-screen above which cheating is caught."""
+
+@dataclass
+class AttemptState:
+    """
+    The constant-size detection state of a test attempt.
+
+    The sliding window is a ring buffer of per-second sample and off-screen counts, with running totals over it.
+    """
+    screen: Rectangle
+    caught_cheating: bool
+    window: int
+    bin_seconds: np.ndarray = field(init=False)
+    bin_sample_counts: np.ndarray = field(init=False)
+    bin_off_screen_counts: np.ndarray = field(init=False)
+    sample_count: int = 0
+    off_screen_count: int = 0
+    latest_second: int = -1
+    off_screen_since: Optional[int] = None
+    """The timestamp at which the ongoing off-screen dwell began, if any."""
+
+    def __post_init__(self):
+        self.bin_seconds = np.full(self.window, -1, dtype=np.int64)
+        self.bin_sample_counts = np.zeros(self.window, dtype=np.int64)
+        self.bin_off_screen_counts = np.zeros(self.window, dtype=np.int64)
+
+    @property
+    def off_screen_fraction(self) -> float:
+        return self.off_screen_count / self.sample_count if self.sample_count else 0.0
+
+    def _evict(self, slots: np.ndarray | int):
+        self.sample_count -= int(np.sum(self.bin_sample_counts[slots]))
+        self.off_screen_count -= int(np.sum(self.bin_off_screen_counts[slots]))
+        self.bin_seconds[slots] = -1
+        self.bin_sample_counts[slots] = 0
+        self.bin_off_screen_counts[slots] = 0
+
+    def update(self, samples: np.ndarray, off_screen: np.ndarray) -> float:
+        """
+        Update the state with a batch of samples in time order (and their off-screen mask),
+        and return the longest off-screen dwell (in seconds) that ends within the batch.
+        """
+        if len(samples) == 0:
+            return 0.0
+        timestamps = samples['timestamp']
+
+        seconds, inverse = np.unique(timestamps // MICROSECONDS_PER_SECOND, return_inverse=True)
+        sample_counts = np.bincount(inverse)
+        off_screen_counts = np.bincount(inverse, weights=off_screen).astype(np.int64)
+        for second, sample_count, off_screen_count in zip(seconds.tolist(), sample_counts.tolist(), off_screen_counts.tolist()):
+            if second <= self.latest_second - self.window:
+                continue
+            slot = second % self.window
+            if self.bin_seconds[slot] != second:
+                self._evict(slot)
+                self.bin_seconds[slot] = second
+            self.bin_sample_counts[slot] += sample_count
+            self.bin_off_screen_counts[slot] += off_screen_count
+            self.sample_count += sample_count
+            self.off_screen_count += off_screen_count
+            self.latest_second = max(self.latest_second, second)
+        self._evict(np.flatnonzero((self.bin_seconds != -1) & (self.bin_seconds <= self.latest_second - self.window)))
+
+        if not off_screen.any():
+            self.off_screen_since = None
+            return 0.0
+        indices = np.arange(len(samples))
+        run_starts = off_screen & ~np.concatenate(([False], off_screen[:-1]))
+        run_start_indices = np.maximum.accumulate(np.where(run_starts, indices, 0))
+        run_start_timestamps = timestamps[run_start_indices]
+        if self.off_screen_since is not None and off_screen[0]:
+            # The first run continues the dwell of the previous batch.
+            run_start_timestamps = np.where(run_start_indices == 0, self.off_screen_since, run_start_timestamps)
+        dwells = (timestamps - run_start_timestamps)[off_screen]
+        self.off_screen_since = int(run_start_timestamps[-1]) if off_screen[-1] else None
+        return int(dwells.max()) / MICROSECONDS_PER_SECOND
+
+class CheatingDetector:
+    """
+    Detect cheating incrementally from the gaze samples of test attempts as they are ingested,
+    keeping a bounded number of attempt states (the least recently updated states are evicted first).
+
+    The state of an attempt that is not tracked (e.g. after a restart or an eviction) is rebuilt from the stored
+    samples of the preceding window.
+    """
+
+    def __init__(self, thresholds: CheatingThresholds, max_tracked_attempts: int) -> None:
+        self.thresholds = thresholds
+        self.max_tracked_attempts = max_tracked_attempts
+        self._states: OrderedDict[TestAttempt.Id, AttemptState] = OrderedDict()
+
+    def __contains__(self, attempt_id: TestAttempt.Id) -> bool:
+        return attempt_id in self._states
+
+    def forget(self, attempt_id: TestAttempt.Id):
+        self._states.pop(attempt_id, None)
+
+    async def _rebuild_state(self, session: AsyncSession, attempt_id: TestAttempt.Id, until: int) -> AttemptState:
+        screen, caught_cheating = (await session.execute(
+            select(TestAttempt.screen_position, TestAttempt.caught_cheating)
+            .where(TestAttempt.test_id == attempt_id.test_id, TestAttempt.test_taker_id == attempt_id.test_taker_id)
+        )).one()._tuple()
+        state = AttemptState(screen, caught_cheating, self.thresholds.window)
+        end = EPOCH + timedelta(microseconds=until)
+        samples = await load_gaze_data(session, attempt_id, start=end - timedelta(seconds=self.thresholds.window), end=end)
+        state.update(samples, off_screen_mask(samples, screen))
+        return state
+
+    async def observe(
+        self,
+        session: AsyncSession,
+        attempt_id: TestAttempt.Id,
+        samples: np.ndarray,
+    ) -> tuple[Rectangle, np.ndarray]:
+        """
+        Update the state of the test attempt with newly ingested samples in time order (before they are stored),
+        and flag the attempt if cheating is caught.
+
+        Return the screen of the test attempt and the off-screen mask of the samples.
+        If the samples end up not being stored, the test attempt must be forgotten.
+        """
+        state = self._states.get(attempt_id)
+        if state is None:
+            state = await self._rebuild_state(session, attempt_id, until=int(samples['timestamp'][0]))
+            self._states[attempt_id] = state
+            if len(self._states) > self.max_tracked_attempts:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(attempt_id)
+        off_screen = off_screen_mask(samples, state.screen)
+        max_dwell = state.update(samples, off_screen)
+        if not state.caught_cheating and (
+            max_dwell > self.thresholds.max_off_screen_dwell
+            or (
+                state.sample_count >= self.thresholds.min_samples
+                and state.off_screen_fraction > self.thresholds.max_off_screen_fraction
+            )
+        ):
+            await session.execute(
+                update(TestAttempt)
+                .where(TestAttempt.test_id == attempt_id.test_id, TestAttempt.test_taker_id == attempt_id.test_taker_id)
+                .values(caught_cheating=True)
+            )
+            state.caught_cheating = True
+        return state.screen, off_screen
\ No newline at end of file
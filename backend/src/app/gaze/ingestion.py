@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from quart import current_app
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..data_model import GazeData, TestAttempt
+from ..database import chunked
+from .cheating_detection import CheatingDetector
+from .rollup import merge_rollups, roll_up
+from .wire_format import timestamps_to_datetimes, to_timestamp
+
+
+gaze_data_table = GazeData.__table__
+
+@dataclass
+class IngestionReport:
+    accepted: int
+    rejected: int
+
+def acceptable_samples_mask(samples: np.ndarray, window: tuple[datetime, datetime]) -> np.ndarray:
+    return (
+        np.isfinite(samples['x']) & np.isfinite(samples['y'])
+        & (samples['timestamp'] >= to_timestamp(window[0]))
+        & (samples['timestamp'] <= to_timestamp(window[1]))
+    )
+
+async def insert_gaze_data(session: AsyncSession, attempt_id: TestAttempt.Id, samples: np.ndarray):
+    """
+    Insert gaze samples (an array of `wire_format.SAMPLE_DTYPE`) of a test attempt
+    using multi-row INSERT statements, bypassing the ORM unit of work.
+    """
+    for batch in chunked(samples, parameters_per_row=5):
+        await session.execute(insert(gaze_data_table).values([
+            {
+                'test_id': attempt_id.test_id,
+                'test_taker_id': attempt_id.test_taker_id,
+                'timestamp': timestamp,
+                'x': x,
+                'y': y,
+            }
+            for timestamp, x, y in zip(
+                timestamps_to_datetimes(batch['timestamp']), batch['x'].tolist(), batch['y'].tolist()
+            )
+        ]))
+
+async def ingest_gaze_data(
+    session: AsyncSession,
+    attempt_id: TestAttempt.Id,
+    samples: np.ndarray,
+    window: tuple[datetime, datetime],
+) -> IngestionReport:
+    """
+    Run cheating detection on the acceptable gaze samples of a test attempt, insert them along with their rollups,
+    and commit the session.
+
+    Samples with non-finite coordinates or with timestamps outside the `window` are rejected.
+    If storing the samples fails, the detection state of the attempt (which has already observed them) is forgotten,
+    so that it is rebuilt from the stored samples instead.
+    """
+    accepted_samples = np.sort(samples[acceptable_samples_mask(samples, window)], order='timestamp')
+    report = IngestionReport(accepted=len(accepted_samples), rejected=len(samples) - len(accepted_samples))
+    if len(accepted_samples) == 0:
+        return report
+    cheating_detector: CheatingDetector = getattr(current_app, 'cheating_detector')
+    try:
+        screen, off_screen = await cheating_detector.observe(session, attempt_id, accepted_samples)
+        await insert_gaze_data(session, attempt_id, accepted_samples)
+        await merge_rollups(session, attempt_id, roll_up(accepted_samples, off_screen, screen))
+        await session.commit()
+    except BaseException:
+        cheating_detector.forget(attempt_id)
+        raise
+    return report
\ No newline at end of file
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..data_model import GazeData, Rectangle, TestAttempt
+from .wire_format import SAMPLE_DTYPE, samples_from_tuples
+
+
+def screen_vertices(screen: Rectangle) -> np.ndarray:
+    """Return the corners of the screen as a (4, 2) array, in order along its boundary."""
+    return np.array([
+        (screen.top_left.x, screen.top_left.y),
+        (screen.top_right.x, screen.top_right.y),
+        (screen.bottom_right.x, screen.bottom_right.y),
+        (screen.bottom_left.x, screen.bottom_left.y),
+    ])
+
+def off_screen_mask(samples: np.ndarray, screen: Rectangle) -> np.ndarray:
+    """
+    Return a boolean array marking the gaze samples (an array with `x` and `y` fields) that fall outside the screen.
+
+    The screen may be any (not necessarily convex or axis-aligned) quadrilateral. All samples are classified in one
+    vectorised pass of the even-odd rule: a point is inside if a ray cast from it crosses the boundary an odd number of
+    times.
+    """
+    vertices = screen_vertices(screen)
+    x1, y1 = vertices[:, 0], vertices[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    xs = samples['x'][:, np.newaxis]
+    ys = samples['y'][:, np.newaxis]
+    # Each row corresponds to a sample, and each column to an edge of the screen.
+    straddles = (y1 > ys) != (y2 > ys)
+    with np.errstate(divide='ignore', invalid='ignore'): # Horizontal edges never straddle a sample.
+        crossing_xs = x1 + (ys - y1) * (x2 - x1) / (y2 - y1)
+    crossings = np.count_nonzero(straddles & (xs < crossing_xs), axis=1)
+    return crossings % 2 == 0
+
+async def load_gaze_data(
+    session: AsyncSession,
+    attempt_id: TestAttempt.Id,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> np.ndarray:
+    """Load the stored gaze samples of a test attempt (optionally within a time range) into an array, in time order."""
+    query = (
+        select(GazeData.timestamp, GazeData.x, GazeData.y)
+        .where(GazeData.test_id == attempt_id.test_id, GazeData.test_taker_id == attempt_id.test_taker_id)
+        .order_by(GazeData.timestamp)
+    )
+    if start is not None:
+        query = query.where(GazeData.timestamp >= start)
+    if end is not None:
+        query = query.where(GazeData.timestamp < end)
+    result = await session.stream(query.execution_options(yield_per=10_000))
+    chunks = [samples_from_tuples(partition) async for partition in result.partitions()]
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=SAMPLE_DTYPE)
+
+async def get_screen_position(session: AsyncSession, attempt_id: TestAttempt.Id) -> Rectangle:
+    return (await session.execute(
+        select(TestAttempt.screen_position)
+        .where(TestAttempt.test_id == attempt_id.test_id, TestAttempt.test_taker_id == attempt_id.test_taker_id)
+    )).scalar_one()
\ No newline at end of file
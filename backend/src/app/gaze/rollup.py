@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import delete, extract, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..data_model import GazeDataRollup, Rectangle, TestAttempt
+from ..database import chunked
+from .off_screen import load_gaze_data, off_screen_mask, screen_vertices
+from .wire_format import EPOCH, timestamps_to_datetimes
+
+
+MICROSECONDS_PER_SECOND = 1_000_000
+
+RESOLUTIONS = (1, 5, 15, 60, 300, 900, 3600)
+"""The supported resolutions (in seconds) of rollups read back, in increasing order."""
+
+def roll_up(samples: np.ndarray, off_screen: np.ndarray, screen: Rectangle) -> list[dict]:
+    """
+    Aggregate gaze samples per second, into rows of the `gaze_data_rollup` table (without the test attempt ID).
+
+    The deviation of a sample is its distance from the centre of the screen.
+    """
+    if len(samples) == 0:
+        return []
+    seconds, inverse = np.unique(samples['timestamp'] // MICROSECONDS_PER_SECOND, return_inverse=True)
+    xs, ys = samples['x'].astype(np.float64), samples['y'].astype(np.float64)
+    centre_x, centre_y = screen_vertices(screen).mean(axis=0)
+    deviations = np.hypot(xs - centre_x, ys - centre_y)
+    max_deviations = np.zeros(len(seconds))
+    np.maximum.at(max_deviations, inverse, deviations)
+    return [
+        {
+            'second': second,
+            'sample_count': sample_count,
+            'sum_x': sum_x,
+            'sum_y': sum_y,
+            'off_screen_count': off_screen_count,
+            'max_deviation': max_deviation,
+        }
+        for second, sample_count, sum_x, sum_y, off_screen_count, max_deviation in zip(
+            timestamps_to_datetimes(seconds * MICROSECONDS_PER_SECOND),
+            np.bincount(inverse).tolist(),
+            np.bincount(inverse, weights=xs).tolist(),
+            np.bincount(inverse, weights=ys).tolist(),
+            np.bincount(inverse, weights=off_screen).astype(np.int64).tolist(),
+            max_deviations.tolist(),
+        )
+    ]
+
+async def merge_rollups(session: AsyncSession, attempt_id: TestAttempt.Id, rows: list[dict]):
+    """Merge per-second aggregates into the stored rollups of a test attempt, with upserts."""
+    for chunk in chunked(rows, parameters_per_row=8):
+        statement = insert(GazeDataRollup).values([
+            {'test_id': attempt_id.test_id, 'test_taker_id': attempt_id.test_taker_id, **row}
+            for row in chunk
+        ])
+        await session.execute(statement.on_conflict_do_update(
+            index_elements=[GazeDataRollup.test_id, GazeDataRollup.test_taker_id, GazeDataRollup.second],
+            set_={
+                'sample_count': GazeDataRollup.sample_count + statement.excluded.sample_count,
+                'sum_x': GazeDataRollup.sum_x + statement.excluded.sum_x,
+                'sum_y': GazeDataRollup.sum_y + statement.excluded.sum_y,
+                'off_screen_count': GazeDataRollup.off_screen_count + statement.excluded.off_screen_count,
+                'max_deviation': func.greatest(GazeDataRollup.max_deviation, statement.excluded.max_deviation),
+            },
+        ))
+
+async def backfill_rollups(session: AsyncSession, attempt_id: TestAttempt.Id, screen: Rectangle):
+    """Recompute the rollups of a test attempt from its stored gaze samples."""
+    await session.execute(
+        delete(GazeDataRollup)
+        .where(GazeDataRollup.test_id == attempt_id.test_id, GazeDataRollup.test_taker_id == attempt_id.test_taker_id)
+    )
+    samples = await load_gaze_data(session, attempt_id)
+    await merge_rollups(session, attempt_id, roll_up(samples, off_screen_mask(samples, screen), screen))
+
+def choose_resolution(start: datetime, end: datetime, max_points: int) -> int:
+    """Choose the finest resolution that covers the time range in at most `max_points` points (if possible)."""
+    span = (end - start).total_seconds()
+    for resolution in RESOLUTIONS:
+        if span / resolution <= max_points:
+            return resolution
+    return RESOLUTIONS[-1]
+
+@dataclass
+class GazeSummaryPoint:
+    start_time: datetime
+    sample_count: int
+    mean_x: float
+    mean_y: float
+    off_screen_fraction: float
+    max_deviation: float
+
+async def summarise(
+    session: AsyncSession,
+    attempt_id: TestAttempt.Id,
+    start: datetime,
+    end: datetime,
+    resolution: int,
+) -> list[GazeSummaryPoint]:
+    """Aggregate the rollups of a test attempt within a time range into buckets of `resolution` seconds."""
+    bucket = func.floor(extract('epoch', GazeDataRollup.second) / resolution).label('bucket')
+    sample_count = func.sum(GazeDataRollup.sample_count)
+    result = await session.execute(
+        select(
+            bucket,
+            sample_count,
+            func.sum(GazeDataRollup.sum_x) / sample_count,
+            func.sum(GazeDataRollup.sum_y) / sample_count,
+            func.sum(GazeDataRollup.off_screen_count) * 1.0 / sample_count,
+            func.max(GazeDataRollup.max_deviation),
+        )
+        .where(
+            GazeDataRollup.test_id == attempt_id.test_id, GazeDataRollup.test_taker_id == attempt_id.test_taker_id,
+            GazeDataRollup.second >= start, GazeDataRollup.second < end,
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    return [
+        GazeSummaryPoint(
+            start_time=EPOCH + timedelta(seconds=int(bucket) * resolution),
+            sample_count=int(sample_count),
+            mean_x=float(mean_x),
+            mean_y=float(mean_y),
+            off_screen_fraction=float(off_screen_fraction),
+            max_deviation=float(max_deviation),
+        )
+        for bucket, sample_count, mean_x, mean_y, off_screen_fraction, max_deviation in result.tuples()
+    ]
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Compact binary wire format of gaze data frames.
+
+A frame is a header followed by an array of samples, all little-endian:
+
+* header (20 bytes): magic `b'GZ'` (2 bytes), version (uint8), padding (1 byte),
+  test ID, test taker ID, sequence number and sample count (uint32 each).
+* sample (16 bytes): timestamp in microseconds since the Unix epoch (int64), x and y coordinates (float32 each).
+"""
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import struct
+
+import numpy as np
+
+from ..data_model import TestAttempt
+
+
+MAGIC = b'GZ'
+VERSION = 1
+HEADER = struct.Struct('<2sBxIIII')
+SAMPLE_DTYPE = np.dtype([('timestamp', '<i8'), ('x', '<f4'), ('y', '<f4')])
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+class InvalidFrameError(ValueError):
+    pass
+
+@dataclass
+class GazeFrame:
+    attempt_id: TestAttempt.Id
+    sequence_number: int
+    samples: np.ndarray
+
+def decode_frame(data: bytes) -> GazeFrame:
+    """Decode a frame, viewing its samples in place rather than copying them."""
+    if len(data) < HEADER.size:
+        raise InvalidFrameError('The frame is shorter than its header.')
+    magic, version, test_id, test_taker_id, sequence_number, sample_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise InvalidFrameError('The frame is not of a supported format.')
+    if len(data) != HEADER.size + sample_count * SAMPLE_DTYPE.itemsize:
+        raise InvalidFrameError('The frame length does not match its sample count.')
+    samples = np.frombuffer(data, dtype=SAMPLE_DTYPE, count=sample_count, offset=HEADER.size)
+    return GazeFrame(TestAttempt.Id(test_id, test_taker_id), sequence_number, samples)
+
+def encode_frame(frame: GazeFrame) -> bytes:
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        frame.attempt_id.test_id, frame.attempt_id.test_taker_id,
+        frame.sequence_number, len(frame.samples),
+    )
+    return header + frame.samples.astype(SAMPLE_DTYPE, copy=False).tobytes()
+
+def to_timestamp(time: datetime) -> int:
+    return (time - EPOCH) // timedelta(microseconds=1)
+
+def samples_from_tuples(samples: Iterable[tuple[datetime, float, float]]) -> np.ndarray:
+    return np.fromiter(
+        ((to_timestamp(timestamp), x, y) for timestamp, x, y in samples),
+        dtype=SAMPLE_DTYPE,
+    )
+
+def timestamps_to_datetimes(timestamps: np.ndarray) -> list[datetime]:
+    return [
+        timestamp.replace(tzinfo=UTC)
+        for timestamp in timestamps.astype('datetime64[us]').tolist()
+    ]
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Processing of uploaded images (e.g. the photos of test taking environments) into downscaled thumbnails
+and perceptual hashes, with Pillow (an optional dependency).
+
+Images are decoded and resized on a dedicated process pool, never on the event loop. Thumbnails are cached on disk,
+and regenerated from the stored original when they are missing from the cache.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import io
+import multiprocessing
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+import numpy as np
+from quart import Quart, current_app
+
+from .file_storage import get_file_storage
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+
+THUMBNAIL_SIZES = (160, 640)
+"""The sizes (in pixels, of the larger dimension) of the thumbnails generated of each image."""
+THUMBNAIL_QUALITY = 85
+PERCEPTUAL_HASH_SIZE = 8
+
+class InvalidImageError(Exception):
+    pass
+
+@dataclass
+class ProcessedImage:
+    perceptual_hash: str
+    """The difference hash of the image, as 16 hexadecimal digits. Similar images have hashes with few differing bits."""
+    thumbnails: dict[int, bytes]
+    """The JPEG thumbnails of the image, by size."""
+
+def is_image_processing_supported() -> bool:
+    return Image is not None
+
+def difference_hash(image) -> str:
+    """Hash an image by whether the brightness increases between horizontally adjacent pixels of a tiny grayscale copy."""
+    assert Image is not None
+    pixels = np.asarray(image.convert('L').resize((PERCEPTUAL_HASH_SIZE + 1, PERCEPTUAL_HASH_SIZE), Image.Resampling.LANCZOS), dtype=np.int16)
+    return np.packbits(pixels[:, 1:] > pixels[:, :-1]).tobytes().hex()
+
+def _process_image(path: Path, thumbnail_sizes: tuple[int, ...]) -> ProcessedImage:
+    assert Image is not None and ImageOps is not None
+    try:
+        with Image.open(path) as image:
+            image.draft('RGB', (max(thumbnail_sizes), max(thumbnail_sizes))) # Lets JPEG images be decoded downscaled
+            image = ImageOps.exif_transpose(image).convert('RGB')
+    except FileNotFoundError:
+        raise
+    except (OSError, Image.DecompressionBombError) as e:
+        raise InvalidImageError(str(e)) from None
+    thumbnails = {}
+    for size in thumbnail_sizes:
+        thumbnail = image.copy()
+        thumbnail.thumbnail((size, size))
+        output = io.BytesIO()
+        thumbnail.save(output, format='JPEG', quality=THUMBNAIL_QUALITY)
+        thumbnails[size] = output.getvalue()
+    return ProcessedImage(perceptual_hash=difference_hash(image), thumbnails=thumbnails)
+
+class ImageProcessingService:
+    """Run image processing on a dedicated process pool, so that it neither blocks the event loop nor starves the default executor."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The process pool, which is started on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def process(self, path: Path, thumbnail_sizes: tuple[int, ...] = THUMBNAIL_SIZES) -> ProcessedImage:
+        """
+        Generate the thumbnails and perceptual hash of the image at the given path, which is opened by the worker
+        (so that the image is not passed between processes). Raise `InvalidImageError` if it cannot be decoded.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _process_image, path, thumbnail_sizes)
+
+class ThumbnailCache:
+    """A directory of the thumbnails of stored images, named after the digest of the image and the size of the thumbnail."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def path(self, digest: str, size: int) -> Path:
+        return self.directory / digest[:2] / f'{digest}_{size}.jpg'
+
+    def _put_all(self, digest: str, thumbnails: dict[int, bytes]):
+        for size, thumbnail in thumbnails.items():
+            path = self.path(digest, size)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Written to a temporary file first, so that a partially written thumbnail is never served.
+            temporary_path = path.with_name(f'{uuid4().hex}.tmp')
+            temporary_path.write_bytes(thumbnail)
+            temporary_path.replace(path)
+
+    async def put_all(self, digest: str, thumbnails: dict[int, bytes]):
+        await asyncio.to_thread(self._put_all, digest, thumbnails)
+
+def get_image_processing_service() -> ImageProcessingService:
+    return getattr(current_app, 'image_processing_service')
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    return getattr(current_app, 'thumbnail_cache')
+
+async def process_image(digest: str) -> ProcessedImage:
+    """
+    Generate the thumbnails (caching them) and perceptual hash of a stored image.
+    Raise `FileNotFoundError` if there is no such image.
+    """
+    processed_image = await get_image_processing_service().process(get_file_storage().path(digest))
+    await get_thumbnail_cache().put_all(digest, processed_image.thumbnails)
+    return processed_image
+
+async def get_thumbnail_path(digest: str, size: int) -> Optional[Path]:
+    """
+    Get the path of a cached thumbnail of a stored image, regenerating the thumbnails of the image if it is missing.
+    Return None if there is no such image (or it is missing and image processing is not supported).
+    """
+    path = get_thumbnail_cache().path(digest, size)
+    if await asyncio.to_thread(path.is_file):
+        return path
+    if not is_image_processing_supported():
+        return None
+    try:
+        await process_image(digest)
+    except FileNotFoundError:
+        return None
+    return path
+
+def init_app(app: Quart):
+    image_processing_service = ImageProcessingService(workers=app.config['IMAGE_PROCESSING_WORKERS'])
+    setattr(app, 'image_processing_service', image_processing_service)
+    app.after_serving(image_processing_service.shutdown)
+    setattr(app, 'thumbnail_cache', ThumbnailCache(Path(app.config['THUMBNAIL_CACHE_DIRECTORY'])))
\ No newline at end of file
@@ -0,0 +1,142 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import random
+import time
+from typing import Optional
+
+from quart import Quart, Response, current_app, request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+LATENCY_BUCKET_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10)
+"""The upper bounds (in seconds) of the buckets of latency histograms, excluding the unbounded bucket."""
+
+QUERY_COUNT_BUCKET_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+@dataclass
+class HistogramStatistics:
+    bounds: list[float]
+    """The inclusive upper bounds of the buckets. The last bucket is unbounded."""
+    counts: list[int]
+    count: int
+    sum: float
+
+class Histogram:
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def statistics(self) -> HistogramStatistics:
+        return HistogramStatistics(bounds=list(self.bounds), counts=list(self.counts), count=self.count, sum=self.sum)
+
+@dataclass
+class RequestTiming:
+    """The SQL statements issued while handling a (sampled) request, and the time spent on them."""
+    start_time: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    database_time: float = 0.0
+
+_request_timing: ContextVar[Optional[RequestTiming]] = ContextVar('request_timing', default=None)
+
+def _record_query_start_time(connection, cursor, statement, parameters, context, executemany):
+    if _request_timing.get() is not None:
+        connection.info.setdefault('query_start_times', []).append(time.perf_counter())
+
+def _record_query_time(connection, cursor, statement, parameters, context, executemany):
+    request_timing = _request_timing.get()
+    if request_timing is not None and connection.info.get('query_start_times'):
+        request_timing.query_count += 1
+        request_timing.database_time += time.perf_counter() - connection.info['query_start_times'].pop()
+
+def register_engine_events(engine: AsyncEngine):
+    event.listen(engine.sync_engine, 'before_cursor_execute', _record_query_start_time)
+    event.listen(engine.sync_engine, 'after_cursor_execute', _record_query_time)
+
+@dataclass
+class RouteStatistics:
+    method: str
+    route: str
+    latency: HistogramStatistics
+    """The time (in seconds) taken to handle requests, until the response headers are ready."""
+    database_time: HistogramStatistics
+    query_count: HistogramStatistics
+
+@dataclass
+class _RouteHistograms:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKET_BOUNDS))
+    database_time: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKET_BOUNDS))
+    query_count: Histogram = field(default_factory=lambda: Histogram(QUERY_COUNT_BUCKET_BOUNDS))
+
+class RequestInstrumentation:
+    """
+    Count the SQL statements of a sample of requests and time them, along with the requests themselves.
+
+    The timings of each request are sent back in a `Server-Timing` header, and aggregated into histograms per route.
+    Requests that are not sampled cost a random number and a context variable lookup per statement.
+    """
+
+    def __init__(self, sample_rate: float, query_count_warning_threshold: int) -> None:
+        self.sample_rate = sample_rate
+        self.query_count_warning_threshold = query_count_warning_threshold
+        self._routes: dict[tuple[str, str], _RouteHistograms] = {}
+
+    async def start(self):
+        if random.random() < self.sample_rate:
+            _request_timing.set(RequestTiming())
+
+    async def finish(self, response: Response) -> Response:
+        request_timing = _request_timing.get()
+        if request_timing is None:
+            return response
+        _request_timing.set(None)
+        latency = time.perf_counter() - request_timing.start_time
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={request_timing.database_time * 1000:.1f};desc="{request_timing.query_count} queries", '
+            f'total;dur={latency * 1000:.1f}'
+        )
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        histograms = self._routes.setdefault((request.method, route), _RouteHistograms())
+        histograms.latency.observe(latency)
+        histograms.database_time.observe(request_timing.database_time)
+        histograms.query_count.observe(request_timing.query_count)
+        if request_timing.query_count > self.query_count_warning_threshold:
+            current_app.logger.warning(
+                '%s %s issued %d SQL statements.', request.method, route, request_timing.query_count
+            )
+        return response
+
+    @property
+    def statistics(self) -> list[RouteStatistics]:
+        return [
+            RouteStatistics(
+                method=method,
+                route=route,
+                latency=histograms.latency.statistics,
+                database_time=histograms.database_time.statistics,
+                query_count=histograms.query_count.statistics,
+            )
+            for (method, route), histograms in sorted(self._routes.items())
+        ]
+
+def get_request_instrumentation() -> RequestInstrumentation:
+    return getattr(current_app, 'request_instrumentation')
+
+def init_app(app: Quart):
+    request_instrumentation = RequestInstrumentation(
+        sample_rate=app.config['INSTRUMENTATION_SAMPLE_RATE'],
+        query_count_warning_threshold=app.config['INSTRUMENTATION_QUERY_COUNT_WARNING_THRESHOLD'],
+    )
+    setattr(app, 'request_instrumentation', request_instrumentation)
+    app.before_request(request_instrumentation.start)
+    app.after_request(request_instrumentation.finish)
\ No newline at end of file
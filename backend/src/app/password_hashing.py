@@ -1,26 +1,156 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+import multiprocessing
+import time
+from typing import Any, Optional
+
 from quart import Quart, current_app
 from quart_bcrypt import Bcrypt
 
+from .error_handling import APIError
+
+
+class PasswordHashingOverloadedError(APIError):
+    def __init__(self):
+        super().__init__(503, 'Service is busy. Please try again later.')
+
+@dataclass
+class PasswordHashingStatistics:
+    workers: int
+    in_flight: int
+    """The number of operations that are either running or waiting for a worker."""
+    queue_depth: int
+    """The number of operations waiting for a worker."""
+    completed: int
+    rejected: int
+    mean_wait_time: float
+    """The mean time (in seconds) that completed operations waited for a worker."""
+    max_wait_time: float
+
+def _timed_call[T](func: Callable[..., T], submission_time: float, *args: Any) -> tuple[float, T]:
+    return time.time() - submission_time, func(*args)
+
+def _generate_password_hashes(bcrypt: Bcrypt, passwords: list[str]) -> list[bytes]:
+    return [bcrypt.generate_password_hash(password) for password in passwords]
+
+class PasswordHashingService:
+    """
+    Run bcrypt operations on a dedicated process pool, so that they neither block the event loop nor starve
+    the default executor.
+
+    At most `workers + queue_size` operations are admitted at a time. Further operations fail fast
+    with `PasswordHashingOverloadedError`, rather than piling up.
+    """
+
+    def __init__(self, bcrypt: Bcrypt, workers: int, queue_size: int) -> None:
+        self._bcrypt = bcrypt
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The process pool, which is started on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _run[T](self, func: Callable[..., T], *args: Any, fail_fast: bool = True) -> T:
+        if fail_fast and self._in_flight >= self.workers + self.queue_size:
+            self._rejected += 1
+            raise PasswordHashingOverloadedError
+        self._in_flight += 1
+        try:
+            wait_time, result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _timed_call, func, time.time(), *args
+            )
+        finally:
+            self._in_flight -= 1
+        self._completed += 1
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+        return result
+
+    async def generate_password_hash(self, password: str) -> bytes:
+        return await self._run(self._bcrypt.generate_password_hash, password)
+
+    async def check_password_hash(self, password_hash: str, password: str) -> bool:
+        return await self._run(self._bcrypt.check_password_hash, password_hash, password)
+
+    async def generate_password_hashes(self, passwords: list[str], chunk_size: int = 1) -> list[bytes]:
+        """
+        Hash many passwords in parallel across the workers, in chunks.
+
+        Rather than failing fast, this waits for capacity. One worker is left to other operations (such as logins)
+        when there are several, and chunks are kept small, so that those operations wait for at most one hash.
+        """
+        semaphore = asyncio.Semaphore(max(self.workers - 1, 1))
+        async def generate_chunk_password_hashes(chunk: list[str]) -> list[bytes]:
+            async with semaphore:
+                return await self._run(_generate_password_hashes, self._bcrypt, chunk, fail_fast=False)
+        return list(chain.from_iterable(await asyncio.gather(*(
+            generate_chunk_password_hashes(passwords[start:start + chunk_size])
+            for start in range(0, len(passwords), chunk_size)
+        ))))
+
+    @property
+    def statistics(self) -> PasswordHashingStatistics:
+        return PasswordHashingStatistics(
+            workers=self.workers,
+            in_flight=self._in_flight,
+            queue_depth=max(self._in_flight - self.workers, 0),
+            completed=self._completed,
+            rejected=self._rejected,
+            mean_wait_time=self._total_wait_time / self._completed if self._completed else 0.0,
+            max_wait_time=self._max_wait_time,
+        )
+
+def get_password_hashing_service() -> PasswordHashingService:
+    return getattr(current_app, 'password_hashing_service')
 
 async def generate_password_hash(password: str):
-    bcrypt: Bcrypt = getattr(current_app, 'bcrypt')
-    password_hash_bytes = await bcrypt.async_generate_password_hash(password)
+    password_hash_bytes = await get_password_hashing_service().generate_password_hash(password)
     return password_hash_bytes.decode('utf-8')
 
+async def generate_password_hashes(passwords: list[str]) -> list[str]:
+    password_hash_bytes = await get_password_hashing_service().generate_password_hashes(passwords)
+    return [password_hash.decode('utf-8') for password_hash in password_hash_bytes]
+
 async def check_password_hash(password_hash: str, password: str):
-    bcrypt: Bcrypt = getattr(current_app, 'bcrypt')
-    return await bcrypt.async_check_password_hash(password_hash, password)
+    return await get_password_hashing_service().check_password_hash(password_hash, password)
 
 async def mitigate_against_timing_attack():
-    """Simulate a password checking operation, to protect against timing attacks."""
-    bcrypt: Bcrypt = getattr(current_app, 'bcrypt')
+    """
+    Simulate a password checking operation, to protect against timing attacks.
+    It runs on the same pool (and is subject to the same admission control) as real checks.
+    """
     timeholder_password: str = getattr(current_app, 'timeholder_password')
     timeholder_password_hash: str = getattr(current_app, 'timeholder_password_hash')
-    await bcrypt.async_check_password_hash(timeholder_password_hash, timeholder_password)
+    await get_password_hashing_service().check_password_hash(timeholder_password_hash, timeholder_password)
 
 def init_app(app: Quart):
     bcrypt = Bcrypt(app)
     setattr(app, 'bcrypt', bcrypt)
+    password_hashing_service = PasswordHashingService(
+        bcrypt,
+        workers=app.config['PASSWORD_HASHING_WORKERS'],
+        queue_size=app.config['PASSWORD_HASHING_QUEUE_SIZE'],
+    )
+    setattr(app, 'password_hashing_service', password_hashing_service)
+    app.after_serving(password_hashing_service.shutdown)
     timeholder_password = 'timeholder password'
     timeholder_password_hash = bcrypt.generate_password_hash(timeholder_password).decode('utf-8')
     setattr(app, 'timeholder_password', timeholder_password)
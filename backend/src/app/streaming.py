@@ -0,0 +1,58 @@
+"""
+Streaming JSON responses, for payloads too large to be built (and validated) in one piece.
+
+The rows of a streamed response are read from a server-side cursor in partitions, and each partition is encoded
+and written as soon as it is read, so that the memory held by a response is bounded by the partition size
+and the first bytes are sent before the query has been fully read.
+"""
+
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from quart import Response, current_app, stream_with_context
+from quart_schema.conversion import model_dump
+from sqlalchemy import Executable, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import orm_session
+
+
+DEFAULT_PARTITION_SIZE = 500
+
+def encode_json(value: Any) -> bytes:
+    """Encode a value as JSON, converted (e.g. from a dataclass, with camel case keys) like a validated response."""
+    return current_app.json.dumps(
+        model_dump(value, camelize=current_app.config['QUART_SCHEMA_CONVERT_CASING'])
+    ).encode('utf-8')
+
+async def stream_rows[T](
+    session: AsyncSession,
+    query: Executable,
+    to_value: Callable[[Row], T],
+    partition_size: int,
+) -> AsyncIterator[list[T]]:
+    """Read the rows of a query from a server-side cursor in partitions, converting each row to a value."""
+    result = await session.stream(query.execution_options(yield_per=partition_size))
+    async for partition in result.partitions():
+        yield [to_value(row) for row in partition]
+
+async def encode_json_array[T](partitions: AsyncIterator[list[T]]) -> AsyncIterator[bytes]:
+    yield b'['
+    separator = b''
+    async for partition in partitions:
+        if partition:
+            yield separator + b','.join(encode_json(value) for value in partition)
+            separator = b','
+    yield b']'
+
+def streamed_json_response[T](
+    query: Executable,
+    to_value: Callable[[Row], T],
+    partition_size: int = DEFAULT_PARTITION_SIZE,
+) -> Response:
+    """
+    Respond with a JSON array of the rows of a query, each converted to a value (e.g. a response dataclass),
+    streamed as they are read.
+    """
+    body = stream_with_context(encode_json_array)(stream_rows(orm_session, query, to_value, partition_size))
+    return Response(body, content_type='application/json')
\ No newline at end of file
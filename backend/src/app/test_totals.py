@@ -0,0 +1,121 @@
+"""
+The totals of tests that are denormalised from their questions (`Test.max_marks` and `Test.question_count`),
+so that summaries of tests can be read without touching the `question` table.
+
+The totals of a test are recomputed from its questions whenever questions are added, removed or re-weighted through
+the ORM. Questions written to by other means (e.g. bulk statements) call for a repair with the `quart check_test_totals`
+command.
+"""
+
+import asyncio
+
+import click
+from quart import Quart, has_app_context
+from sqlalchemy import ColumnElement, case, event, func, inspect, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, UOWTransaction
+
+from .caching import get_test_definition_cache
+from .data_model import Question, Test
+from .database import create_engine_manager
+
+
+test_table = Test.__table__
+question_table = Question.__table__
+
+max_marks_of_questions = (
+    select(func.coalesce(func.sum(question_table.c.max_marks), 0))
+    .where(question_table.c.test_id == test_table.c.id)
+    .scalar_subquery()
+)
+count_of_questions = (
+    select(func.count())
+    .select_from(question_table)
+    .where(question_table.c.test_id == test_table.c.id)
+    .scalar_subquery()
+)
+
+def recompute_test_totals(condition: ColumnElement[bool], edited: ColumnElement[bool]):
+    """
+    An update of the totals of the tests that satisfy the condition, which bumps the versions of the edited tests
+    (so that cached copies of their definitions are not served).
+    """
+    return (
+        update(test_table)
+        .where(condition)
+        .values(
+            max_marks=max_marks_of_questions,
+            question_count=count_of_questions,
+            version=case((edited, test_table.c.version + 1), else_=test_table.c.version),
+        )
+        .returning(test_table.c.id)
+    )
+
+def _test_id(question: Question) -> int:
+    return inspect(question).attrs.test_id.value
+
+def _is_reweighted(question: Question) -> bool:
+    return inspect(question).attrs.max_marks.history.has_changes()
+
+@event.listens_for(Session, 'after_flush')
+def _update_test_totals(session: Session, flush_context: UOWTransaction):
+    test_ids = {
+        _test_id(question) for question in (*session.new, *session.deleted)
+        if isinstance(question, Question)
+    } | {
+        _test_id(question) for question in session.dirty
+        if isinstance(question, Question) and _is_reweighted(question)
+    }
+    if not test_ids:
+        return
+    created_test_ids = {test.id for test in session.new if isinstance(test, Test)}
+    edited_test_ids = set(session.execute(recompute_test_totals(
+        test_table.c.id.in_(test_ids),
+        edited=test_table.c.id.not_in(created_test_ids),
+    )).scalars()) - created_test_ids
+    session.info.setdefault('test_ids_with_recomputed_totals', set()).update(test_ids)
+    session.info.setdefault('edited_test_ids', set()).update(edited_test_ids)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _expire_test_totals(session: Session, flush_context: UOWTransaction):
+    for test_id in session.info.pop('test_ids_with_recomputed_totals', ()):
+        test = session.identity_map.get(session.identity_key(Test, test_id)) # type: ignore
+        if test is not None:
+            session.expire(test, ['max_marks', 'question_count', 'version'])
+    edited_test_ids = session.info.pop('edited_test_ids', ())
+    if has_app_context():
+        for test_id in edited_test_ids:
+            get_test_definition_cache().invalidate(test_id)
+
+async def check_test_totals(session: AsyncSession, repair: bool = False) -> list[int]:
+    """
+    Find the tests whose stored totals differ from the totals of their questions, and return their IDs.
+    If `repair`, recompute the totals of these tests (bumping their versions).
+    """
+    inconsistent = or_(test_table.c.max_marks != max_marks_of_questions, test_table.c.question_count != count_of_questions)
+    if not repair:
+        return list(await session.scalars(select(test_table.c.id).where(inconsistent).order_by(test_table.c.id)))
+    test_ids = sorted(await session.scalars(recompute_test_totals(inconsistent, edited=inconsistent)))
+    if has_app_context():
+        for test_id in test_ids:
+            get_test_definition_cache().invalidate(test_id)
+    return test_ids
+
+def init_app(app: Quart):
+    engine_manager = create_engine_manager(app)
+
+    @app.cli.command('check_test_totals')
+    @click.option('--repair', is_flag=True, help='Recompute the totals of the inconsistent tests.')
+    def _check_test_totals_command(repair: bool):
+        """Check that the denormalised max marks and question counts of tests match their questions."""
+        async def check_test_totals_command() -> list[int]:
+            async with engine_manager():
+                engine: AsyncEngine = getattr(app, 'engine')
+                async with AsyncSession(engine) as session, session.begin():
+                    return await check_test_totals(session, repair)
+
+        test_ids = asyncio.get_event_loop().run_until_complete(check_test_totals_command())
+        if not test_ids:
+            click.echo('The totals of every test are consistent.')
+        else:
+            click.echo(f"{'Repaired' if repair else 'Found'} the inconsistent totals of {len(test_ids)} tests: {', '.join(map(str, test_ids))}.")
\ No newline at end of file
@@ -1,8 +1,18 @@
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import UTC, datetime, timedelta
+
 import pytest_asyncio
+from quart import Quart
 from quart.typing import TestClientProtocol
+from sqlalchemy import select
 
 from app.blueprints.user import UserDetails
 from app.blueprints.user.authentication import LoginCredential
+from app.data_model import (
+    AttachmentQuestion, Invigilator, MultipleChoiceQuestion, Point, Question, Rectangle, Test, TestAttempt, TestSetter,
+    TestTaker, TextFieldQuestion, User,
+)
+from app.database import orm_session
 
 
 @pytest_asyncio.fixture
@@ -16,11 +26,105 @@ def user_details():
 
 @pytest_asyncio.fixture
 async def existing_user_details(test_client: TestClientProtocol, user_details: UserDetails):
-    await test_client.post('/user/create_account', json=user_details) # Create a user account
+    await test_client.post('/api/user/create_account', json=user_details) # Create a user account
     return user_details
 
 @pytest_asyncio.fixture
 async def logged_in_user_details(test_client: TestClientProtocol, existing_user_details: UserDetails):
     login_credential = LoginCredential.from_structural_superset(existing_user_details)
-    await test_client.post('/user/authentication/login', json=login_credential)
-    return existing_user_details
\ No newline at end of file
+    await test_client.post('/api/user/authentication/login', json=login_credential)
+    return existing_user_details
+
+@pytest_asyncio.fixture
+def metrics_headers(app: Quart) -> dict[str, str]:
+    """The headers that authorise a request to the metrics endpoint."""
+    return {'Authorization': f'Bearer {app.config["METRICS_TOKEN"]}'}
+
+@pytest_asyncio.fixture
+def create_test_attempt(app: Quart, logged_in_user_details: UserDetails) -> Callable[..., Awaitable[TestAttempt.Id]]:
+    """
+    Return a function that creates a running test attempt, taken by the logged in user (or invigilated by them
+    if `invigilated_by_logged_in_user`) and calibrated to the unit square, and returns the ID of the attempt.
+    The test has the given questions, if any.
+    """
+    async def create_test_attempt(invigilated_by_logged_in_user: bool = False, questions: Sequence[Question] = ()) -> TestAttempt.Id:
+        async with app.app_context():
+            user = await orm_session.scalar(select(User).where(User.username == logged_in_user_details.username))
+            assert user is not None
+            staff = User('staff_username', full_name='staff_full_name', email='staff@test.py', password_hash='')
+            staff.test_setter_role = TestSetter()
+            if invigilated_by_logged_in_user:
+                test_taker, invigilator = staff, user
+            else:
+                test_taker, invigilator = user, staff
+            test_taker.test_taker_role = TestTaker()
+            invigilator.invigilator_role = Invigilator()
+            now = datetime.now(UTC)
+            test = Test(
+                title='test_title', description='', guidelines='',
+                start_time=now - timedelta(hours=1), end_time=now + timedelta(hours=1),
+                questions=list(questions),
+                creator=staff.test_setter_role,
+            )
+            orm_session.add_all([staff, test])
+            await orm_session.flush()
+            attempt = TestAttempt(
+                invigilator=invigilator.invigilator_role,
+                environment_image_url='',
+                screen_position=Rectangle(
+                    top_left=Point(0, 0), top_right=Point(1, 0),
+                    bottom_left=Point(0, 1), bottom_right=Point(1, 1),
+                ),
+            )
+            attempt_id = TestAttempt.Id(test.id, test_taker.id)
+            attempt.test_id = attempt_id.test_id
+            attempt.test_taker_id = attempt_id.test_taker_id
+            orm_session.add(attempt)
+            await orm_session.commit()
+            return attempt_id
+    return create_test_attempt
+
+@pytest_asyncio.fixture
+async def test_attempt_id(create_test_attempt: Callable[..., Awaitable[TestAttempt.Id]]) -> TestAttempt.Id:
+    """Create a running test attempted by the logged in user, and return the ID of the attempt."""
+    return await create_test_attempt()
+
+@pytest_asyncio.fixture
+def questions() -> list[Question]:
+    """Build a multiple choice question (whose first option is correct), a text field question and an attachment question."""
+    options = [MultipleChoiceQuestion.Option(option_text=f'option_text_{i}') for i in range(4)]
+    return [
+        Question(
+            question_text='mcq_text', max_marks=2,
+            multiple_choice_question=MultipleChoiceQuestion(options=options, correct_option=options[0]),
+        ),
+        Question(question_text='text_field_question_text', max_marks=3, text_field_question=TextFieldQuestion()),
+        Question(question_text='attachment_question_text', max_marks=5, attachment_question=AttachmentQuestion()),
+    ]
+
+@pytest_asyncio.fixture
+def create_test_payload() -> Callable[..., dict]:
+    """Return a function that builds the body of a request to create a test with multiple choice questions."""
+    def create_test_payload(question_count: int, start_time: datetime | None = None) -> dict:
+        start_time = start_time or datetime.now(UTC) + timedelta(days=1)
+        return {
+            'id': 0,
+            'title': 'test_title',
+            'description': 'test_description',
+            'startTime': start_time.isoformat(),
+            'endTime': (start_time + timedelta(hours=1)).isoformat(),
+            'guidelines': 'test_guidelines',
+            'questions': [
+                {
+                    'discriminator': i,
+                    'questionText': f'question_text_{i}',
+                    'maxMarks': 2,
+                    'multipleChoiceQuestion': {
+                        'options': [{'discriminator': j, 'optionText': f'option_text_{j}'} for j in range(4)],
+                        'correctOptionDiscriminator': 0,
+                    },
+                }
+                for i in range(question_count)
+            ],
+        }
+    return create_test_payload
\ No newline at end of file
@@ -0,0 +1,11 @@
+from collections.abc import Awaitable, Callable
+
+import pytest_asyncio
+
+from app.data_model import TestAttempt
+
+
+@pytest_asyncio.fixture
+async def invigilation_id(create_test_attempt: Callable[..., Awaitable[TestAttempt.Id]]) -> TestAttempt.Id:
+    """Create a running test attempt invigilated by the logged in user, and return the ID of the attempt."""
+    return await create_test_attempt(invigilated_by_logged_in_user=True)
\ No newline at end of file
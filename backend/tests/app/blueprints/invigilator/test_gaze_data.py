@@ -0,0 +1,38 @@
+from datetime import UTC, datetime, timedelta
+
+from quart import Quart
+import quart.typing
+
+from app.data_model import TestAttempt
+from app.database import orm_session
+from app.gaze.ingestion import ingest_gaze_data
+from app.gaze.wire_format import samples_from_tuples
+
+
+class TestGetGazeSummary:
+    async def test_get_gaze_summary(self, app: Quart, test_client: quart.typing.TestClientProtocol, invigilation_id: TestAttempt.Id):
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        samples = samples_from_tuples(
+            (start + timedelta(seconds=i / 10), 0.25 if i < 600 else 2, 0.5) # Off-screen after a minute
+            for i in range(1200)
+        )
+        async with app.app_context():
+            await ingest_gaze_data(orm_session, invigilation_id, samples, window=(start, start + timedelta(hours=1)))
+        response = await test_client.get(
+            f'/api/invigilator/invigilations/{invigilation_id.test_id}/{invigilation_id.test_taker_id}/gaze_summary',
+            query_string={'start': start.isoformat(), 'end': (start + timedelta(hours=2)).isoformat()},
+        )
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body['resolution'] == 15
+        points = response_body['points']
+        assert [point['sampleCount'] for point in points] == [150] * 8
+        assert [point['offScreenFraction'] for point in points] == [0] * 4 + [1] * 4
+        assert points[0]['meanX'] == 0.25
+
+    async def test_not_invigilated_error(self, test_client: quart.typing.TestClientProtocol, invigilation_id: TestAttempt.Id):
+        response = await test_client.get(
+            f'/api/invigilator/invigilations/{invigilation_id.test_id}/{invigilation_id.test_taker_id + 1}/gaze_summary',
+            query_string={'start': '2026-01-01T00:00:00Z', 'end': '2026-01-01T01:00:00Z'},
+        )
+        assert response.status_code == 404
\ No newline at end of file
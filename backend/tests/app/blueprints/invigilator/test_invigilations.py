@@ -0,0 +1,33 @@
+import hashlib
+
+from quart import Quart
+import quart.typing
+from sqlalchemy import update
+
+from app.data_model import TestAttempt
+from app.database import orm_session
+from app.images import THUMBNAIL_SIZES
+
+
+class TestListInvigilations:
+    async def test_list_invigilations(self, app: Quart, test_client: quart.typing.TestClientProtocol, invigilation_id: TestAttempt.Id):
+        digest = hashlib.sha256(b'environment_image').hexdigest()
+        async with app.app_context():
+            await orm_session.execute(update(TestAttempt).values(environment_image_url=f'/api/files/{digest}', environment_image_hash='0' * 16))
+            await orm_session.commit()
+        response = await test_client.get('/api/invigilator/invigilations', query_string={'testId': invigilation_id.test_id})
+        assert response.status_code == 200
+        assert await response.get_json() == [{
+            'testId': invigilation_id.test_id,
+            'testTakerId': invigilation_id.test_taker_id,
+            'username': 'staff_username',
+            'fullName': 'staff_full_name',
+            'caughtCheating': False,
+            'environmentImageUrl': f'/api/files/{digest}',
+            'environmentImageThumbnailUrl': f'/api/files/{digest}/thumbnails/{THUMBNAIL_SIZES[0]}',
+            'environmentImageHash': '0' * 16,
+        }]
+
+    async def test_not_invigilator_error(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.get('/api/invigilator/invigilations', query_string={'testId': test_attempt_id.test_id})
+        assert response.status_code == 403
\ No newline at end of file
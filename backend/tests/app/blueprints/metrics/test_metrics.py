@@ -0,0 +1,45 @@
+from quart import Quart
+import quart.typing
+
+from app.blueprints.user import UserDetails
+
+
+class TestGetMetrics:
+    async def test_database_pool(self, test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails, metrics_headers: dict[str, str]):
+        await test_client.get('/api/user/details')
+        response = await test_client.get('/api/metrics', headers=metrics_headers)
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        database_pool = response_body['databasePool']
+        assert database_pool['checkouts'] >= 1
+        assert database_pool['checkedOut'] == 0
+        assert database_pool['timeouts'] == 0
+
+    async def test_routes(self, test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails, metrics_headers: dict[str, str]):
+        response = await test_client.get('/api/user/details')
+        assert response.headers['Server-Timing'].startswith('db;dur=')
+        assert 'desc="1 queries"' in response.headers['Server-Timing']
+        response = await test_client.get('/api/metrics', headers=metrics_headers)
+        response_body = await response.get_json()
+        route_statistics = next(
+            statistics for statistics in response_body['routes']
+            if statistics['method'] == 'GET' and statistics['route'] == '/api/user/details'
+        )
+        assert route_statistics['latency']['count'] == 1
+        assert route_statistics['queryCount']['sum'] == 1
+
+    async def test_disabled_error(self, app: Quart, test_client: quart.typing.TestClientProtocol, metrics_headers: dict[str, str]):
+        app.config['METRICS_ENABLED'] = False
+        response = await test_client.get('/api/metrics', headers=metrics_headers)
+        assert response.status_code == 404
+
+    async def test_unauthorised_error(self, test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails):
+        response = await test_client.get('/api/metrics')
+        assert response.status_code == 401
+        response = await test_client.get('/api/metrics', headers={'Authorization': 'Bearer wrong_token'})
+        assert response.status_code == 401
+
+    async def test_unconfigured_token_error(self, app: Quart, test_client: quart.typing.TestClientProtocol):
+        app.config['METRICS_TOKEN'] = None
+        response = await test_client.get('/api/metrics', headers={'Authorization': 'Bearer '})
+        assert response.status_code == 401
\ No newline at end of file
@@ -0,0 +1,68 @@
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest_asyncio
+from quart import Quart
+import quart.typing
+from sqlalchemy import insert, select
+
+from app.blueprints.user import UserDetails
+from app.data_model import Answer, Invigilator, MCQAnswer, Question, Test, TestAttempt, TestTaker, User
+from app.database import orm_session
+
+
+@pytest_asyncio.fixture
+async def test_setter_details(test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails):
+    await test_client.post('/api/test_setter/assume_role')
+    return logged_in_user_details
+
+@pytest_asyncio.fixture
+def create_answered_test(app: Quart, test_setter_details: UserDetails) -> Callable[..., Awaitable[tuple[int, list[int]]]]:
+    """
+    Return a function that creates a test of the logged in test setter with the given questions (see the `questions`
+    fixture) and two attempts, whose multiple choice question is answered correctly in the first attempt
+    and incorrectly in the second one, and whose text field question is answered in both.
+    The function returns the ID of the test and of its test takers.
+    """
+    async def create_answered_test(questions: list[Question], ended: bool = True) -> tuple[int, list[int]]:
+        async with app.app_context():
+            setter = await orm_session.scalar(select(User).where(User.username == test_setter_details.username))
+            assert setter is not None
+            now = datetime.now(UTC)
+            start_time = now - timedelta(hours=2) if ended else now - timedelta(hours=1)
+            test = Test(
+                title='test_title', description='', guidelines='',
+                start_time=start_time, end_time=start_time + timedelta(hours=1) if ended else now + timedelta(hours=1),
+                questions=questions,
+                creator=await setter.awaitable_attrs.test_setter_role,
+            )
+            test_takers = [User(f'test_taker_{i}', full_name=f'full_name_{i}', email=f'{i}@test.py', password_hash='') for i in range(2)]
+            for test_taker in test_takers:
+                test_taker.test_taker_role = TestTaker()
+            test_takers[0].invigilator_role = Invigilator()
+            orm_session.add_all([test, *test_takers])
+            await orm_session.flush()
+            test_id = test.id
+            test_taker_ids = [test_taker.id for test_taker in test_takers]
+            mcq_discriminator = questions[0].id.discriminator
+            text_field_question_discriminator = questions[1].id.discriminator
+            option_discriminators = [option.id.discriminator for option in questions[0].multiple_choice_question.options] # type: ignore
+            await orm_session.execute(insert(TestAttempt.__table__).values([
+                {'test_id': test_id, 'test_taker_id': test_taker_id, 'invigilator_id': test_taker_ids[0]}
+                for test_taker_id in test_taker_ids
+            ]))
+            await orm_session.execute(insert(Answer.__table__).values([
+                {'test_id': test_id, 'test_taker_id': test_taker_id, 'question_discriminator': question_discriminator}
+                for test_taker_id in test_taker_ids
+                for question_discriminator in (mcq_discriminator, text_field_question_discriminator)
+            ]))
+            await orm_session.execute(insert(MCQAnswer.__table__).values([
+                {
+                    'test_id': test_id, 'test_taker_id': test_taker_id,
+                    'question_discriminator': mcq_discriminator, 'chosen_option_discriminator': option_discriminator,
+                }
+                for test_taker_id, option_discriminator in zip(test_taker_ids, option_discriminators)
+            ]))
+            await orm_session.commit()
+            return test_id, test_taker_ids
+    return create_answered_test
\ No newline at end of file
@@ -0,0 +1,64 @@
+from collections import Counter
+from collections.abc import Callable
+
+from quart import Quart
+import quart.typing
+from sqlalchemy import select
+
+from app.blueprints.user import UserDetails
+from app.data_model import Invigilator, Test, TestAttempt, TestTaker, User
+from app.database import orm_session
+
+
+class TestEnroll:
+    async def create_users(self, app: Quart, count: int, role: type[TestTaker] | type[Invigilator]) -> list[int]:
+        async with app.app_context():
+            users = [
+                User(f'{role.__tablename__}_{i}', full_name='', email=f'{role.__tablename__}_{i}@test.py', password_hash='')
+                for i in range(count)
+            ]
+            for user in users:
+                if role is TestTaker:
+                    user.test_taker_role = TestTaker()
+                else:
+                    user.invigilator_role = Invigilator()
+            orm_session.add_all(users)
+            await orm_session.flush()
+            user_ids = [user.id for user in users]
+            await orm_session.commit()
+            return user_ids
+
+    async def create_test(self, app: Quart, test_client: quart.typing.TestClientProtocol, create_test_payload: Callable[..., dict]) -> int:
+        await test_client.post('/api/test_setter/create_test', json=create_test_payload(question_count=1))
+        async with app.app_context():
+            test_id = await orm_session.scalar(select(Test.id))
+            assert test_id is not None
+            return test_id
+
+    async def test_enroll(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails, create_test_payload: Callable[..., dict]):
+        test_id = await self.create_test(app, test_client, create_test_payload)
+        test_taker_ids = await self.create_users(app, 10, TestTaker)
+        invigilator_ids = await self.create_users(app, 2, Invigilator)
+        response = await test_client.post(
+            f'/api/test_setter/tests/{test_id}/enrollments',
+            json={'testTakerIds': test_taker_ids + [test_taker_ids[0], invigilator_ids[0]]},
+        )
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body['enrolledCount'] == 10
+        assert [result['error'] for result in response_body['results'][10:]] == ['Test taker is repeated.', 'Test taker not found.']
+        async with app.app_context():
+            assigned_invigilator_ids = await orm_session.scalars(
+                select(TestAttempt.invigilator_id).where(TestAttempt.test_id == test_id)
+            )
+            assert Counter(assigned_invigilator_ids) == {invigilator_ids[0]: 5, invigilator_ids[1]: 5}
+
+        response = await test_client.post(f'/api/test_setter/tests/{test_id}/enrollments', json={'testTakerIds': test_taker_ids[:1]})
+        response_body = await response.get_json()
+        assert response_body['results'][0]['error'] == 'Test taker is already enrolled.'
+
+    async def test_missing_test_error(self, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails):
+        response = await test_client.post('/api/test_setter/tests/1/enrollments', json={'testTakerIds': []})
+        assert response.status_code == 404
+        response_body = await response.get_json()
+        assert response_body == 'Test not found.'
\ No newline at end of file
@@ -0,0 +1,73 @@
+from collections.abc import Awaitable, Callable
+import csv
+from datetime import UTC, datetime, timedelta
+import gzip
+import io
+
+import pytest
+from quart import Quart
+import quart.typing
+
+from app.data_model import Question, TestAttempt
+from app.database import orm_session
+from app.gaze.ingestion import insert_gaze_data
+from app.gaze.wire_format import samples_from_tuples
+
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+async def insert_samples(app: Quart, attempt_id: TestAttempt.Id, count: int):
+    """Insert a gaze sample every second from `START`."""
+    async with app.app_context():
+        await insert_gaze_data(orm_session, attempt_id, samples_from_tuples(
+            (START + timedelta(seconds=i), i / count, 0.5) for i in range(count)
+        ))
+        await orm_session.commit()
+
+def read_csv(data: bytes) -> list[dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(gzip.decompress(data).decode('utf-8'))))
+
+class TestExportTestData:
+    async def test_export_gaze_data(self, app: Quart, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, test_taker_ids = await create_answered_test(questions)
+        for test_taker_id in test_taker_ids:
+            await insert_samples(app, TestAttempt.Id(test_id, test_taker_id), 10)
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/export', query_string={
+            'testTakerId': test_taker_ids[1],
+            'start': (START + timedelta(seconds=2)).isoformat(),
+            'end': (START + timedelta(seconds=5)).isoformat(),
+        })
+        assert response.status_code == 200
+        assert response.content_type == 'application/gzip'
+        assert f'test_{test_id}_gaze_data.csv.gz' in response.headers['Content-Disposition']
+        rows = read_csv(await response.get_data())
+        assert [datetime.fromisoformat(row['timestamp']) for row in rows] == [START + timedelta(seconds=i) for i in range(2, 5)]
+        assert {int(row['test_taker_id']) for row in rows} == {test_taker_ids[1]}
+        assert float(rows[0]['x']) == pytest.approx(0.2)
+
+    async def test_export_answers(self, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, test_taker_ids = await create_answered_test(questions)
+        await test_client.post(f'/api/test_setter/tests/{test_id}/grade')
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/export', query_string={'table': 'answers'})
+        assert response.status_code == 200
+        rows = read_csv(await response.get_data())
+        assert [(int(row['test_taker_id']), row['marks_obtained']) for row in rows] == [
+            (test_taker_ids[0], '2'), (test_taker_ids[0], ''), (test_taker_ids[1], '0'), (test_taker_ids[1], ''),
+        ]
+        assert rows[0]['max_marks'] == '2'
+        assert rows[0]['chosen_option_discriminator'] != ''
+
+    async def test_export_parquet(self, app: Quart, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        parquet = pytest.importorskip('pyarrow.parquet')
+        test_id, test_taker_ids = await create_answered_test(questions)
+        await insert_samples(app, TestAttempt.Id(test_id, test_taker_ids[0]), 10)
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/export', query_string={'format': 'parquet'})
+        assert response.status_code == 200
+        table = parquet.read_table(io.BytesIO(await response.get_data()))
+        assert table.column_names == ['test_id', 'test_taker_id', 'timestamp', 'x', 'y']
+        assert table.column('timestamp').to_pylist() == [START + timedelta(seconds=i) for i in range(10)]
+
+    async def test_missing_test_error(self, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, _ = await create_answered_test(questions)
+        response = await test_client.get(f'/api/test_setter/tests/{test_id + 1}/export')
+        assert response.status_code == 404
\ No newline at end of file
@@ -0,0 +1,31 @@
+from collections.abc import Awaitable, Callable
+
+from quart import Quart
+import quart.typing
+from sqlalchemy import select
+
+from app.data_model import Answer, Question
+from app.database import orm_session
+
+
+class TestGrade:
+    async def test_grade(self, app: Quart, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, test_taker_ids = await create_answered_test(questions)
+        for _ in range(2): # Grading can be rerun.
+            response = await test_client.post(f'/api/test_setter/tests/{test_id}/grade')
+            assert response.status_code == 200
+            response_body = await response.get_json()
+            assert response_body['gradedCount'] == 2
+        async with app.app_context():
+            marks = dict((await orm_session.execute(
+                select(Answer.test_taker_id, Answer.marks_obtained)
+                .join(Answer.mcq_answer)
+            )).tuples().all())
+            assert marks == {test_taker_ids[0]: 2, test_taker_ids[1]: 0}
+            ungraded_count = len((await orm_session.scalars(select(Answer.test_taker_id).where(Answer.marks_obtained.is_(None)))).all())
+            assert ungraded_count == 2
+
+    async def test_not_ended_error(self, app: Quart, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, _ = await create_answered_test(questions, ended=False)
+        response = await test_client.post(f'/api/test_setter/tests/{test_id}/grade')
+        assert response.status_code == 409
\ No newline at end of file
@@ -0,0 +1,47 @@
+import json
+
+from quart import Quart
+import quart.typing
+from sqlalchemy import func, select
+
+from app.blueprints.test_setter.provisioning import parse_csv, parse_json_lines, provision_accounts
+from app.blueprints.user import UserDetails
+from app.data_model import User
+from app.database import orm_session
+
+
+class TestProvisionAccounts:
+    async def test_provision_accounts(self, app: Quart, test_setter_details: UserDetails):
+        accounts = [
+            {'username': f'username_{i}', 'fullName': f'full_name_{i}', 'email': f'{i}@test.py', 'password': 'password'}
+            for i in range(20)
+        ]
+        accounts.append({'username': test_setter_details.username, 'fullName': '', 'email': 'other@test.py', 'password': ''})
+        accounts.append({'username': 'username_0', 'fullName': '', 'email': 'another@test.py', 'password': ''})
+        accounts.append({'username': 'username_without_email'})
+        records = list(parse_json_lines(json.dumps(account) for account in accounts))
+        async with app.app_context():
+            report = await provision_accounts(orm_session, records)
+            await orm_session.commit()
+            user_count = await orm_session.scalar(select(func.count()).select_from(User))
+        assert report.created_count == 20
+        assert report.failed_count == 3
+        assert [result.error for result in report.results[20:]] == [
+            'Username is already taken up.',
+            'Username is repeated.',
+            'full_name: Field required; email: Field required; password: Field required',
+        ]
+        assert user_count == 21
+
+    async def test_provision_accounts_from_csv(self, app: Quart):
+        csv = 'username,full_name,email,password\n' + ''.join(f'username_{i},full_name_{i},{i}@test.py,password\n' for i in range(5))
+        records = list(parse_csv(csv.splitlines()))
+        async with app.app_context():
+            report = await provision_accounts(orm_session, records)
+            await orm_session.commit()
+        assert report.created_count == 5
+        assert all(result.created for result in report.results)
+
+    async def test_no_endpoint(self, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails):
+        response = await test_client.post('/api/test_setter/provision_accounts', json=[])
+        assert response.status_code == 404
\ No newline at end of file
@@ -0,0 +1,61 @@
+from collections.abc import Awaitable, Callable
+
+import quart.typing
+
+from app.data_model import Question
+
+
+class TestGetResults:
+    async def test_get_results(self, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, test_taker_ids = await create_answered_test(questions)
+        await test_client.post(f'/api/test_setter/tests/{test_id}/grade')
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/results', query_string={'limit': 1})
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body['maxMarks'] == 10
+        assert response_body['attemptCount'] == 2
+        assert response_body['hasMore']
+        first_result, = response_body['results']
+        assert first_result['testTakerId'] == test_taker_ids[0]
+        assert (first_result['marksObtained'], first_result['rank'], first_result['percentile']) == (2, 1, 100)
+        assert not first_result['graded'] # The text field answer is not graded.
+
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/results', query_string={
+            'limit': 1, 'afterRank': first_result['rank'], 'afterTestTakerId': first_result['testTakerId'],
+        })
+        response_body = await response.get_json()
+        assert not response_body['hasMore']
+        second_result, = response_body['results']
+        assert second_result['testTakerId'] == test_taker_ids[1]
+        assert (second_result['marksObtained'], second_result['rank'], second_result['percentile']) == (0, 2, 0)
+
+    async def test_stream_results(self, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, _ = await create_answered_test(questions)
+        await test_client.post(f'/api/test_setter/tests/{test_id}/grade')
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/results/all')
+        assert response.status_code == 200
+        assert response.content_type == 'application/json'
+        page_response = await test_client.get(f'/api/test_setter/tests/{test_id}/results')
+        assert await response.get_json() == (await page_response.get_json())['results']
+
+    async def test_get_score_distributions(self, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, _ = await create_answered_test(questions)
+        await test_client.post(f'/api/test_setter/tests/{test_id}/grade')
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/results/questions')
+        assert response.status_code == 200
+        mcq, text_field_question, attachment_question = await response.get_json()
+        assert mcq['scoreCounts'] == [{'marksObtained': 0, 'answerCount': 1}, {'marksObtained': 2, 'answerCount': 1}]
+        assert mcq['meanMarks'] == 1
+        assert (text_field_question['answerCount'], text_field_question['ungradedCount']) == (2, 2)
+        assert text_field_question['meanMarks'] is None
+        assert attachment_question['answerCount'] == 0
+
+    async def test_missing_test_error(self, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, _ = await create_answered_test(questions)
+        response = await test_client.get(f'/api/test_setter/tests/{test_id + 1}/results')
+        assert response.status_code == 404
+
+    async def test_partial_cursor_error(self, test_client: quart.typing.TestClientProtocol, create_answered_test: Callable[..., Awaitable[tuple[int, list[int]]]], questions: list[Question]):
+        test_id, _ = await create_answered_test(questions)
+        response = await test_client.get(f'/api/test_setter/tests/{test_id}/results', query_string={'afterRank': 1})
+        assert response.status_code == 422
\ No newline at end of file
@@ -0,0 +1,79 @@
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from quart import Quart
+import quart.typing
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.blueprints.user import UserDetails
+
+
+class TestGetTests:
+    async def count_queries_of_get_tests(self, app: Quart, test_client: quart.typing.TestClientProtocol) -> int:
+        engine: AsyncEngine = getattr(app, 'engine')
+        query_count = 0
+        def count_query(*args):
+            nonlocal query_count
+            query_count += 1
+        event.listen(engine.sync_engine, 'before_cursor_execute', count_query)
+        try:
+            response = await test_client.get('/api/test_setter/tests')
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', count_query)
+        assert response.status_code == 200
+        return query_count
+
+    async def test_get_tests(self, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails, create_test_payload: Callable[..., dict]):
+        payload = create_test_payload(question_count=2)
+        response = await test_client.post('/api/test_setter/create_test', json=payload)
+        assert response.status_code == 204
+        response = await test_client.get('/api/test_setter/tests')
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert len(response_body) == 1
+        assert [question['questionText'] for question in response_body[0]['questions']] == ['question_text_0', 'question_text_1']
+        options = response_body[0]['questions'][0]['multipleChoiceQuestion']['options']
+        assert [option['optionText'] for option in options] == [f'option_text_{j}' for j in range(4)]
+
+    async def test_query_count_is_constant(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails, create_test_payload: Callable[..., dict]):
+        await test_client.post('/api/test_setter/create_test', json=create_test_payload(question_count=1))
+        query_count_of_small_tests = await self.count_queries_of_get_tests(app, test_client)
+        for _ in range(3):
+            await test_client.post('/api/test_setter/create_test', json=create_test_payload(question_count=20))
+        query_count_of_large_tests = await self.count_queries_of_get_tests(app, test_client)
+        assert query_count_of_large_tests == query_count_of_small_tests
+
+class TestGetTestSummaries:
+    async def test_get_test_summaries(self, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails, create_test_payload: Callable[..., dict]):
+        now = datetime.now(UTC)
+        for days in (-2, 1, 2):
+            await test_client.post('/api/test_setter/create_test', json=create_test_payload(question_count=2, start_time=now + timedelta(days=days)))
+        response = await test_client.get('/api/test_setter/tests/summaries', query_string={'limit': 2})
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body['hasMore']
+        assert [test['startTime'] for test in response_body['tests']] == sorted((test['startTime'] for test in response_body['tests']), reverse=True)
+        assert all((test['maxMarks'], test['questionCount'], test['attemptCount']) == (4, 2, 0) for test in response_body['tests'])
+        last_test = response_body['tests'][-1]
+
+        response = await test_client.get('/api/test_setter/tests/summaries', query_string={
+            'limit': 2, 'afterStartTime': last_test['startTime'], 'afterId': last_test['id'],
+        })
+        response_body = await response.get_json()
+        assert not response_body['hasMore']
+        past_test, = response_body['tests']
+        assert datetime.fromisoformat(past_test['startTime']) < now
+
+        response = await test_client.get('/api/test_setter/tests/summaries', query_string={'status': 'upcoming'})
+        response_body = await response.get_json()
+        assert len(response_body['tests']) == 2
+
+        response = await test_client.get(f"/api/test_setter/tests/{past_test['id']}")
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert len(response_body['questions']) == 2
+
+    async def test_get_test_summaries_partial_cursor_error(self, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails):
+        response = await test_client.get('/api/test_setter/tests/summaries', query_string={'afterId': 1})
+        assert response.status_code == 422
\ No newline at end of file
@@ -0,0 +1,52 @@
+from collections.abc import Callable
+
+from quart import Quart
+import quart.typing
+from sqlalchemy import select, update
+
+from app.blueprints.user import UserDetails
+from app.data_model import Question, Test
+from app.database import orm_session
+from app.test_totals import check_test_totals
+
+
+class TestTestTotals:
+    async def create_test(self, app: Quart, test_client: quart.typing.TestClientProtocol, create_test_payload: Callable[..., dict]) -> int:
+        await test_client.post('/api/test_setter/create_test', json=create_test_payload(question_count=3))
+        async with app.app_context():
+            test_id = await orm_session.scalar(select(Test.id))
+            assert test_id is not None
+            return test_id
+
+    async def get_totals(self, app: Quart, test_id: int) -> tuple[int, int, int]:
+        async with app.app_context():
+            row = (await orm_session.execute(
+                select(Test.max_marks, Test.question_count, Test.version).where(Test.id == test_id)
+            )).one()
+            return row._tuple()
+
+    async def test_maintained_on_flush(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails, create_test_payload: Callable[..., dict]):
+        test_id = await self.create_test(app, test_client, create_test_payload)
+        assert await self.get_totals(app, test_id) == (6, 3, 1)
+
+        async with app.app_context():
+            first_question, *_, last_question = await orm_session.scalars(select(Question).order_by(Question.number))
+            first_question.max_marks = 5
+            await orm_session.commit()
+        assert await self.get_totals(app, test_id) == (9, 3, 2)
+
+        async with app.app_context():
+            await orm_session.delete(last_question)
+            await orm_session.commit()
+        assert await self.get_totals(app, test_id) == (7, 2, 3)
+
+    async def test_check_test_totals(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_setter_details: UserDetails, create_test_payload: Callable[..., dict]):
+        test_id = await self.create_test(app, test_client, create_test_payload)
+        async with app.app_context():
+            await orm_session.execute(update(Test.__table__).values(max_marks=0))
+            await orm_session.commit()
+            assert await check_test_totals(orm_session) == [test_id]
+            assert await check_test_totals(orm_session, repair=True) == [test_id]
+            await orm_session.commit()
+            assert await check_test_totals(orm_session) == []
+        assert await self.get_totals(app, test_id) == (6, 3, 2)
\ No newline at end of file
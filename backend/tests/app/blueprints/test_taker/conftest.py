@@ -0,0 +1,18 @@
+from collections.abc import Awaitable, Callable
+
+import pytest_asyncio
+import quart.typing
+
+from app.data_model import Question, TestAttempt
+
+
+@pytest_asyncio.fixture
+async def attempt_with_questions(
+    test_client: quart.typing.TestClientProtocol,
+    create_test_attempt: Callable[..., Awaitable[TestAttempt.Id]],
+    questions: list[Question],
+) -> tuple[TestAttempt.Id, dict]:
+    """Create a running test attempt with questions, and return its ID along with the definition of its test."""
+    attempt_id = await create_test_attempt(questions=questions)
+    response = await test_client.get(f'/api/test_taker/attempts/{attempt_id.test_id}/test')
+    return attempt_id, await response.get_json()
\ No newline at end of file
@@ -0,0 +1,57 @@
+from quart import Quart
+import quart.typing
+from sqlalchemy import select
+
+from app.data_model import Answer, MCQAnswer, TestAttempt, TextFieldAnswer
+from app.database import orm_session
+
+
+class TestAutosaveAnswers:
+    async def test_autosave_answers(self, app: Quart, test_client: quart.typing.TestClientProtocol, attempt_with_questions: tuple[TestAttempt.Id, dict]):
+        attempt_id, test = attempt_with_questions
+        mcq, text_field_question, attachment_question = test['questions']
+        options = mcq['multipleChoiceQuestion']['options']
+        response = await test_client.post(f'/api/test_taker/attempts/{attempt_id.test_id}/answers', json={'changes': [
+            {'questionDiscriminator': mcq['discriminator'], 'sequenceNumber': 2, 'chosenOptionDiscriminator': options[1]['discriminator']},
+            {'questionDiscriminator': mcq['discriminator'], 'sequenceNumber': 1, 'chosenOptionDiscriminator': options[0]['discriminator']},
+            {'questionDiscriminator': text_field_question['discriminator'], 'sequenceNumber': 1, 'answerText': 'answer_text'},
+            {'questionDiscriminator': attachment_question['discriminator'], 'sequenceNumber': 1, 'isBookmarked': True},
+        ]})
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert sorted(response_body['saved']) == sorted(question['discriminator'] for question in test['questions'])
+        assert response_body['stale'] == []
+        async with app.app_context():
+            answers = {answer.question_id.discriminator: answer for answer in await orm_session.scalars(select(Answer))}
+            assert answers[mcq['discriminator']].sequence_number == 2
+            assert answers[attachment_question['discriminator']].is_bookmarked
+            chosen_option_discriminator = await orm_session.scalar(select(MCQAnswer.chosen_option_discriminator))
+            assert chosen_option_discriminator == options[1]['discriminator']
+            answer_text = await orm_session.scalar(select(TextFieldAnswer.answer_text))
+            assert answer_text == 'answer_text'
+
+    async def test_stale_changes_are_dropped(self, app: Quart, test_client: quart.typing.TestClientProtocol, attempt_with_questions: tuple[TestAttempt.Id, dict]):
+        attempt_id, test = attempt_with_questions
+        text_field_question = test['questions'][1]
+        url = f'/api/test_taker/attempts/{attempt_id.test_id}/answers'
+        for sequence_number, answer_text, saved in [(2, 'newer', True), (1, 'older', False), (2, 'newer', False)]:
+            response = await test_client.post(url, json={'changes': [
+                {'questionDiscriminator': text_field_question['discriminator'], 'sequenceNumber': sequence_number, 'answerText': answer_text},
+            ]})
+            response_body = await response.get_json()
+            assert response_body['saved' if saved else 'stale'] == [text_field_question['discriminator']]
+        async with app.app_context():
+            answer_text = await orm_session.scalar(select(TextFieldAnswer.answer_text))
+            assert answer_text == 'newer'
+
+    async def test_invalid_option_error(self, test_client: quart.typing.TestClientProtocol, attempt_with_questions: tuple[TestAttempt.Id, dict]):
+        attempt_id, test = attempt_with_questions
+        mcq, text_field_question, _ = test['questions']
+        response = await test_client.post(f'/api/test_taker/attempts/{attempt_id.test_id}/answers', json={'changes': [
+            {'questionDiscriminator': mcq['discriminator'], 'sequenceNumber': 1, 'chosenOptionDiscriminator': -1},
+        ]})
+        assert response.status_code == 400
+        response = await test_client.post(f'/api/test_taker/attempts/{attempt_id.test_id}/answers', json={'changes': [
+            {'questionDiscriminator': text_field_question['discriminator'], 'sequenceNumber': 1, 'chosenOptionDiscriminator': 0},
+        ]})
+        assert response.status_code == 400
\ No newline at end of file
@@ -0,0 +1,53 @@
+import hashlib
+
+from quart import Quart
+import quart.typing
+from sqlalchemy import select
+
+from app.data_model import AttachmentAnswer, TestAttempt
+from app.database import orm_session
+
+
+CONTENT = b'attachment_content'
+
+class TestUploadAttachment:
+    async def test_upload_attachment(self, app: Quart, test_client: quart.typing.TestClientProtocol, attempt_with_questions: tuple[TestAttempt.Id, dict]):
+        attempt_id, test = attempt_with_questions
+        _, _, attachment_question = test['questions']
+        url = f'/api/test_taker/attempts/{attempt_id.test_id}/answers/{attachment_question["discriminator"]}/attachment'
+        response = await test_client.put(url, data=CONTENT)
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body == {'attachedFileUrl': f'/api/files/{hashlib.sha256(CONTENT).hexdigest()}', 'size': len(CONTENT)}
+        async with app.app_context():
+            assert await orm_session.scalar(select(AttachmentAnswer.attached_file_url)) == response_body['attachedFileUrl']
+
+        response = await test_client.get(response_body['attachedFileUrl'])
+        assert response.status_code == 200
+        assert await response.get_data() == CONTENT
+        response = await test_client.get(response_body['attachedFileUrl'], headers={'Range': 'bytes=2-5'})
+        assert response.status_code == 206
+        assert await response.get_data() == CONTENT[2:6]
+
+    async def test_too_large_error(self, app: Quart, test_client: quart.typing.TestClientProtocol, attempt_with_questions: tuple[TestAttempt.Id, dict]):
+        attempt_id, test = attempt_with_questions
+        _, _, attachment_question = test['questions']
+        app.config['ATTACHMENT_MAX_SIZE'] = len(CONTENT) - 1
+        response = await test_client.put(
+            f'/api/test_taker/attempts/{attempt_id.test_id}/answers/{attachment_question["discriminator"]}/attachment',
+            data=CONTENT,
+        )
+        assert response.status_code == 413
+
+    async def test_not_attachment_question_error(self, test_client: quart.typing.TestClientProtocol, attempt_with_questions: tuple[TestAttempt.Id, dict]):
+        attempt_id, test = attempt_with_questions
+        mcq, _, _ = test['questions']
+        response = await test_client.put(
+            f'/api/test_taker/attempts/{attempt_id.test_id}/answers/{mcq["discriminator"]}/attachment',
+            data=CONTENT,
+        )
+        assert response.status_code == 400
+
+    async def test_unattached_file_error(self, test_client: quart.typing.TestClientProtocol, attempt_with_questions: tuple[TestAttempt.Id, dict]):
+        response = await test_client.get(f'/api/files/{hashlib.sha256(CONTENT).hexdigest()}')
+        assert response.status_code == 404
\ No newline at end of file
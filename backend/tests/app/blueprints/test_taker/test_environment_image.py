@@ -0,0 +1,63 @@
+import io
+
+import pytest
+from quart import Quart
+import quart.typing
+from sqlalchemy import select
+
+from app.data_model import TestAttempt
+from app.database import orm_session
+from app.images import THUMBNAIL_SIZES, get_thumbnail_cache
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def make_image(width: int = 1200, height: int = 600) -> bytes:
+    image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+class TestUploadEnvironmentImage:
+    async def test_upload_environment_image(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.put(f'/api/test_taker/attempts/{test_attempt_id.test_id}/environment_image', data=make_image())
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert len(response_body['perceptualHash']) == 16
+        assert set(response_body['thumbnailUrls']) == {str(size) for size in THUMBNAIL_SIZES}
+        async with app.app_context():
+            attempt = (await orm_session.execute(select(TestAttempt.environment_image_url, TestAttempt.environment_image_hash))).one()
+        assert attempt == (response_body['environmentImageUrl'], response_body['perceptualHash'])
+
+        for size in THUMBNAIL_SIZES:
+            response = await test_client.get(response_body['thumbnailUrls'][str(size)])
+            assert response.status_code == 200
+            assert response.mimetype == 'image/jpeg'
+            with Image.open(io.BytesIO(await response.get_data())) as thumbnail:
+                assert thumbnail.size == (size, size // 2)
+
+    async def test_thumbnail_regenerated(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.put(f'/api/test_taker/attempts/{test_attempt_id.test_id}/environment_image', data=make_image())
+        digest = (await response.get_json())['environmentImageUrl'].rsplit('/', 1)[1]
+        async with app.app_context():
+            path = get_thumbnail_cache().path(digest, THUMBNAIL_SIZES[0])
+        path.unlink()
+        response = await test_client.get(f'/api/files/{digest}/thumbnails/{THUMBNAIL_SIZES[0]}')
+        assert response.status_code == 200
+        assert path.is_file()
+
+    async def test_invalid_image_error(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.put(f'/api/test_taker/attempts/{test_attempt_id.test_id}/environment_image', data=b'not_an_image')
+        assert response.status_code == 415
+
+    async def test_too_large_error(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        image = make_image()
+        app.config['ENVIRONMENT_IMAGE_MAX_SIZE'] = len(image) - 1
+        response = await test_client.put(f'/api/test_taker/attempts/{test_attempt_id.test_id}/environment_image', data=image)
+        assert response.status_code == 413
+
+    async def test_unknown_thumbnail_size_error(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.put(f'/api/test_taker/attempts/{test_attempt_id.test_id}/environment_image', data=make_image())
+        digest = (await response.get_json())['environmentImageUrl'].rsplit('/', 1)[1]
+        response = await test_client.get(f'/api/files/{digest}/thumbnails/100')
+        assert response.status_code == 404
\ No newline at end of file
@@ -0,0 +1,151 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from quart import Quart
+from quart.testing.connections import WebsocketDisconnectError
+import quart.typing
+from sqlalchemy import delete, func, select
+
+from app.data_model import GazeData, Point, Rectangle, TestAttempt
+from app.database import orm_session
+from app.gaze.off_screen import load_gaze_data
+from app.gaze.wire_format import GazeFrame, encode_frame, samples_from_tuples, to_timestamp
+
+
+class TestCalibrateScreenPosition:
+    async def test_calibrate_screen_position(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        screen_position = {
+            'topLeft': {'x': 0, 'y': 0}, 'topRight': {'x': 2, 'y': 0},
+            'bottomLeft': {'x': 0, 'y': 1}, 'bottomRight': {'x': 2, 'y': 1},
+        }
+        response = await test_client.put(f'/api/test_taker/attempts/{test_attempt_id.test_id}/screen_position', json=screen_position)
+        assert response.status_code == 204
+        async with app.app_context():
+            attempt = await orm_session.get_one(TestAttempt, (test_attempt_id.test_id, test_attempt_id.test_taker_id))
+            assert attempt.screen_position == Rectangle(
+                top_left=Point(0, 0), top_right=Point(2, 0),
+                bottom_left=Point(0, 1), bottom_right=Point(2, 1),
+            )
+
+    async def test_uncalibrated_error(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        async with app.app_context():
+            attempt = await orm_session.get_one(TestAttempt, (test_attempt_id.test_id, test_attempt_id.test_taker_id))
+            attempt.screen_position = None
+            await orm_session.commit()
+        response = await test_client.post(f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data', json={'samples': []})
+        assert response.status_code == 409
+        response_body = await response.get_json()
+        assert response_body == 'Screen position has not been calibrated.'
+
+class TestIngestGazeData:
+    async def test_ingest_gaze_data(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        now = datetime.now(UTC)
+        samples = [
+            {'timestamp': (now + timedelta(seconds=i / 30)).isoformat(), 'x': i / 100, 'y': i / 100}
+            for i in range(90)
+        ]
+        samples.append({'timestamp': (now + timedelta(days=1)).isoformat(), 'x': 0.5, 'y': 0.5}) # After the end of the test
+        response = await test_client.post(f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data', json={'samples': samples})
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body == {'accepted': 90, 'rejected': 1}
+        async with app.app_context():
+            saved_count = await orm_session.scalar(select(func.count()).select_from(GazeData))
+            assert saved_count == 90
+
+    async def test_stored_samples_are_loaded_in_time_order(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        now = datetime.now(UTC)
+        timestamps = [now + timedelta(seconds=i / 30) for i in range(60)]
+        for batch in (timestamps[30:], timestamps[:30]): # The later samples arrive first.
+            await test_client.post(
+                f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data',
+                json={'samples': [{'timestamp': timestamp.isoformat(), 'x': 0.5, 'y': 0.5} for timestamp in reversed(batch)]},
+            )
+        async with app.app_context():
+            samples = await load_gaze_data(orm_session, test_attempt_id, start=timestamps[10], end=timestamps[50])
+        assert samples['timestamp'].tolist() == [to_timestamp(timestamp) for timestamp in timestamps[10:50]]
+
+    async def test_missing_attempt_error(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.post(f'/api/test_taker/attempts/{test_attempt_id.test_id + 1}/gaze_data', json={'samples': []})
+        assert response.status_code == 404
+        response_body = await response.get_json()
+        assert response_body == 'Test attempt not found.'
+    async def test_caught_cheating(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        now = datetime.now(UTC)
+        samples = [
+            {'timestamp': (now + timedelta(seconds=i)).isoformat(), 'x': 2, 'y': 2} # Off-screen
+            for i in range(20)
+        ]
+        response = await test_client.post(f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data', json={'samples': samples})
+        assert response.status_code == 200
+        async with app.app_context():
+            attempt = await orm_session.get_one(TestAttempt, (test_attempt_id.test_id, test_attempt_id.test_taker_id))
+            assert attempt.caught_cheating is True
+
+class TestIngestPackedGazeData:
+    async def test_ingest_packed_gaze_data(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        now = datetime.now(UTC)
+        samples = samples_from_tuples((now + timedelta(seconds=i / 30), 0.5, 0.5) for i in range(90))
+        frame = encode_frame(GazeFrame(test_attempt_id, 0, samples))
+        response = await test_client.post(
+            f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data/packed',
+            data=frame, headers={'Content-Type': 'application/octet-stream'},
+        )
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body == {'accepted': 90, 'rejected': 0}
+        async with app.app_context():
+            saved_count = await orm_session.scalar(select(func.count()).select_from(GazeData))
+            assert saved_count == 90
+
+    async def test_invalid_frame_error(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.post(
+            f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data/packed',
+            data=b'not a frame', headers={'Content-Type': 'application/octet-stream'},
+        )
+        assert response.status_code == 400
+
+class TestStreamGazeData:
+    async def test_stream_gaze_data(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        app.config['GAZE_DATA_FLUSH_SIZE'] = 2
+        now = datetime.now(UTC)
+        samples = [
+            {'timestamp': (now + timedelta(seconds=i / 30)).isoformat(), 'x': 0.5, 'y': 0.5}
+            for i in range(3)
+        ]
+        async with test_client.websocket(f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data/stream') as test_websocket:
+            await test_websocket.send_json({'samples': samples})
+            report = await test_websocket.receive_json()
+            assert report == {'accepted': 2, 'rejected': 0}
+            statistics = getattr(app, 'gaze_data_streams').statistics
+            assert statistics.open_streams == 1
+            assert statistics.buffer_bytes > 0
+            report = await test_websocket.receive_json() # Flushed after the flush interval
+            assert report == {'accepted': 1, 'rejected': 0}
+        async with app.app_context():
+            saved_count = await orm_session.scalar(select(func.count()).select_from(GazeData))
+            assert saved_count == 3
+
+    async def test_failed_flush_closes_stream(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        app.config['GAZE_DATA_FLUSH_SIZE'] = 2
+        app.config['GAZE_DATA_FLUSH_INTERVAL'] = 0.1
+        now = datetime.now(UTC)
+        samples = [
+            {'timestamp': (now + timedelta(seconds=i / 30)).isoformat(), 'x': 0.5, 'y': 0.5}
+            for i in range(3)
+        ]
+        async with test_client.websocket(f'/api/test_taker/attempts/{test_attempt_id.test_id}/gaze_data/stream') as test_websocket:
+            await test_websocket.send_json({'samples': samples[:2]})
+            await test_websocket.receive_json()
+            async with app.app_context(): # Storing samples violates the foreign key to the attempt from now on.
+                await orm_session.execute(
+                    delete(TestAttempt)
+                    .where(TestAttempt.test_id == test_attempt_id.test_id, TestAttempt.test_taker_id == test_attempt_id.test_taker_id)
+                )
+                await orm_session.commit()
+            await test_websocket.send_json({'samples': samples[2:]})
+            with pytest.raises(WebsocketDisconnectError) as exception_info:
+                await test_websocket.receive_json()
+            assert exception_info.value.args == (1011,)
+        assert getattr(app, 'gaze_data_streams').statistics.failed_flushes == 1
+        assert test_attempt_id not in getattr(app, 'cheating_detector') # It has observed samples that were not stored.
\ No newline at end of file
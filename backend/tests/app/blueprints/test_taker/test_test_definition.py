@@ -0,0 +1,62 @@
+import asyncio
+
+from quart import Quart
+import quart.typing
+
+from app.data_model import Question, Test, TestAttempt, TextFieldQuestion
+from app.database import orm_session
+
+
+class TestGetTest:
+    async def test_get_test(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.get(f'/api/test_taker/attempts/{test_attempt_id.test_id}/test')
+        assert response.status_code == 200
+        response_body = await response.get_json()
+        assert response_body['id'] == test_attempt_id.test_id
+        assert response_body['title'] == 'test_title'
+
+    async def test_missing_attempt_error(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id):
+        response = await test_client.get(f'/api/test_taker/attempts/{test_attempt_id.test_id + 1}/test')
+        assert response.status_code == 404
+        response_body = await response.get_json()
+        assert response_body == 'Test attempt not found.'
+
+    async def test_served_from_cache(self, app: Quart, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id, metrics_headers: dict[str, str]):
+        for _ in range(3):
+            await test_client.get(f'/api/test_taker/attempts/{test_attempt_id.test_id}/test')
+        response = await test_client.get('/api/metrics', headers=metrics_headers)
+        response_body = await response.get_json()
+        assert response_body['testDefinitionCache']['hits'] == 2
+        assert response_body['testDefinitionCache']['misses'] == 1
+
+        async with app.app_context(): # Editing the questions of the test bumps its version.
+            test = await orm_session.get_one(Test, test_attempt_id.test_id)
+            (await test.awaitable_attrs.questions).append(
+                Question(question_text='question_text', max_marks=1, text_field_question=TextFieldQuestion())
+            )
+            await orm_session.commit()
+        await test_client.get(f'/api/test_taker/attempts/{test_attempt_id.test_id}/test')
+        response = await test_client.get('/api/metrics', headers=metrics_headers)
+        response_body = await response.get_json()
+        assert response_body['testDefinitionCache']['misses'] == 2
+        assert response_body['testDefinitionCache']['invalidations'] == 1
+
+    async def test_concurrent_loads_are_coalesced(self, test_client: quart.typing.TestClientProtocol, test_attempt_id: TestAttempt.Id, metrics_headers: dict[str, str]):
+        async def get_single_flight_statistics() -> dict:
+            response = await test_client.get('/api/metrics', headers=metrics_headers)
+            response_body = await response.get_json()
+            return next(
+                statistics for statistics in response_body['singleFlight']
+                if statistics['function'].endswith('load_candidate_test_details')
+            )
+
+        statistics_before = await get_single_flight_statistics()
+        responses = await asyncio.gather(*(
+            test_client.get(f'/api/test_taker/attempts/{test_attempt_id.test_id}/test')
+            for _ in range(10)
+        ))
+        assert all(response.status_code == 200 for response in responses)
+        statistics_after = await get_single_flight_statistics()
+        calls = statistics_after['calls'] - statistics_before['calls']
+        deduplicated_calls = statistics_after['deduplicatedCalls'] - statistics_before['deduplicatedCalls']
+        assert calls - deduplicated_calls == 1
\ No newline at end of file
@@ -11,6 +11,7 @@ from app.blueprints.user import UserDetails
 from app.blueprints.user.authentication import LoginCredential
 from app.data_model import User
 from app.database import orm_session
+from app.password_hashing import PasswordHashingService
 
 
 def get_client_auth_cookie(test_client: quart.typing.TestClientProtocol, auth_manager: QuartAuth):
@@ -29,7 +30,7 @@ class TestLogin:
     async def test_successful_login(self, app: Quart, test_client: quart.typing.TestClientProtocol, existing_user_details: UserDetails, remember: bool):
         test_client.cookie_jar.clear() # type: ignore
         login_credential = LoginCredential.from_structural_superset(existing_user_details)
-        response = await test_client.post(f'/user/authentication/login?remember={remember}', json=login_credential)
+        response = await test_client.post(f'/api/user/authentication/login?remember={remember}', json=login_credential)
         assert response.status_code == 204
         response_body = await response.get_json()
         assert response_body is None
@@ -48,21 +49,30 @@ class TestLogin:
 
     async def test_non_existant_username(self, test_client: quart.typing.TestClientProtocol, existing_user_details: UserDetails):
         login_credential = replace(LoginCredential.from_structural_superset(existing_user_details), username='some_username')
-        response = await test_client.post('/user/authentication/login', json=login_credential)
+        response = await test_client.post('/api/user/authentication/login', json=login_credential)
         assert response.status_code == 401
         response_body = await response.get_json()
         assert response_body == 'Invalid credential'
     
     async def test_invalid_password(self, test_client: quart.typing.TestClientProtocol, existing_user_details: UserDetails):
         login_credential = replace(LoginCredential.from_structural_superset(existing_user_details), password='some_password')
-        response = await test_client.post('/user/authentication/login', json=login_credential)
+        response = await test_client.post('/api/user/authentication/login', json=login_credential)
         assert response.status_code == 401
         response_body = await response.get_json()
         assert response_body == 'Invalid credential'
 
+    async def test_overloaded_error(self, app: Quart, test_client: quart.typing.TestClientProtocol, existing_user_details: UserDetails):
+        password_hashing_service: PasswordHashingService = getattr(app, 'password_hashing_service')
+        password_hashing_service.workers = password_hashing_service.queue_size = 0 # Reject every operation
+        login_credential = LoginCredential.from_structural_superset(existing_user_details)
+        response = await test_client.post('/api/user/authentication/login', json=login_credential)
+        assert response.status_code == 503
+        response_body = await response.get_json()
+        assert response_body == 'Service is busy. Please try again later.'
+
 class TestLogout:
     async def test_logout(self, app: Quart, test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails):
-        response = await test_client.post('/user/authentication/logout')
+        response = await test_client.post('/api/user/authentication/logout')
         assert response.status_code == 204
         response_body = await response.get_json()
         assert response_body is None
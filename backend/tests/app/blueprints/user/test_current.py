@@ -1,7 +1,10 @@
 from dataclasses import asdict
 
 from humps import camelize
+from quart import Quart
 import quart.typing
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.blueprints.user import UserDetails
 from app.blueprints.user.current import UserDetailsWithoutPasswordHash
@@ -9,14 +12,44 @@ from app.blueprints.user.current import UserDetailsWithoutPasswordHash
 
 class TestGetDetails:
     async def test_get_details(self, test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails):
-        response = await test_client.get('/user/details', json=logged_in_user_details)
+        response = await test_client.get('/api/user/details', json=logged_in_user_details)
         assert response.status_code == 200
         response_body = await response.get_json()
-        logged_in_user_details_without_password_hash = UserDetailsWithoutPasswordHash.from_structural_superset(logged_in_user_details)
+        logged_in_user_details_without_password_hash = UserDetailsWithoutPasswordHash(
+            username=logged_in_user_details.username,
+            full_name=logged_in_user_details.full_name,
+            email=logged_in_user_details.email,
+            test_setter_role=False,
+            test_taker_role=False,
+            invigilator_role=False,
+        )
         assert response_body == camelize(asdict(logged_in_user_details_without_password_hash))
     
     async def test_unauthenticated_error(self, test_client: quart.typing.TestClientProtocol, existing_user_details: UserDetails):
-        response = await test_client.get('/user/details', json=existing_user_details)
+        response = await test_client.get('/api/user/details', json=existing_user_details)
         assert response.status_code == 401
         response_body = await response.get_json()
-        assert response_body == 'Unauthorised'
\ No newline at end of file
+        assert response_body == 'Unauthorised'
+
+    async def test_principal_is_cached(self, app: Quart, test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails):
+        engine: AsyncEngine = getattr(app, 'engine')
+        query_count = 0
+        def count_query(*args):
+            nonlocal query_count
+            query_count += 1
+        event.listen(engine.sync_engine, 'before_cursor_execute', count_query)
+        try:
+            await test_client.get('/api/user/details')
+            assert query_count == 1
+            response = await test_client.get('/api/user/details')
+            assert response.status_code == 200
+            assert query_count == 1
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', count_query)
+
+    async def test_assuming_role_invalidates_principal(self, test_client: quart.typing.TestClientProtocol, logged_in_user_details: UserDetails):
+        await test_client.get('/api/user/details')
+        await test_client.post('/api/invigilator/assume_role')
+        response = await test_client.get('/api/user/details')
+        response_body = await response.get_json()
+        assert response_body['invigilatorRole'] is True
\ No newline at end of file
@@ -11,7 +11,7 @@ from app.database import orm_session
 
 class TestCreateAccount:
     async def test_create_account(self, app: Quart, test_client: quart.typing.TestClientProtocol, user_details: UserDetails):
-        response = await test_client.post('/user/create_account', json=user_details)
+        response = await test_client.post('/api/user/create_account', json=user_details)
         assert response.status_code == 201
         response_body = await response.get_json()
         assert response_body is None
@@ -22,7 +22,7 @@ class TestCreateAccount:
     async def test_duplicate_username_error(self, test_client: quart.typing.TestClientProtocol, existing_user_details: UserDetails):
         # Attempt to create a new user account (with duplicate username):
         new_user_details = replace(existing_user_details, email='email2@test.py')
-        response = await test_client.post('/user/create_account', json=new_user_details)
+        response = await test_client.post('/api/user/create_account', json=new_user_details)
         assert response.status_code == 422
         response_body = await response.get_json()
         assert response_body == 'Username is already taken up.'
@@ -30,7 +30,7 @@ class TestCreateAccount:
     async def test_duplicate_email_error(self, test_client: quart.typing.TestClientProtocol, existing_user_details: UserDetails):
         # Attempt to create a new user account (with duplicate email address):
         new_user_details = replace(existing_user_details, username='test_username2')
-        response = await test_client.post('/user/create_account', json=new_user_details)
+        response = await test_client.post('/api/user/create_account', json=new_user_details)
         assert response.status_code == 422
         response_body = await response.get_json()
         assert response_body == 'E-mail address is already registered.'
\ No newline at end of file
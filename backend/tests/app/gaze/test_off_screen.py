@@ -0,0 +1,52 @@
+import numpy as np
+
+from app.data_model import Point, Rectangle
+from app.gaze.off_screen import off_screen_mask
+from app.gaze.wire_format import SAMPLE_DTYPE
+
+
+def samples_at(*points: tuple[float, float]) -> np.ndarray:
+    samples = np.zeros(len(points), dtype=SAMPLE_DTYPE)
+    samples['x'] = [x for x, _ in points]
+    samples['y'] = [y for _, y in points]
+    return samples
+
+UNIT_SQUARE = Rectangle(
+    top_left=Point(0, 0), top_right=Point(1, 0),
+    bottom_left=Point(0, 1), bottom_right=Point(1, 1),
+)
+
+class TestOffScreenMask:
+    def test_axis_aligned_screen(self):
+        samples = samples_at((0.5, 0.5), (0.01, 0.99), (1.5, 0.5), (-0.1, 0.5), (0.5, -0.1), (0.5, 1.5))
+        assert off_screen_mask(samples, UNIT_SQUARE).tolist() == [False, False, True, True, True, True]
+
+    def test_rotated_screen(self):
+        diamond = Rectangle(
+            top_left=Point(0.5, 0), top_right=Point(1, 0.5),
+            bottom_left=Point(0, 0.5), bottom_right=Point(0.5, 1),
+        )
+        samples = samples_at((0.5, 0.5), (0.3, 0.4), (0.1, 0.1), (0.9, 0.9)) # The last two are in the bounding box.
+        assert off_screen_mask(samples, diamond).tolist() == [False, False, True, True]
+
+    def test_concave_screen(self):
+        dart = Rectangle(
+            top_left=Point(0, 0), top_right=Point(1, 0),
+            bottom_left=Point(0.7, 0.3), bottom_right=Point(1, 1),
+        )
+        samples = samples_at((0.9, 0.2), (0.9, 0.5), (0.6, 0.5)) # The last one is in the notch, within the convex hull.
+        assert off_screen_mask(samples, dart).tolist() == [False, False, True]
+
+    def test_boundary(self):
+        """Points on the top and left edges are on the screen, and those on the bottom and right edges are off it."""
+        samples = samples_at((0, 0.5), (0.5, 0), (1, 0.5), (0.5, 1))
+        assert off_screen_mask(samples, UNIT_SQUARE).tolist() == [False, False, True, True]
+
+    def test_non_finite_coordinates(self):
+        samples = samples_at((np.nan, 0.5), (0.5, np.nan), (np.inf, 0.5))
+        assert off_screen_mask(samples, UNIT_SQUARE).tolist() == [True, True, True]
+
+    def test_empty_batch(self):
+        mask = off_screen_mask(np.empty(0, dtype=SAMPLE_DTYPE), UNIT_SQUARE)
+        assert mask.shape == (0,)
+        assert mask.dtype == np.bool_
\ No newline at end of file
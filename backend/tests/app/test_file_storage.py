@@ -0,0 +1,37 @@
+from collections.abc import AsyncIterator
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.file_storage import FileTooLargeError, LocalFileStorage
+
+
+async def chunks_of(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+class TestLocalFileStorage:
+    async def test_store(self, tmp_path: Path):
+        storage = LocalFileStorage(tmp_path)
+        stored_file = await storage.store(chunks_of(b'first_', b'second'), max_size=100)
+        assert stored_file.digest == hashlib.sha256(b'first_second').hexdigest()
+        assert stored_file.size == 12
+        assert storage.path(stored_file.digest).read_bytes() == b'first_second'
+
+    async def test_deduplication(self, tmp_path: Path):
+        storage = LocalFileStorage(tmp_path)
+        first = await storage.store(chunks_of(b'content'), max_size=100)
+        second = await storage.store(chunks_of(b'con', b'tent'), max_size=100)
+        assert first == second
+        assert [path.name for path in tmp_path.glob('*/*')] == [first.digest]
+
+    async def test_too_large_error(self, tmp_path: Path):
+        storage = LocalFileStorage(tmp_path)
+        async def chunks() -> AsyncIterator[bytes]:
+            yield b'12345'
+            yield b'67890'
+            pytest.fail('The upload is read past the chunk that exceeds the size limit.')
+        with pytest.raises(FileTooLargeError):
+            await storage.store(chunks(), max_size=8)
+        assert list(tmp_path.glob('*/*')) == []
\ No newline at end of file
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from app.images import ImageProcessingService, InvalidImageError, difference_hash
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def bit_difference(first: str, second: str) -> int:
+    return (int(first, 16) ^ int(second, 16)).bit_count()
+
+class TestDifferenceHash:
+    def test_similar_images(self):
+        image = Image.linear_gradient('L').rotate(30).convert('RGB')
+        assert bit_difference(difference_hash(image), difference_hash(image.resize((100, 100)))) <= 4
+        assert bit_difference(difference_hash(image), difference_hash(image.rotate(180))) > 16
+
+class TestImageProcessingService:
+    async def test_invalid_image_error(self, tmp_path: Path):
+        path = tmp_path / 'image'
+        path.write_bytes(b'not_an_image')
+        service = ImageProcessingService(workers=1)
+        try:
+            with pytest.raises(InvalidImageError):
+                await service.process(path)
+            with pytest.raises(FileNotFoundError):
+                await service.process(tmp_path / 'missing_image')
+        finally:
+            service.shutdown()
\ No newline at end of file
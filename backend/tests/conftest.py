@@ -1,3 +1,5 @@
+import shutil
+
 import pytest_asyncio
 from quart import Quart
 from sqlalchemy.ext.asyncio import AsyncEngine
@@ -15,6 +17,10 @@ async def app():
         await drop_db_schema_objects(engine)
         await create_db_schema_objects(engine)
         yield app
+    getattr(app, 'password_hashing_service').shutdown()
+    getattr(app, 'image_processing_service').shutdown()
+    shutil.rmtree(app.config['FILE_STORAGE_DIRECTORY'], ignore_errors=True)
+    shutil.rmtree(app.config['THUMBNAIL_CACHE_DIRECTORY'], ignore_errors=True)
 
 @pytest_asyncio.fixture
 def test_client(app: Quart):